@@ -3,10 +3,6 @@
 import os
 import sys
 
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QIcon, QFont
-from PySide6.QtCore import Qt
-
 from .core.resources import get_icon_path
 
 
@@ -17,6 +13,10 @@ def run_gui() -> int:
     Returns:
         Application exit code
     """
+    # Import here so CLI mode does not load Qt
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtGui import QIcon, QFont
+
     # Enable high DPI scaling
     os.environ["QT_AUTO_SCREEN_SCALE_FACTOR"] = "1"
 
@@ -1,13 +1,28 @@
 """Modern CLI for CTools using argparse."""
 
 import argparse
+import asyncio
 import logging
+import re
 import sys
 
-from cterasdk import GlobalAdmin, settings
+from cterasdk import settings
+from cterasdk.core.enum import DeviceType
 
 from ..core.logging import setup_logging
-from ..core.auth import global_admin_login, enable_device_sso
+from ..core.auth import open_portal_session, async_global_admin_login, ensure_device_sso_async
+from ..core import inventory
+from ..core.filer import FilerFilter
+from ..core.report import REPORT_FORMATS
+from ..core.resilience import thread_event_loop
+from ..core.fleet import DEFAULT_CONCURRENCY
+from ..core.history import DEFAULT_GROWTH_DAYS, DEFAULT_TOP
+from ..tools.batch import DEFAULT_BATCH_CONCURRENCY
+from ..tools.status import DEFAULT_DB_SIZE_TTL, DEFAULT_WATCH_INTERVAL, change_log_path
+from ..tools.shares_query import DEFAULT_LIMIT
+from ..tools.status_history import DEFAULT_METRIC
+from .metrics import DEFAULT_INTERVAL, DEFAULT_METRICS_PORT
+from .serve import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_WORKERS
 
 
 def add_common_args(parser: argparse.ArgumentParser) -> None:
@@ -20,6 +35,118 @@ def add_common_args(parser: argparse.ArgumentParser) -> None:
         action="store_true",
         help="Enable debug logging"
     )
+    parser.add_argument(
+        "--refresh-inventory",
+        action="store_true",
+        help="Ignore the cached filer inventory and discover filers again"
+    )
+    parser.add_argument(
+        "--inventory-ttl",
+        type=float,
+        default=inventory.DEFAULT_TTL,
+        metavar="SECONDS",
+        help=f"Reuse a cached filer inventory for this long (default: {inventory.DEFAULT_TTL})"
+    )
+    parser.add_argument(
+        "--inventory-max-stale",
+        type=float,
+        default=inventory.DEFAULT_MAX_STALE,
+        metavar="SECONDS",
+        help="Discover filers again before use when the cached inventory is older than this, "
+             f"instead of refreshing it in the background (default: {inventory.DEFAULT_MAX_STALE})"
+    )
+
+
+def add_concurrency_arg(parser: argparse.ArgumentParser) -> None:
+    """Add the fleet worker pool size argument to a subparser."""
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        metavar="N",
+        help=f"Number of filers to process in parallel (default: {DEFAULT_CONCURRENCY})"
+    )
+
+
+def add_resume_arg(parser: argparse.ArgumentParser) -> None:
+    """Add the run journal resume argument to a subparser."""
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume an interrupted run, skipping filers it already completed"
+    )
+
+
+def add_format_arg(parser: argparse.ArgumentParser) -> None:
+    """Add the report output format argument to a subparser."""
+    parser.add_argument(
+        "--format",
+        dest="fmt",
+        choices=REPORT_FORMATS,
+        help="Report format: Excel-friendly csv, or typed jsonl or parquet "
+             "(default: from the file extension, else csv)"
+    )
+
+
+def add_async_arg(parser: argparse.ArgumentParser) -> None:
+    """Add the asyncio engine switch to a subparser."""
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Use the asyncio engine (single thread, many filers in flight)"
+    )
+
+
+def regex_type(value: str) -> str:
+    """Validate a regular expression argument."""
+    try:
+        re.compile(value)
+    except re.error as e:
+        raise argparse.ArgumentTypeError(f"invalid regular expression: {e}") from e
+    return value
+
+
+def add_filter_args(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the filer selection arguments to a subparser.
+
+    Every subcommand that discovers filers takes them. report_zones,
+    worm_settings, copy_shares and populate_shares do not: they act on
+    zones, a cloud folder or devices named on the command line, and list
+    no filers to select from. Nor does delete_shares, which selects shares
+    by name on every filer of every tenant.
+    """
+    group = parser.add_argument_group("filer selection")
+    group.add_argument("--name", help="Only filers whose name contains this text")
+    group.add_argument(
+        "--name-regex",
+        type=regex_type,
+        metavar="REGEX",
+        help="Only filers whose name matches this regular expression"
+    )
+    group.add_argument(
+        "--firmware",
+        metavar="VERSION",
+        help="Only filers whose firmware version contains this text"
+    )
+    group.add_argument(
+        "--device-type",
+        action="append",
+        choices=DeviceType.Gateways,
+        metavar="TYPE",
+        help=f"Only filers of this type, may be repeated ({', '.join(DeviceType.Gateways)})"
+    )
+
+
+def filer_filter(args) -> FilerFilter:
+    """Build the filer selection from parsed arguments."""
+    return FilerFilter(
+        name=args.name,
+        name_regex=args.name_regex,
+        firmware=args.firmware,
+        device_types=args.device_type or list(DeviceType.Gateways)
+    )
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -42,12 +169,64 @@ def create_parser() -> argparse.ArgumentParser:
         help="Generate status report for all filers"
     )
     add_common_args(status_parser)
-    status_parser.add_argument("filename", help="Output CSV filename")
+    status_parser.add_argument("filename", help="Output report filename")
     status_parser.add_argument(
         "--all-tenants",
         action="store_true",
         help="Run on all tenants"
     )
+    status_parser.add_argument(
+        "--db-size",
+        action="store_true",
+        help="Collect the CloudSync database size (briefly enables telnet on each filer)"
+    )
+    status_parser.add_argument(
+        "--db-size-ttl",
+        type=float,
+        default=DEFAULT_DB_SIZE_TTL,
+        metavar="SECONDS",
+        help=f"Reuse a measured database size for this long (default: {DEFAULT_DB_SIZE_TTL})"
+    )
+    status_parser.add_argument(
+        "--upsert",
+        action="store_true",
+        help="Replace the rows of filers already in the report instead of appending"
+    )
+    status_parser.add_argument(
+        "--history",
+        action="store_true",
+        help="Also record the numeric values in the local status history"
+    )
+    status_parser.add_argument(
+        "--columns",
+        type=lambda value: [name.strip() for name in value.split(",") if name.strip()],
+        metavar="NAME,...",
+        help="Report only these columns (e.g. 'CurrentFirmware,SN'), fetching only what they need"
+    )
+    status_parser.add_argument(
+        "--portal-only",
+        action="store_true",
+        help="Read what the portal holds about each filer instead of calling the filers; "
+             "other --columns are still fetched from the filers"
+    )
+    status_parser.add_argument(
+        "--watch",
+        type=float,
+        nargs="?",
+        const=DEFAULT_WATCH_INTERVAL,
+        metavar="SECONDS",
+        help="Poll repeatedly and log only changed values to the change log "
+             f"(default interval: {DEFAULT_WATCH_INTERVAL})"
+    )
+    status_parser.add_argument(
+        "--watch-log",
+        metavar="FILE",
+        help="Change log of --watch (default: the output filename with .changes.csv)"
+    )
+    add_concurrency_arg(status_parser)
+    add_filter_args(status_parser)
+    add_format_arg(status_parser)
+    add_async_arg(status_parser)
 
     # run_cmd command
     runcmd_parser = subparsers.add_parser(
@@ -63,6 +242,9 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run on all tenants"
     )
+    add_concurrency_arg(runcmd_parser)
+    add_filter_args(runcmd_parser)
+    add_async_arg(runcmd_parser)
 
     # suspend_sync command
     suspend_parser = subparsers.add_parser(
@@ -77,6 +259,8 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run on all tenants"
     )
+    add_concurrency_arg(suspend_parser)
+    add_filter_args(suspend_parser)
 
     # unsuspend_sync command
     unsuspend_parser = subparsers.add_parser(
@@ -91,6 +275,8 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run on all tenants"
     )
+    add_concurrency_arg(unsuspend_parser)
+    add_filter_args(unsuspend_parser)
 
     # enable_ssh command
     ssh_enable_parser = subparsers.add_parser(
@@ -105,6 +291,8 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run on all tenants"
     )
+    add_concurrency_arg(ssh_enable_parser)
+    add_filter_args(ssh_enable_parser)
 
     # disable_ssh command
     ssh_disable_parser = subparsers.add_parser(
@@ -119,6 +307,8 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run on all tenants"
     )
+    add_concurrency_arg(ssh_disable_parser)
+    add_filter_args(ssh_disable_parser)
 
     # enable_telnet command
     telnet_parser = subparsers.add_parser(
@@ -133,6 +323,8 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run on all tenants"
     )
+    add_concurrency_arg(telnet_parser)
+    add_filter_args(telnet_parser)
 
     # reset_password command
     reset_parser = subparsers.add_parser(
@@ -148,6 +340,9 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run on all tenants"
     )
+    add_concurrency_arg(reset_parser)
+    add_filter_args(reset_parser)
+    add_resume_arg(reset_parser)
 
     # report_zones command
     zones_parser = subparsers.add_parser(
@@ -155,13 +350,14 @@ def create_parser() -> argparse.ArgumentParser:
         help="Generate zones report"
     )
     add_common_args(zones_parser)
-    zones_parser.add_argument("filename", help="Output CSV filename")
+    zones_parser.add_argument("filename", help="Output report filename or directory")
     zones_parser.add_argument("--tenant", help="Tenant name")
     zones_parser.add_argument(
         "--all-tenants",
         action="store_true",
         help="Run on all tenants"
     )
+    add_format_arg(zones_parser)
 
     # shares_report command
     shares_parser = subparsers.add_parser(
@@ -169,7 +365,7 @@ def create_parser() -> argparse.ArgumentParser:
         help="Generate shares report"
     )
     add_common_args(shares_parser)
-    shares_parser.add_argument("filename", help="Output CSV filename")
+    shares_parser.add_argument("filename", help="Output report filename")
     shares_parser.add_argument("--tenant", help="Tenant name")
     shares_parser.add_argument("--device", help="Device name")
     shares_parser.add_argument(
@@ -177,6 +373,34 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run on all tenants"
     )
+    shares_parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Also update the local shares index queried by 'shares query'"
+    )
+    add_concurrency_arg(shares_parser)
+    add_filter_args(shares_parser)
+    add_format_arg(shares_parser)
+    add_async_arg(shares_parser)
+
+    # delete_shares command
+    delete_parser = subparsers.add_parser(
+        "delete_shares",
+        help="Delete shares whose name contains a substring, on all tenants"
+    )
+    add_common_args(delete_parser)
+    delete_parser.add_argument("substring", help="Substring to match in share names")
+    delete_parser.add_argument(
+        "--output",
+        default="deleted_shares.csv",
+        help="CSV file logging each deletion (default: deleted_shares.csv)"
+    )
+    delete_parser.add_argument(
+        "--yes",
+        action="store_true",
+        help="Delete without asking for confirmation"
+    )
+    add_resume_arg(delete_parser)
 
     # copy_shares command
     copy_parser = subparsers.add_parser(
@@ -211,6 +435,9 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run on all tenants"
     )
+    add_concurrency_arg(mapping_parser)
+    add_filter_args(mapping_parser)
+    add_resume_arg(mapping_parser)
 
     # worm_settings command
     worm_parser = subparsers.add_parser(
@@ -226,9 +453,185 @@ def create_parser() -> argparse.ArgumentParser:
         help="Run on all tenants"
     )
 
+    # batch command
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Run a YAML list of tool invocations in one process"
+    )
+    add_common_args(batch_parser)
+    batch_parser.add_argument("jobs_file", help="YAML file with the jobs to run")
+    batch_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_BATCH_CONCURRENCY,
+        metavar="N",
+        help=f"Number of jobs to run in parallel (default: {DEFAULT_BATCH_CONCURRENCY})"
+    )
+
+    # serve command
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Serve the tools over a local HTTP API with warm portal sessions"
+    )
+    add_common_args(serve_parser)
+    serve_parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Interface to listen on (default: {DEFAULT_HOST})"
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"TCP port to listen on (default: {DEFAULT_PORT})"
+    )
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        metavar="N",
+        help=f"Number of warm portal sessions (default: {DEFAULT_WORKERS})"
+    )
+    serve_parser.add_argument(
+        "--token",
+        help="Bearer token required on every request (default: generated and printed)"
+    )
+
+    # export-metrics command
+    metrics_parser = subparsers.add_parser(
+        "export-metrics",
+        help="Collect filer status on a schedule and serve it as OpenMetrics"
+    )
+    add_common_args(metrics_parser)
+    metrics_parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Interface to listen on (default: {DEFAULT_HOST})"
+    )
+    metrics_parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_METRICS_PORT,
+        help=f"TCP port to listen on (default: {DEFAULT_METRICS_PORT})"
+    )
+    metrics_parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        metavar="SECONDS",
+        help=f"Time between collections (default: {DEFAULT_INTERVAL})"
+    )
+    metrics_parser.add_argument("--tenant", help="Tenant name")
+    metrics_parser.add_argument(
+        "--all-tenants",
+        action="store_true",
+        help="Collect from all tenants"
+    )
+    metrics_parser.add_argument(
+        "--db-size",
+        action="store_true",
+        help="Collect the CloudSync database size (briefly enables telnet on each filer)"
+    )
+    metrics_parser.add_argument(
+        "--db-size-ttl",
+        type=float,
+        default=DEFAULT_DB_SIZE_TTL,
+        metavar="SECONDS",
+        help=f"Reuse a measured database size for this long (default: {DEFAULT_DB_SIZE_TTL})"
+    )
+    add_concurrency_arg(metrics_parser)
+    add_filter_args(metrics_parser)
+
+    # status-history command, answered from the local history without logging in
+    history_parser = subparsers.add_parser(
+        "status-history",
+        help="Show status trends recorded by show_status --history"
+    )
+    history_parser.add_argument(
+        "--metric",
+        default=DEFAULT_METRIC,
+        help=f"Status column to analyze (default: {DEFAULT_METRIC})"
+    )
+    history_parser.add_argument(
+        "--days",
+        type=float,
+        default=DEFAULT_GROWTH_DAYS,
+        help=f"Length of the window in days (default: {DEFAULT_GROWTH_DAYS})"
+    )
+    history_parser.add_argument(
+        "--top",
+        type=int,
+        default=DEFAULT_TOP,
+        metavar="N",
+        help=f"Number of filers listed by growth (default: {DEFAULT_TOP})"
+    )
+    history_parser.add_argument("--filer", help="Show the samples of one filer instead")
+    history_parser.add_argument("--portal", default="", help="Only use samples of this portal")
+    history_parser.add_argument(
+        "--list-metrics",
+        action="store_true",
+        help="List the recorded metrics"
+    )
+    history_parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Enable debug logging"
+    )
+
+    # shares command, answered from the local shares index without logging in
+    shares_index_parser = subparsers.add_parser(
+        "shares",
+        help="Query the shares indexed by shares_report --index"
+    )
+    shares_actions = shares_index_parser.add_subparsers(dest="shares_command", required=True)
+    query_parser = shares_actions.add_parser(
+        "query",
+        help="Find shares by principal, permission, path or name "
+             "(case-insensitive, '*' and '?' wildcards)"
+    )
+    query_parser.add_argument("--principal", help="Principal name, e.g. 'CTERA\\Contractors'")
+    query_parser.add_argument("--permission", help="Permission, e.g. RW, RO, NA or ReadWrite")
+    query_parser.add_argument("--path", help="Share path")
+    query_parser.add_argument("--name", help="Share name")
+    query_parser.add_argument("--tenant", help="Tenant name")
+    query_parser.add_argument("--filer", help="Filer name")
+    query_parser.add_argument("--portal", default="", help="Only use shares of this portal")
+    query_parser.add_argument(
+        "--limit",
+        type=int,
+        default=DEFAULT_LIMIT,
+        metavar="N",
+        help=f"Maximum number of entries shown (default: {DEFAULT_LIMIT})"
+    )
+    query_parser.add_argument(
+        "--list-filers",
+        action="store_true",
+        help="List the indexed filers and when they were indexed"
+    )
+    query_parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Enable debug logging"
+    )
+
     return parser
 
 
+def configure_inventory(args) -> None:
+    """Apply the inventory cache arguments."""
+    inventory.settings.ttl = args.inventory_ttl
+    inventory.settings.max_stale = args.inventory_max_stale
+    inventory.settings.refresh = args.refresh_inventory
+
+
+def confirm(question: str) -> bool:
+    """Ask a yes/no question on the terminal, defaulting to no."""
+    try:
+        return input(f"{question} [y/N] ").strip().lower() in ('y', 'yes')
+    except EOFError:
+        return False
+
+
 def run_with_session(args, handler_func, **kwargs):
     """
     Set up session and run a handler function.
@@ -244,24 +647,57 @@ def run_with_session(args, handler_func, **kwargs):
     )
 
     settings.sessions.management.ssl = False
+    configure_inventory(args)
+    thread_event_loop()
 
     try:
-        with GlobalAdmin(args.address) as admin:
-            admin.login(args.username, args.password)
-            enable_device_sso(admin)
-            admin.logout()
-
-        with GlobalAdmin(args.address) as admin:
-            admin.login(args.username, args.password)
+        with open_portal_session(args.address, args.username, args.password) as admin:
             try:
                 handler_func(admin, **kwargs)
             finally:
+                inventory.wait_for_revalidation()
                 admin.logout()
     except Exception as e:
         logging.error("Operation failed: %s", e)
         sys.exit(1)
 
 
+def run_with_async_session(args, handler_coro, **kwargs):
+    """
+    Set up an AsyncGlobalAdmin session and run a handler coroutine.
+
+    Args:
+        args: Parsed arguments
+        handler_coro: Coroutine function to await with (session, **kwargs)
+        **kwargs: Additional arguments to pass to handler
+    """
+    setup_logging(
+        logging.DEBUG if args.verbose else logging.INFO,
+        'debug-log.txt' if args.verbose else 'info-log.txt'
+    )
+
+    async def run():
+        admin = await async_global_admin_login(
+            args.address, args.username, args.password, ignore_cert=True
+        )
+        if not admin:
+            raise RuntimeError("Failed to connect to portal")
+        try:
+            if await ensure_device_sso_async(admin, args.address):
+                # SSO applies to sessions opened after it was enabled
+                await admin.logout()
+                await admin.login(args.username, args.password)
+            await handler_coro(admin, **kwargs)
+        finally:
+            await admin.logout()
+
+    try:
+        asyncio.run(run())
+    except Exception as e:
+        logging.error("Operation failed: %s", e)
+        sys.exit(1)
+
+
 def cli_main(argv=None):
     """Main entry point for CLI."""
     parser = create_parser()
@@ -271,13 +707,72 @@ def cli_main(argv=None):
         parser.print_help()
         sys.exit(0)
 
+    # The asyncio engine lists whole tenants and does not poll or read the portal's copy
+    if getattr(args, 'use_async', False):
+        unsupported = [
+            option for option, dest in (
+                ('--device', 'device'), ('--portal-only', 'portal_only'), ('--watch', 'watch')
+            )
+            if getattr(args, dest, None)
+        ]
+        if unsupported:
+            parser.error(f"--async cannot be combined with {', '.join(unsupported)}")
+
     # Import handlers lazily to avoid circular imports
-    if args.command == "show_status":
+    if args.command == "show_status" and args.watch:
+        from ..tools.status import watch_status
+        run_with_session(
+            args, watch_status,
+            filename=args.watch_log or change_log_path(args.filename),
+            interval=args.watch,
+            all_tenants=args.all_tenants,
+            filters=filer_filter(args),
+            concurrency=args.concurrency,
+            columns=args.columns
+        )
+
+    elif args.command == "show_status" and args.use_async:
+        from ..tools.status import run_status_async
+        run_with_async_session(
+            args, run_status_async,
+            filename=args.filename,
+            all_tenants=args.all_tenants,
+            concurrency=args.concurrency,
+            filters=filer_filter(args),
+            db_size=args.db_size,
+            db_size_ttl=args.db_size_ttl,
+            upsert=args.upsert,
+            fmt=args.fmt,
+            history=args.history,
+            columns=args.columns
+        )
+
+    elif args.command == "show_status":
         from ..tools.status import run_status
         run_with_session(
             args, run_status,
             filename=args.filename,
-            all_tenants=args.all_tenants
+            all_tenants=args.all_tenants,
+            concurrency=args.concurrency,
+            filters=filer_filter(args),
+            db_size=args.db_size,
+            db_size_ttl=args.db_size_ttl,
+            upsert=args.upsert,
+            fmt=args.fmt,
+            history=args.history,
+            columns=args.columns,
+            portal_only=args.portal_only
+        )
+
+    elif args.command == "run_cmd" and args.use_async:
+        from ..tools.run_cmd import run_cmd_async
+        run_with_async_session(
+            args, run_cmd_async,
+            command=args.cmd,
+            tenant=args.tenant,
+            all_tenants=args.all_tenants,
+            concurrency=args.concurrency,
+            filters=filer_filter(args)
         )
 
     elif args.command == "run_cmd":
@@ -287,7 +782,9 @@ def cli_main(argv=None):
             command=args.cmd,
             tenant=args.tenant,
             device=args.device,
-            all_tenants=args.all_tenants
+            all_tenants=args.all_tenants,
+            concurrency=args.concurrency,
+            filters=filer_filter(args)
         )
 
     elif args.command == "suspend_sync":
@@ -296,7 +793,9 @@ def cli_main(argv=None):
             args, suspend_sync,
             tenant=args.tenant,
             device=args.device,
-            all_tenants=args.all_tenants
+            all_tenants=args.all_tenants,
+            concurrency=args.concurrency,
+            filters=filer_filter(args)
         )
 
     elif args.command == "unsuspend_sync":
@@ -305,7 +804,9 @@ def cli_main(argv=None):
             args, unsuspend_sync,
             tenant=args.tenant,
             device=args.device,
-            all_tenants=args.all_tenants
+            all_tenants=args.all_tenants,
+            concurrency=args.concurrency,
+            filters=filer_filter(args)
         )
 
     elif args.command == "enable_ssh":
@@ -314,7 +815,9 @@ def cli_main(argv=None):
             args, enable_ssh,
             tenant=args.tenant,
             device=args.device,
-            all_tenants=args.all_tenants
+            all_tenants=args.all_tenants,
+            concurrency=args.concurrency,
+            filters=filer_filter(args)
         )
 
     elif args.command == "disable_ssh":
@@ -323,7 +826,9 @@ def cli_main(argv=None):
             args, disable_ssh,
             tenant=args.tenant,
             device=args.device,
-            all_tenants=args.all_tenants
+            all_tenants=args.all_tenants,
+            concurrency=args.concurrency,
+            filters=filer_filter(args)
         )
 
     elif args.command == "enable_telnet":
@@ -332,7 +837,9 @@ def cli_main(argv=None):
             args, enable_telnet,
             tenant=args.tenant,
             device=args.device,
-            all_tenants=args.all_tenants
+            all_tenants=args.all_tenants,
+            concurrency=args.concurrency,
+            filters=filer_filter(args)
         )
 
     elif args.command == "reset_password":
@@ -342,7 +849,10 @@ def cli_main(argv=None):
             new_password=args.new_password,
             tenant=args.tenant,
             device=args.device,
-            all_tenants=args.all_tenants
+            all_tenants=args.all_tenants,
+            concurrency=args.concurrency,
+            filters=filer_filter(args),
+            resume=args.resume
         )
 
     elif args.command == "report_zones":
@@ -351,7 +861,21 @@ def cli_main(argv=None):
             args, report_zones,
             filename=args.filename,
             tenant=args.tenant,
-            all_tenants=args.all_tenants
+            all_tenants=args.all_tenants,
+            fmt=args.fmt
+        )
+
+    elif args.command == "shares_report" and args.use_async:
+        from ..tools.shares_report import shares_report_async
+        run_with_async_session(
+            args, shares_report_async,
+            filename=args.filename,
+            tenant=args.tenant,
+            all_tenants=args.all_tenants,
+            concurrency=args.concurrency,
+            filters=filer_filter(args),
+            fmt=args.fmt,
+            index=args.index
         )
 
     elif args.command == "shares_report":
@@ -361,7 +885,26 @@ def cli_main(argv=None):
             filename=args.filename,
             tenant=args.tenant,
             device=args.device,
-            all_tenants=args.all_tenants
+            all_tenants=args.all_tenants,
+            filters=filer_filter(args),
+            fmt=args.fmt,
+            concurrency=args.concurrency,
+            index=args.index
+        )
+
+    elif args.command == "delete_shares":
+        from ..tools.delete_shares import delete_shares
+        if not args.yes and not confirm(
+            f"Delete every share whose name contains '{args.substring}' "
+            "on all filers of all tenants?"
+        ):
+            print("Aborted.")
+            sys.exit(1)
+        run_with_session(
+            args, delete_shares,
+            substring=args.substring,
+            output_file=args.output,
+            resume=args.resume
         )
 
     elif args.command == "copy_shares":
@@ -388,7 +931,10 @@ def cli_main(argv=None):
             domain=args.domain,
             tenant=args.tenant,
             device=args.device,
-            all_tenants=args.all_tenants
+            all_tenants=args.all_tenants,
+            concurrency=args.concurrency,
+            filters=filer_filter(args),
+            resume=args.resume
         )
 
     elif args.command == "worm_settings":
@@ -400,6 +946,86 @@ def cli_main(argv=None):
             all_tenants=args.all_tenants
         )
 
+    elif args.command == "batch":
+        from ..tools.batch import run_batch
+
+        run_with_session(
+            args, run_batch,
+            jobs_file=args.jobs_file,
+            concurrency=args.concurrency,
+            session_factory=lambda: open_portal_session(args.address, args.username, args.password)
+        )
+
+    elif args.command == "serve":
+        from .serve import serve
+        setup_logging(
+            logging.DEBUG if args.verbose else logging.INFO,
+            'debug-log.txt' if args.verbose else 'info-log.txt'
+        )
+        settings.sessions.management.ssl = False
+        configure_inventory(args)
+        serve(
+            args.address, args.username, args.password,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            token=args.token
+        )
+
+    elif args.command == "export-metrics":
+        from .metrics import export_metrics
+        setup_logging(
+            logging.DEBUG if args.verbose else logging.INFO,
+            'debug-log.txt' if args.verbose else 'info-log.txt'
+        )
+        settings.sessions.management.ssl = False
+        configure_inventory(args)
+        export_metrics(
+            args.address, args.username, args.password,
+            host=args.host,
+            port=args.port,
+            interval=args.interval,
+            tenant=args.tenant,
+            all_tenants=args.all_tenants,
+            filters=filer_filter(args),
+            concurrency=args.concurrency,
+            db_size=args.db_size,
+            db_size_ttl=args.db_size_ttl
+        )
+
+    elif args.command == "status-history":
+        from ..tools.status_history import run_status_history
+        setup_logging(
+            logging.DEBUG if args.verbose else logging.INFO,
+            'debug-log.txt' if args.verbose else 'info-log.txt'
+        )
+        run_status_history(
+            metric=args.metric,
+            days=args.days,
+            top=args.top,
+            filer=args.filer,
+            portal=args.portal,
+            list_metrics=args.list_metrics
+        )
+
+    elif args.command == "shares" and args.shares_command == "query":
+        from ..tools.shares_query import run_shares_query
+        setup_logging(
+            logging.DEBUG if args.verbose else logging.INFO,
+            'debug-log.txt' if args.verbose else 'info-log.txt'
+        )
+        run_shares_query(
+            principal=args.principal,
+            permission=args.permission,
+            path=args.path,
+            name=args.name,
+            tenant=args.tenant,
+            filer=args.filer,
+            portal=args.portal,
+            limit=args.limit,
+            list_filers=args.list_filers
+        )
+
     else:
         print(f"Command '{args.command}' is not yet implemented.")
         sys.exit(1)
@@ -0,0 +1,268 @@
+"""OpenMetrics exporter serving filer status collected on a schedule."""
+
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..core.filer import FilerFilter
+from ..core.fleet import DEFAULT_CONCURRENCY
+from ..core.probe_cache import ProbeCache
+from ..tools.status import DB_SIZE_PROBE, DEFAULT_DB_SIZE_TTL, report_columns, write_filer_status
+from .serve import DEFAULT_HOST, SessionPool
+
+DEFAULT_METRICS_PORT = 9787
+DEFAULT_INTERVAL = 300
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Exported metrics: name, help and the status column they come from. The
+# DB Size column holds GB rounded for display, so _collect replaces it with
+# the bytes the probe measured.
+FILER_METRICS = [
+    ('ctools_filer_uploading_files', 'Files waiting to be uploaded by CloudSync', 'uploadingFiles'),
+    ('ctools_filer_scanning_files', 'Files being scanned by CloudSync', 'scanningFiles'),
+    ('ctools_filer_cpu_percent', 'Current CPU usage', 'CPU'),
+    ('ctools_filer_memory_percent', 'Current memory usage', 'Memory'),
+    ('ctools_filer_volume_space_total', 'Total volume space, as reported', 'Volume Total'),
+    ('ctools_filer_volume_space_used', 'Used volume space, as reported', 'Volume Used'),
+    ('ctools_filer_volume_space_free', 'Free volume space, as reported', 'Volume Free'),
+    ('ctools_filer_uptime_seconds', 'Time since the filer started', 'Uptime Seconds'),
+    ('ctools_filer_cloudsync_db_bytes', 'Size of the CloudSync database', 'DB Size'),
+]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number_text(value: float) -> str:
+    """Format a sample value without losing precision."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _SnapshotReport:
+    """A RowSink keeping typed rows in memory instead of writing a report."""
+
+    typed = True
+
+    def __init__(self, headers: List[str]):
+        self.headers = headers
+        self.rows: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def write(self, row: Sequence[Any]) -> None:
+        """Keep a row; safe to call from several threads."""
+        with self._lock:
+            self.rows.append(dict(zip(self.headers, row)))
+
+
+class MetricsCache:
+    """
+    Latest status of every filer, replaced as a whole after each collection.
+
+    Scrapes only read the cache, so they never wait for or cause portal calls.
+    """
+
+    def __init__(self) -> None:
+        self.rows: List[Dict[str, Any]] = []
+        self.collected_at: Optional[float] = None
+        self.duration: Optional[float] = None
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def update(self, rows: List[Dict[str, Any]], duration: float) -> None:
+        """Replace the snapshot with the rows of a completed collection."""
+        with self._lock:
+            self.rows = rows
+            self.collected_at = time.time()
+            self.duration = duration
+
+    def failed(self) -> None:
+        """Count a collection that failed; the previous snapshot is kept."""
+        with self._lock:
+            self.failures += 1
+
+    def render(self) -> str:
+        """Format the snapshot as OpenMetrics text."""
+        with self._lock:
+            rows, collected_at = self.rows, self.collected_at
+            duration, failures = self.duration, self.failures
+
+        lines = []
+        for name, help_text, column in FILER_METRICS:
+            samples = []
+            for row in rows:
+                value = row.get(column)
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                labels = f'tenant="{_escape(row["Tenant"])}",filer="{_escape(row["Filer Name"])}"'
+                samples.append(f'{name}{{{labels}}} {_number_text(value)}')
+            lines += [f'# TYPE {name} gauge', f'# HELP {name} {help_text}.', *samples]
+
+        lines += [
+            '# TYPE ctools_collection_filers gauge',
+            '# HELP ctools_collection_filers Filers in the latest collection.',
+            f'ctools_collection_filers {len(rows)}',
+            '# TYPE ctools_collection_failures counter',
+            '# HELP ctools_collection_failures Collections that failed.',
+            f'ctools_collection_failures_total {failures}',
+        ]
+        if collected_at is not None:
+            lines += [
+                '# TYPE ctools_collection_timestamp_seconds gauge',
+                '# HELP ctools_collection_timestamp_seconds End of the latest collection.',
+                f'ctools_collection_timestamp_seconds {collected_at:.3f}',
+                '# TYPE ctools_collection_duration_seconds gauge',
+                '# HELP ctools_collection_duration_seconds Duration of the latest collection.',
+                f'ctools_collection_duration_seconds {duration:.3f}',
+            ]
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """
+    HTTP server of the metrics endpoint.
+
+    Args:
+        address: (host, port) to listen on
+        cache: Metrics cache scrapes are answered from
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], cache: MetricsCache):
+        super().__init__(address, MetricsRequestHandler)
+        self.cache = cache
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """
+    OpenMetrics endpoint over the metrics cache.
+
+    GET /metrics  latest filer status
+    """
+
+    server_version = 'ctools-metrics'
+    server: MetricsServer
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Serve the cached metrics."""
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.cache.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        """Route access logs through logging."""
+        logging.debug("%s - %s", self.address_string(), format % args)
+
+
+def _collect(
+    session: Any,
+    headers: List[str],
+    **kwargs: Any
+) -> Tuple[List[Dict[str, Any]], float]:
+    """Run the status collection into memory and return the rows and its duration."""
+    start = time.monotonic()
+    report = _SnapshotReport(headers)
+    write_filer_status(session, report, **kwargs)
+    if kwargs.get('db_size'):
+        _add_db_bytes(session, report.rows, kwargs.get('db_size_ttl', DEFAULT_DB_SIZE_TTL))
+    return report.rows, time.monotonic() - start
+
+
+def _add_db_bytes(session: Any, rows: List[Dict[str, Any]], ttl: float) -> None:
+    """Replace the DB Size of each row with the exact size the collection cached."""
+    cache = ProbeCache(DB_SIZE_PROBE, session.host(), ttl)
+    for row in rows:
+        metrics = cache.get(f"{row['Tenant']}/{row['Filer Name']}")
+        row['DB Size'] = metrics.get('db_bytes') if metrics else None
+
+
+def _collect_forever(
+    pool: SessionPool,
+    cache: MetricsCache,
+    interval: float,
+    stop: threading.Event,
+    **kwargs: Any
+) -> None:
+    """Collect the status every interval seconds until stopped."""
+    headers = report_columns([column for _, _, column in FILER_METRICS], typed=True)
+    while not stop.is_set():
+        start = time.monotonic()
+        try:
+            rows, duration = pool.submit(_collect, headers=headers, **kwargs).result()
+            cache.update(rows, duration)
+            logging.info("Collected status of %d filers in %.1fs", len(rows), duration)
+        except Exception as e:
+            cache.failed()
+            logging.error("Status collection failed: %s", e)
+        stop.wait(max(0.0, interval - (time.monotonic() - start)))
+
+
+def export_metrics(
+    address: str,
+    username: str,
+    password: str,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_METRICS_PORT,
+    interval: float = DEFAULT_INTERVAL,
+    tenant: Optional[str] = None,
+    all_tenants: bool = False,
+    filters: Optional[FilerFilter] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    db_size: bool = False,
+    db_size_ttl: float = DEFAULT_DB_SIZE_TTL
+) -> None:
+    """
+    Collect filer status on a schedule and serve it as OpenMetrics until interrupted.
+
+    Args:
+        address: Portal IP, hostname, or FQDN
+        username: Global admin username
+        password: Global admin password
+        host: Interface to listen on
+        port: TCP port to listen on
+        interval: Seconds between the starts of two collections
+        tenant: Optional tenant name
+        all_tenants: If True, collect from all tenants
+        filters: Optional selection of filers
+        concurrency: Maximum number of filers processed at once
+        db_size: Collect the CloudSync database size, which enables telnet on each filer
+        db_size_ttl: Seconds a measured database size is reused
+    """
+    pool = SessionPool(address, username, password, workers=1)
+    cache = MetricsCache()
+    stop = threading.Event()
+    collector = threading.Thread(
+        target=_collect_forever,
+        args=(pool, cache, interval, stop),
+        kwargs={
+            'all_tenants': all_tenants, 'tenant': tenant, 'filters': filters,
+            'concurrency': concurrency, 'db_size': db_size, 'db_size_ttl': db_size_ttl
+        },
+        name='metrics-collector',
+        daemon=True
+    )
+    collector.start()
+
+    server = MetricsServer((host, port), cache)
+
+    logging.info("Exporting %s status on http://%s:%d/metrics", address, host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Shutting down.")
+    finally:
+        server.server_close()
+        stop.set()
+        pool.close()
@@ -0,0 +1,264 @@
+"""Local HTTP daemon that runs tools over warm portal sessions."""
+
+import hmac
+import json
+import logging
+import queue
+import secrets
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from cterasdk import GlobalAdmin
+
+from ..core.auth import open_portal_session
+from ..core.filer import get_current_tenant
+from ..core.resilience import thread_event_loop
+from ..tools.batch import BATCH_TOOLS, resolve_tool, tool_arguments
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+
+# Sessions idle for longer are checked before use and renewed if expired
+SESSION_CHECK_INTERVAL = 60
+
+JSON_CONTENT_TYPE = 'application/json'
+
+
+class SessionPool:
+    """
+    Worker threads that each keep an authenticated portal session.
+
+    cterasdk binds a session to the event loop it was created on, so every
+    worker runs its own event loop and logs in once, on first use. Sessions
+    idle for a while are checked and renewed before the next task.
+    """
+
+    def __init__(self, address: str, username: str, password: str, workers: int = DEFAULT_WORKERS):
+        self.address = address
+        self.username = username
+        self.password = password
+        self.tasks: queue.Queue = queue.Queue()
+        self.threads = [
+            threading.Thread(target=self._worker, name=f"serve-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, func: Callable[..., Any], **kwargs: Any) -> Future:
+        """
+        Run func(session, **kwargs) on the next free worker.
+
+        Args:
+            func: Tool entry function
+            **kwargs: Keyword arguments passed to func
+
+        Returns:
+            Future with the return value of func
+        """
+        future: Future = Future()
+        self.tasks.put((future, func, kwargs))
+        return future
+
+    def close(self) -> None:
+        """Stop the workers and log out their sessions."""
+        for _ in self.threads:
+            self.tasks.put(None)
+        for thread in self.threads:
+            thread.join()
+
+    def _worker(self) -> None:
+        """Run tasks on a dedicated event loop and session."""
+        loop = thread_event_loop()
+        session = None
+        last_used = 0.0
+
+        try:
+            while True:
+                task = self.tasks.get()
+                if task is None:
+                    break
+                future, func, kwargs = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if session is None or time.monotonic() - last_used > SESSION_CHECK_INTERVAL:
+                        session = self._renew(session)
+                    future.set_result(func(session, **kwargs))
+                except Exception as e:
+                    future.set_exception(e)
+                last_used = time.monotonic()
+        finally:
+            if session is not None:
+                try:
+                    session.logout()
+                except Exception as e:
+                    logging.debug("Logout failed: %s", e)
+            loop.close()
+
+    def _renew(self, session: Optional[GlobalAdmin]) -> GlobalAdmin:
+        """Return the session if it is still valid, otherwise log in again."""
+        if session is not None:
+            try:
+                get_current_tenant(session)
+                return session
+            except Exception as e:
+                logging.info("Portal session expired, logging in again: %s", e)
+
+        return open_portal_session(self.address, self.username, self.password)
+
+
+class ToolServer(ThreadingHTTPServer):
+    """
+    HTTP server of the tool API, holding what its handlers share.
+
+    Args:
+        address: (host, port) to listen on
+        pool: Session pool tools run on
+        token: Bearer token required on every request
+        origins: Origins browsers may send requests from
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], pool: SessionPool, token: str, origins: Set[str]):
+        super().__init__(address, ToolRequestHandler)
+        self.pool = pool
+        self.token = token
+        self.origins = origins
+
+
+class ToolRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API over the session pool.
+
+    GET  /health        daemon status
+    GET  /tools         available tool names
+    POST /tools/<name>  run a tool; the JSON body holds its keyword arguments
+
+    Every request needs the daemon's bearer token. Requests a browser sends
+    on behalf of another site are refused: POST bodies must be declared as
+    application/json, which a page cannot send without a CORS preflight, and
+    an Origin other than the daemon's own is rejected.
+    """
+
+    server_version = 'ctools-serve'
+    server: ToolServer
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Handle status requests."""
+        if not self._authorized():
+            return
+        if self.path == '/health':
+            self._reply(200, {'status': 'ok', 'portal': self.server.pool.address})
+        elif self.path == '/tools':
+            self._reply(200, {'tools': sorted(BATCH_TOOLS)})
+        else:
+            self._reply(404, {'error': f"Not found: {self.path}"})
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Handle tool runs."""
+        if not self._authorized():
+            return
+        if not self.path.startswith('/tools/'):
+            self._reply(404, {'error': f"Not found: {self.path}"})
+            return
+
+        tool = self.path[len('/tools/'):]
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != JSON_CONTENT_TYPE:
+            self._reply(415, {'error': f"Content-Type must be {JSON_CONTENT_TYPE}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(body, dict):
+                raise ValueError("Request body must be a JSON object")
+            func = resolve_tool(tool)
+            kwargs = tool_arguments(body)
+        except ValueError as e:
+            self._reply(400, {'error': str(e)})
+            return
+
+        start = time.monotonic()
+        try:
+            result = self.server.pool.submit(func, **kwargs).result()
+            if result is False:
+                raise RuntimeError("The tool failed, see the server log for details")
+        except Exception as e:
+            logging.error("Tool %s failed: %s", tool, e)
+            self._reply(500, {'tool': tool, 'error': str(e)})
+            return
+        self._reply(200, {
+            'tool': tool,
+            'result': result,
+            'elapsed': round(time.monotonic() - start, 3)
+        })
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        """Route access logs through logging."""
+        logging.debug("%s - %s", self.address_string(), format % args)
+
+    def _authorized(self) -> bool:
+        """Check the Origin, if any, and the bearer token."""
+        origin = self.headers.get('Origin')
+        if origin is not None and origin not in self.server.origins:
+            self._reply(403, {'error': f"Origin not allowed: {origin}"})
+            return False
+        supplied = self.headers.get('Authorization', '')
+        if hmac.compare_digest(supplied, f'Bearer {self.server.token}'):
+            return True
+        self._reply(401, {'error': 'Unauthorized'})
+        return False
+
+    def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+        """Send a JSON response."""
+        body = json.dumps(payload, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(
+    address: str,
+    username: str,
+    password: str,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    workers: int = DEFAULT_WORKERS,
+    token: Optional[str] = None
+) -> None:
+    """
+    Serve the tool API until interrupted.
+
+    Args:
+        address: Portal IP, hostname, or FQDN
+        username: Global admin username
+        password: Global admin password
+        host: Interface to listen on
+        port: TCP port to listen on
+        workers: Number of warm portal sessions, and tools run at once
+        token: Bearer token required on every request, generated when not given
+    """
+    if not token:
+        token = secrets.token_urlsafe(32)
+        # Printed rather than logged, so the token is not kept in the log file
+        print(f"Bearer token for this daemon: {token}", flush=True)
+    pool = SessionPool(address, username, password, workers)
+    origins = {f'http://{name}:{port}' for name in (host, 'localhost', '127.0.0.1')}
+    server = ToolServer((host, port), pool, token, origins)
+
+    logging.info("Serving %s on http://%s:%d", address, host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Shutting down.")
+    finally:
+        server.server_close()
+        pool.close()
@@ -1,15 +1,50 @@
 """Core utilities for CTools."""
 
-from .auth import global_admin_login
+from .auth import global_admin_login, async_global_admin_login
 from .logging import setup_logging
-from .filer import get_filers, get_filer, get_current_tenant, get_portal_name, safe_cli_command
+from .filer import (
+    FilerFilter, get_filers, iter_filers, get_filer, get_current_tenant, get_portal_name,
+    safe_cli_command
+)
+from .fleet import (
+    run_on_filers, run_in_session_pool, gather_on_filers, clone_session,
+    FilerPool, FleetResult, DEFAULT_CONCURRENCY
+)
+from .aio import AsyncFiler, UnsupportedSDKError, get_filers_async
+from .history import StatusHistory
+from .journal import RunJournal
+from .report import ReportSink, RowSink
+from .shares_index import SharesIndex
+from .resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded, DEFAULT_FILER_TIMEOUT
 
 __all__ = [
     'global_admin_login',
+    'async_global_admin_login',
     'setup_logging',
+    'FilerFilter',
     'get_filers',
+    'iter_filers',
     'get_filer',
     'get_current_tenant',
     'get_portal_name',
     'safe_cli_command',
+    'run_on_filers',
+    'run_in_session_pool',
+    'gather_on_filers',
+    'clone_session',
+    'FilerPool',
+    'FleetResult',
+    'DEFAULT_CONCURRENCY',
+    'AsyncFiler',
+    'UnsupportedSDKError',
+    'get_filers_async',
+    'StatusHistory',
+    'RunJournal',
+    'ReportSink',
+    'RowSink',
+    'SharesIndex',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'DeadlineExceeded',
+    'DEFAULT_FILER_TIMEOUT',
 ]
@@ -0,0 +1,188 @@
+"""Asyncio execution path built on the cterasdk async portal client."""
+
+import asyncio
+import logging
+from functools import lru_cache
+from importlib import metadata
+from typing import Any, List, Optional, Tuple
+
+from cterasdk import AsyncGlobalAdmin, CTERAException, Object
+from cterasdk.asynchronous.core import query as async_query
+
+from .filer import FilerFilter, get_portal_name
+
+# cterasdk releases whose internals _device_api was checked against
+TESTED_SDK_RELEASES = ('2.19',)
+
+
+class UnsupportedSDKError(RuntimeError):
+    """The installed cterasdk lacks the internals the asyncio engine relies on."""
+
+
+class AsyncFiler:
+    """
+    Remote access to a filer through an AsyncGlobalAdmin session.
+
+    Requests are sent to the portal's device command endpoint over the portal's
+    HTTP session, the same way cterasdk's synchronous remote Edge object does,
+    so many filers can be driven concurrently from one event loop.
+    """
+
+    def __init__(self, admin: AsyncGlobalAdmin, device: Any):
+        self.name = device.name
+        self.portal = device.portal
+        self.deviceType = device.deviceType
+        self.deviceConnectionStatus = getattr(device, 'deviceConnectionStatus', None)
+        self.deviceReportedStatus = getattr(device, 'deviceReportedStatus', None)
+        self.tenant = get_portal_name(device)
+        self.api = _device_api(admin, self.tenant, self.name)
+
+    async def run_command(self, command: str) -> Any:
+        """Execute a CLI command on the filer."""
+        return await self.api.execute('/config/device', 'debugCmd', command)
+
+    async def run_shell(self, command: str, retries: int = 10, seconds: float = 1) -> str:
+        """Execute a shell command as a background task and wait for its result."""
+        ref = await self.api.execute('/config/device', 'bgshell', command)
+        path = '/proc/bgtasks/' + str(ref).rstrip('/').split('/')[-1]
+        for _ in range(retries):
+            await asyncio.sleep(seconds)
+            task = await self.api.get(path)
+            if task.status == 'running':
+                continue
+            if task.status == 'failed':
+                raise CTERAException('Shell command failed', None, command=command)
+            output: str = task.result.result
+            return output
+        raise CTERAException('Timed out waiting for shell command', None, command=command)
+
+    async def enable_telnet(self, code: str) -> None:
+        """Enable telnet access on the filer."""
+        param = Object()
+        param.code = code
+        response = await self.api.execute('/config/device', 'startTelnetd', param)
+        if response not in ('OK', 'telnetd already running'):
+            raise CTERAException('Failed enabling telnet access', None, reason=response)
+
+    async def disable_telnet(self) -> None:
+        """Disable telnet access on the filer."""
+        await self.api.execute('/config/device', 'stopTelnetd')
+
+
+def _sdk_release() -> str:
+    """Get the installed cterasdk version, 'unknown' if it has no package metadata."""
+    try:
+        return metadata.version('cterasdk')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def _unsupported() -> UnsupportedSDKError:
+    """Describe the installed cterasdk lacking what the asyncio engine needs."""
+    return UnsupportedSDKError(
+        f"cterasdk {_sdk_release()} does not support --async, use the default engine"
+    )
+
+
+@lru_cache(maxsize=None)
+def _sdk_internals() -> Tuple[Any, Any]:
+    """
+    Import the cterasdk internals _device_api builds on, once.
+
+    Returns:
+        The AsyncAPI client class and the EndpointBuilder class
+
+    Raises:
+        UnsupportedSDKError: If the installed cterasdk does not provide them
+    """
+    release = _sdk_release()
+    try:
+        # pylint: disable=import-outside-toplevel
+        from cterasdk.clients.asynchronous.clients import AsyncAPI
+        from cterasdk.objects.endpoints import EndpointBuilder
+    except ImportError as e:
+        raise _unsupported() from e
+    if not callable(getattr(EndpointBuilder, 'new', None)):
+        raise _unsupported()
+    if not release.startswith(TESTED_SDK_RELEASES):
+        logging.warning(
+            "The asyncio engine is untested with cterasdk %s (tested with %s)",
+            release, ', '.join(TESTED_SDK_RELEASES)
+        )
+    return AsyncAPI, EndpointBuilder
+
+
+def _device_api(admin: AsyncGlobalAdmin, tenant: str, name: str) -> Any:
+    """
+    Build an async API client for the remote access endpoint of a filer.
+
+    cterasdk's async portal client has no public remote access to filers, so
+    this is the one place that relies on its internals: the endpoint builder,
+    the async API client and the portal's HTTP session. Requests carry the
+    portal session, so the client's own authenticator always passes.
+
+    Args:
+        admin: Authenticated AsyncGlobalAdmin session
+        tenant: Tenant of the filer
+        name: Filer name
+
+    Returns:
+        AsyncAPI client of the filer
+
+    Raises:
+        UnsupportedSDKError: If the installed cterasdk does not provide the internals
+    """
+    api_class, endpoint_builder = _sdk_internals()
+    generic = getattr(admin, '_generic', None)
+    http_session = getattr(generic, '_async_session', None)
+    if http_session is None:
+        raise _unsupported()
+    endpoint = endpoint_builder.new(admin.base, admin.context, 'devicecmdnew', tenant, name)
+    return api_class(endpoint, http_session, lambda *_: True)
+
+
+async def get_filers_async(
+    admin: AsyncGlobalAdmin,
+    all_tenants: bool = False,
+    tenant: Optional[str] = None,
+    filters: Optional[FilerFilter] = None
+) -> Optional[List[AsyncFiler]]:
+    """
+    Get all connected filers from the portal.
+
+    Args:
+        admin: Authenticated AsyncGlobalAdmin session
+        all_tenants: If True, get filers from all tenants
+        tenant: Specific tenant name (ignored if all_tenants is True)
+        filters: Optional selection of filers, defaults to all connected gateways
+
+    Returns:
+        List of connected AsyncFiler objects or None on error
+
+    Raises:
+        UnsupportedSDKError: If the installed cterasdk cannot drive filers asynchronously
+    """
+    _sdk_internals()  # Fail before listing filers the engine cannot reach
+    filters = filters or FilerFilter()
+    param = filters.query_builder().allPortals(all_tenants).build()
+
+    if all_tenants:
+        logging.info("Getting all Filers")
+        path = '/devices'
+    elif tenant:
+        logging.info("Getting Filers connected to %s", tenant)
+        path = f'/portals/{tenant}/devices'
+    else:
+        logging.info("Getting Filers in the current tenant")
+        path = '/devices'
+
+    try:
+        return [
+            AsyncFiler(admin, device)
+            async for device in async_query.iterator(admin, path, param)
+            if filters.matches(device)
+        ]
+    except CTERAException as error:
+        logging.debug(error)
+        logging.error("Error getting Filers.")
+        return None
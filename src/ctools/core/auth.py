@@ -1,12 +1,23 @@
 """Authentication utilities for CTERA Portal."""
 
+import json
 import logging
+import os
 import sys
+import time
 from io import StringIO
-from typing import Optional
+from typing import Dict, Optional
 
 import urllib3
-from cterasdk import GlobalAdmin, CTERAException, settings
+from cterasdk import AsyncGlobalAdmin, GlobalAdmin, CTERAException, settings
+
+from .inventory import user_cache_dir
+from .limiter import limit_api
+
+SSO_SETTING = '/rolesSettings/readWriteAdminSettings/allowSSO'
+
+# Seconds a portal found with device SSO enabled is trusted to still have it
+SSO_STATE_TTL = 3600
 
 
 def global_admin_login(
@@ -60,8 +71,199 @@ def enable_device_sso(admin: GlobalAdmin) -> bool:
     """
     try:
         admin.portals.browse_global_admin()
-        admin.api.put('/rolesSettings/readWriteAdminSettings/allowSSO', 'true')
+        admin.api.put(SSO_SETTING, 'true')
         return True
     except Exception as e:
         logging.warning("Failed to enable device SSO: %s", e)
         return False
+
+
+def ensure_device_sso(admin: GlobalAdmin) -> bool:
+    """
+    Make sure Single Sign On to devices is enabled for read-write admins.
+
+    Portals found with SSO enabled within the last SSO_STATE_TTL seconds are
+    skipped without any request, so an admin turning SSO off is noticed on
+    the next check. Otherwise the setting is read and only written when it
+    is disabled.
+
+    Args:
+        admin: Authenticated GlobalAdmin session
+
+    Returns:
+        True if the setting was changed, so sessions opened before the change
+        should be replaced, False otherwise
+    """
+    if _sso_known(admin.host()):
+        return False
+
+    try:
+        admin.portals.browse_global_admin()
+        if _is_enabled(admin.api.get(SSO_SETTING)):
+            _remember_sso(admin.host())
+            return False
+    except Exception as e:
+        logging.warning("Failed to read device SSO setting: %s", e)
+        return False
+
+    if not enable_device_sso(admin):
+        return False
+    logging.info("Enabled device SSO on %s", admin.host())
+    _remember_sso(admin.host())
+    return True
+
+
+def open_portal_session(address: str, username: str, password: str) -> GlobalAdmin:
+    """
+    Log in to the portal the way every CLI run does.
+
+    Device SSO is enabled first if it is not known to be, logging in again
+    when it was changed, and the session's requests go through the shared
+    adaptive limiter of core.limiter.
+
+    Args:
+        address: Portal IP, hostname, or FQDN
+        username: Global admin username
+        password: Global admin password
+
+    Returns:
+        Authenticated GlobalAdmin session
+
+    Raises:
+        CTERAException: If the login fails
+    """
+    admin = GlobalAdmin(address)
+    admin.login(username, password)
+    if ensure_device_sso(admin):
+        # SSO applies to sessions opened after it was enabled
+        admin.logout()
+        admin.login(username, password)
+    return limit_api(admin)
+
+
+async def async_global_admin_login(
+    address: str,
+    username: str,
+    password: str,
+    ignore_cert: bool = False
+) -> Optional[AsyncGlobalAdmin]:
+    """
+    Log into CTERA Portal and return an AsyncGlobalAdmin session.
+
+    Must be awaited on the event loop the session will be used from.
+
+    Args:
+        address: Portal IP, hostname, or FQDN
+        username: Global admin username
+        password: Global admin password
+        ignore_cert: If True, ignore SSL certificate warnings
+
+    Returns:
+        AsyncGlobalAdmin session object, or None if login fails
+    """
+    if ignore_cert:
+        settings.sessions.management.ssl = False
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    try:
+        logging.info("Logging into %s", address)
+        global_admin = AsyncGlobalAdmin(address)
+        await global_admin.login(username, password)
+        logging.debug("Successfully logged in to %s", address)
+        return global_admin
+    except CTERAException as error:
+        logging.error(
+            "Login failed. Verify credentials and certificate settings. Error: %s",
+            error
+        )
+        return None
+
+
+async def enable_device_sso_async(admin: AsyncGlobalAdmin) -> bool:
+    """
+    Enable Single Sign On to devices for read-write admins.
+
+    Args:
+        admin: Authenticated AsyncGlobalAdmin session
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        await admin.v1.api.put(SSO_SETTING, 'true')
+        return True
+    except Exception as e:
+        logging.warning("Failed to enable device SSO: %s", e)
+        return False
+
+
+async def ensure_device_sso_async(admin: AsyncGlobalAdmin, address: str) -> bool:
+    """
+    Make sure Single Sign On to devices is enabled for read-write admins.
+
+    Args:
+        admin: Authenticated AsyncGlobalAdmin session
+        address: Portal address the session is logged into
+
+    Returns:
+        True if the setting was changed, False otherwise
+    """
+    if _sso_known(address):
+        return False
+
+    try:
+        if _is_enabled(await admin.v1.api.get(SSO_SETTING)):
+            _remember_sso(address)
+            return False
+    except Exception as e:
+        logging.warning("Failed to read device SSO setting: %s", e)
+        return False
+
+    if not await enable_device_sso_async(admin):
+        return False
+    logging.info("Enabled device SSO on %s", address)
+    _remember_sso(address)
+    return True
+
+
+def _is_enabled(value: object) -> bool:
+    """Interpret a boolean portal setting."""
+    return str(value).lower() == 'true'
+
+
+def _sso_state_path() -> str:
+    """Get the path of the file listing portals with device SSO enabled."""
+    return os.path.join(user_cache_dir(), 'sso.json')
+
+
+def _sso_enabled_portals() -> Dict[str, float]:
+    """Get the portals found with device SSO enabled, and when each was checked."""
+    try:
+        with open(_sso_state_path(), encoding='utf-8') as f:
+            portals = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # Older versions kept a plain list, without check times
+    return portals if isinstance(portals, dict) else {}
+
+
+def _sso_known(address: str) -> bool:
+    """Check if a portal was found with device SSO enabled within SSO_STATE_TTL."""
+    checked_at = _sso_enabled_portals().get(address)
+    return checked_at is not None and time.time() - checked_at < SSO_STATE_TTL
+
+
+def _remember_sso(address: str) -> None:
+    """Record that a portal has device SSO enabled, dropping expired entries."""
+    now = time.time()
+    portals = {
+        portal: checked_at for portal, checked_at in _sso_enabled_portals().items()
+        if now - checked_at < SSO_STATE_TTL
+    }
+    portals[address] = now
+    try:
+        os.makedirs(os.path.dirname(_sso_state_path()), exist_ok=True)
+        with open(_sso_state_path(), 'w', encoding='utf-8') as f:
+            json.dump(portals, f, sort_keys=True)
+    except OSError as e:
+        logging.debug("Failed to save device SSO state: %s", e)
@@ -2,9 +2,86 @@
 
 import logging
 import re
-from typing import Optional, List, Any
+import time
+from dataclasses import dataclass, field
+from typing import Optional, List, Any, Dict, Iterable, Iterator, Sequence
 
 from cterasdk import CTERAException
+from cterasdk.core import query, remote
+from cterasdk.core.enum import DeviceType
+
+from . import inventory
+
+FILER_INCLUDE = [
+    'name', 'portal', 'deviceType', 'version', 'remoteAccessUrl',
+    'deviceConnectionStatus.connected',
+    'deviceReportedStatus.config.hostname'
+]
+
+DISCOVERY_CONCURRENCY = 8
+
+
+@dataclass
+class FilerFilter:
+    """
+    Selection of filers to discover.
+
+    All criteria except name_regex are sent to the portal as part of the device
+    query, so only matching devices are returned. The portal has no regular
+    expression restriction, so name_regex is applied to the returned page.
+    Device types are checked again on the returned page, since the query can
+    only exclude the types this SDK knows of.
+
+    Attributes:
+        connected_only: Only return filers connected to the portal
+        name: Substring the filer name must contain
+        name_regex: Regular expression the filer name must match
+        firmware: Substring the firmware version must contain
+        device_types: Device types to return (defaults to all gateway types)
+    """
+
+    connected_only: bool = True
+    name: Optional[str] = None
+    name_regex: Optional[str] = None
+    firmware: Optional[str] = None
+    device_types: List[str] = field(default_factory=lambda: list(DeviceType.Gateways))
+
+    def query_builder(self, include: Sequence[str] = ()) -> query.QueryParamBuilder:
+        """
+        Create a device query builder for this selection.
+
+        Filters are AND-ed, so device types are selected by excluding every
+        other known type; matches rejects the types that are not known.
+
+        Args:
+            include: Device fields to return in addition to FILER_INCLUDE
+
+        Returns:
+            QueryParamBuilder with the include list and server-side filters
+        """
+        builder = query.QueryParamBuilder().include(FILER_INCLUDE + list(include))
+        if self.connected_only:
+            builder.addFilter(query.FilterBuilder('deviceConnectionStatus.connected').eq(True))
+        if self.name:
+            builder.addFilter(query.FilterBuilder('name').like(self.name))
+        if self.firmware:
+            builder.addFilter(query.FilterBuilder('version').like(self.firmware))
+        for device_type in DeviceType.Gateways + DeviceType.Agents:
+            if device_type not in self.device_types:
+                builder.addFilter(query.FilterBuilder('deviceType').ne(device_type))
+        return builder
+
+    def matches(self, device: Any) -> bool:
+        """Check a returned device against the client-side criteria, type and connection state."""
+        if getattr(device, 'deviceType', None) not in self.device_types:
+            return False
+        if self.connected_only and not device.deviceConnectionStatus.connected:
+            return False
+        return not self.name_regex or re.search(self.name_regex, device.name) is not None
+
+    def select(self, devices: Iterable[Any]) -> Iterator[Any]:
+        """Yield the devices that match the criteria evaluated client-side."""
+        return (device for device in devices if self.matches(device))
 
 
 def safe_cli_command(filer: Any, command: str) -> str:
@@ -138,56 +215,330 @@ def get_filer(portal_session: Any, device: str, tenant: Optional[str] = None) ->
 def get_filers(
     portal_session: Any,
     all_tenants: bool = False,
-    tenant: Optional[str] = None
+    tenant: Optional[str] = None,
+    timings: Optional[Dict[str, float]] = None,
+    filters: Optional[FilerFilter] = None,
+    current: bool = False
 ) -> Optional[List[Any]]:
     """
     Get all connected filers from the portal.
 
+    Filers are served from the inventory cache when it holds a discovery of
+    the same portal, tenant and selection (see core.inventory), unless current
+    is set. Tools that change filers set it, so they never act on a stale list.
+
     Args:
         portal_session: Portal session object
         all_tenants: If True, get filers from all tenants
         tenant: Specific tenant name (ignored if all_tenants is True)
+        timings: Optional dict filled with the discovery time in seconds of each
+            tenant, left empty when the filers are served from the cache
+        filters: Optional selection of filers, defaults to all connected gateways
+        current: Discover the filers now, refreshing the inventory cache
 
     Returns:
         List of connected filer objects or None on error
     """
+    filters = filters or FilerFilter()
+    try:
+        scope = _discovery_scope(portal_session, all_tenants, tenant)
+        return inventory.get_or_discover(
+            portal_session, scope, inventory.selection_key(filters),
+            lambda session: _discover_filers(session, scope, filters, timings),
+            current
+        )
+    except CTERAException as error:
+        logging.debug(error)
+        logging.error("Error getting Filers.")
+        return None
+
+
+def iter_filers(
+    portal_session: Any,
+    all_tenants: bool = False,
+    tenant: Optional[str] = None,
+    filters: Optional[FilerFilter] = None,
+    current: bool = False
+) -> Iterator[Any]:
+    """
+    Yield connected filers page by page, tenant by tenant, as the portal returns them.
+
+    Unlike get_filers, processing can start with the first filer, and only the
+    page being read is held rather than every filer object. Filers are served
+    from the inventory cache on the same terms as get_filers; a discovery is
+    cached once the generator is exhausted. With all tenants, a tenant that
+    cannot be queried is logged and skipped.
+
+    Args:
+        portal_session: Portal session object
+        all_tenants: If True, get filers from all tenants
+        tenant: Specific tenant name (ignored if all_tenants is True)
+        filters: Optional selection of filers, defaults to all connected gateways
+        current: Discover the filers now, refreshing the inventory cache
+
+    Yields:
+        Connected filer objects
+
+    Raises:
+        CTERAException: If the filers could not be listed
+    """
+    filters = filters or FilerFilter()
+    scope = _discovery_scope(portal_session, all_tenants, tenant)
+    selection = inventory.selection_key(filters)
+    entry = inventory.cached(
+        portal_session, scope, selection,
+        lambda session: _discover_filers(session, scope, filters), current
+    )
+    if entry:
+        yield from entry.iter_filers(portal_session)
+        return
+
+    tenants = (
+        [portal_tenant.name for portal_tenant in portal_session.portals.tenants()]
+        if scope == '*' else [scope]
+    )
+    start = time.monotonic()
+    rows: List[tuple] = []
+    errors: List[CTERAException] = []
+    for name in tenants:
+        try:
+            for device in _iter_devices(portal_session, _devices_path(name), filters):
+                rows.append(inventory.cache_row(device))
+                yield remote.remote_command(portal_session, device)
+        except CTERAException as e:
+            if scope != '*':
+                raise
+            logging.debug(e)
+            logging.error("Error getting Filers of tenant %s.", name)
+            errors.append(e)
+
+    if errors and len(errors) == len(tenants):
+        raise errors[0]
+    logging.info("Found %d connected Filers in %.2fs", len(rows), time.monotonic() - start)
+    if not errors:
+        # A discovery that missed tenants is not cached
+        inventory.store_rows(portal_session, scope, selection, rows)
+
+
+def _discovery_scope(portal_session: Any, all_tenants: bool, tenant: Optional[str]) -> str:
+    """
+    Set the session context for a discovery and get its scope.
+
+    Args:
+        portal_session: Portal session object
+        all_tenants: If True, discover filers of all tenants
+        tenant: Specific tenant name (ignored if all_tenants is True)
+
+    Returns:
+        '*' for all tenants, otherwise the tenant name ('' if unknown)
+    """
+    if all_tenants:
+        portal_session.portals.browse_global_admin()
+        current = get_current_tenant(portal_session)
+        logging.info("Getting all Filers (current tenant: %s)", current)
+        return '*'
+    if tenant:
+        portal_session.portals.browse(tenant)
+    else:
+        tenant = get_current_tenant(portal_session)
+    logging.info("Getting Filers connected to %s", tenant)
+    return tenant or ''
+
+
+def _discover_filers(
+    portal_session: Any,
+    scope: str,
+    filters: FilerFilter,
+    timings: Optional[Dict[str, float]] = None
+) -> List[Any]:
+    """
+    Query the portal for the filers of a discovery scope.
+
+    Args:
+        portal_session: Portal session object
+        scope: '*' for all tenants, otherwise the tenant name ('' if unknown)
+        filters: Selection of filers
+        timings: Optional dict filled with the discovery time in seconds of each tenant
+
+    Returns:
+        List of connected filer objects
+    """
+    if scope == '*':
+        return _get_all_tenant_filers(portal_session, filters, timings)
+
+    start = time.monotonic()
+    connected_filers = [
+        remote.remote_command(portal_session, device)
+        for device in _iter_devices(portal_session, _devices_path(scope), filters)
+    ]
+    if timings is not None:
+        timings[scope] = time.monotonic() - start
+    return connected_filers
+
+
+def _devices_path(tenant: str) -> str:
+    """Get the device collection of a tenant, or of the session context if unknown."""
+    return f'/portals/{tenant}/devices' if tenant else '/devices'
+
+
+def _get_all_tenant_filers(
+    portal_session: Any,
+    filters: FilerFilter,
+    timings: Optional[Dict[str, float]] = None
+) -> List[Any]:
+    """
+    Enumerate the connected filers of every tenant concurrently.
+
+    Tenants are queried through their /portals/<tenant>/devices collection rather
+    than by browsing into each tenant, since worker sessions share one server-side
+    session and its tenant context.
+
+    Args:
+        portal_session: Portal session object browsed to the global administration
+        filters: Selection of filers
+        timings: Optional dict filled with the discovery time in seconds of each tenant
+
+    Returns:
+        List of connected filer objects, ordered by tenant
+    """
+    start = time.monotonic()
+    connected_filers: List[Any] = []
+    tenants = 0
+    for name, devices, elapsed in _query_all_tenants(portal_session, filters):
+        logging.debug("Found %d connected Filers in %s in %.2fs", len(devices), name, elapsed)
+        if timings is not None:
+            timings[name] = elapsed
+        # Wrap on the caller's thread so the filers use the caller's session
+        connected_filers.extend(remote.remote_command(portal_session, device) for device in devices)
+        tenants += 1
+
+    logging.info(
+        "Found %d connected Filers in %d tenants in %.2fs",
+        len(connected_filers), tenants, time.monotonic() - start
+    )
+    return connected_filers
+
+
+def _query_all_tenants(
+    portal_session: Any,
+    filters: FilerFilter,
+    include: Sequence[str] = ()
+) -> List[tuple]:
+    """
+    Query the devices of every tenant concurrently.
+
+    Args:
+        portal_session: Portal session object browsed to the global administration
+        filters: Selection of filers
+        include: Device fields to return in addition to FILER_INCLUDE
+
+    Returns:
+        (tenant, list of device objects, elapsed seconds) of each tenant that
+        could be queried, in tenant order
+
+    Raises:
+        CTERAException: If no tenant could be queried
+    """
+    from .fleet import run_in_session_pool  # pylint: disable=import-outside-toplevel
+
+    tenants = [portal_tenant.name for portal_tenant in portal_session.portals.tenants()]
+    result = run_in_session_pool(
+        portal_session, tenants, _query_tenant_filers, filters, include,
+        concurrency=DISCOVERY_CONCURRENCY
+    )
+
+    for name, error in result.failed.items():
+        logging.debug(error)
+        logging.error("Error getting Filers of tenant %s.", name)
+    if result.failed and not result.succeeded:
+        raise next(iter(result.failed.values()))
+
+    return [(name, *result.succeeded[name]) for name in tenants if name in result.succeeded]
+
+
+def _query_tenant_filers(
+    worker_session: Any,
+    tenant: str,
+    filters: FilerFilter,
+    include: Sequence[str] = ()
+) -> tuple:
+    """
+    Query the filers of a tenant without changing the session context.
+
+    Args:
+        worker_session: Portal session of the calling worker thread
+        tenant: Tenant name
+        filters: Selection of filers
+        include: Device fields to return in addition to FILER_INCLUDE
+
+    Returns:
+        Tuple of (list of device objects, elapsed seconds)
+    """
+    start = time.monotonic()
+    devices = list(_iter_devices(worker_session, _devices_path(tenant), filters, include))
+    return devices, time.monotonic() - start
+
+
+def _iter_devices(
+    portal_session: Any,
+    path: str,
+    filters: FilerFilter,
+    include: Sequence[str] = ()
+) -> Iterator[Any]:
+    """
+    Page through the devices of a device collection that match a selection.
+
+    Args:
+        portal_session: Portal session object
+        path: Device collection path, /devices or /portals/<tenant>/devices
+        filters: Selection of filers
+        include: Device fields to return in addition to FILER_INCLUDE
+
+    Returns:
+        Iterator of matching device objects, not yet wrapped for remote access
+    """
+    builder = filters.query_builder(include)
+    return filters.select(query.iterator(portal_session, path, builder.build()))
+
+
+def get_reported_devices(
+    portal_session: Any,
+    all_tenants: bool = False,
+    tenant: Optional[str] = None,
+    filters: Optional[FilerFilter] = None,
+    include: Sequence[str] = ()
+) -> Optional[List[Any]]:
+    """
+    Get connected filers with fields the portal holds about them, such as the
+    status and config they last reported (deviceReportedStatus).
+
+    This takes one paged device query per tenant and no call to any filer.
+    The inventory cache is bypassed, as it keeps only the FILER_INCLUDE fields.
+
+    Args:
+        portal_session: Portal session object
+        all_tenants: If True, get filers from all tenants
+        tenant: Specific tenant name (ignored if all_tenants is True)
+        filters: Optional selection of filers, defaults to all connected gateways
+        include: Device fields to return in addition to FILER_INCLUDE
+
+    Returns:
+        List of device objects, not wrapped for remote access, or None on error
+    """
+    filters = filters or FilerFilter()
     try:
-        connected_filers = []
-        include_fields = [
-            'deviceConnectionStatus.connected',
-            'deviceReportedStatus.config.hostname'
-        ]
-
-        if all_tenants:
-            portal_session.portals.browse_global_admin()
-            current = get_current_tenant(portal_session)
-            logging.info("Getting all Filers (current tenant: %s)", current)
-
-            for portal_tenant in portal_session.portals.tenants():
-                portal_session.portals.browse(portal_tenant.name)
-                tenant_filers = portal_session.devices.filers(include=include_fields)
-                connected_filers.extend([
-                    f for f in tenant_filers
-                    if f.deviceConnectionStatus.connected
-                ])
-        elif tenant:
-            logging.info("Getting Filers connected to %s", tenant)
-            portal_session.portals.browse(tenant)
-            tenant_filers = portal_session.devices.filers(include=include_fields)
-            connected_filers.extend([
-                f for f in tenant_filers
-                if f.deviceConnectionStatus.connected
-            ])
+        scope = _discovery_scope(portal_session, all_tenants, tenant)
+        start = time.monotonic()
+        if scope == '*':
+            devices = [
+                device for _, tenant_devices, _ in
+                _query_all_tenants(portal_session, filters, include)
+                for device in tenant_devices
+            ]
         else:
-            current_tenant = get_current_tenant(portal_session)
-            logging.info("Getting Filers connected to %s", current_tenant)
-            tenant_filers = portal_session.devices.filers(include=include_fields)
-            connected_filers.extend([
-                f for f in tenant_filers
-                if f.deviceConnectionStatus.connected
-            ])
-
-        return connected_filers
+            devices = list(_iter_devices(portal_session, _devices_path(scope), filters, include))
+        logging.info("Found %d connected Filers in %.2fs", len(devices), time.monotonic() - start)
+        return devices
     except CTERAException as error:
         logging.debug(error)
         logging.error("Error getting Filers.")
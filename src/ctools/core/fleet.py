@@ -0,0 +1,507 @@
+"""Concurrent execution of per-filer operations."""
+
+import asyncio
+import logging
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sized
+
+from cterasdk import GlobalAdmin
+
+from .filer import get_portal_name
+from .journal import RunJournal, filer_key
+from .limiter import limit_api
+from .resilience import (
+    DEFAULT_FILER_TIMEOUT, CircuitBreaker, DeadlineExceeded, deadline, protect, thread_event_loop
+)
+
+DEFAULT_CONCURRENCY = 10
+
+# Seconds between checks that a worker is still alive while waiting to hand out an item
+HAND_OUT_POLL = 1.0
+
+
+@dataclass
+class FleetResult:
+    """Outcome of a fleet-wide operation, keyed by filer (see filer_key) or work item."""
+
+    succeeded: Dict[str, Any] = field(default_factory=dict)
+    failed: Dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        """Number of filers the operation was attempted on."""
+        return len(self.succeeded) + len(self.failed)
+
+
+def run_on_filers(
+    session: Any,
+    filers: Iterable[Any],
+    func: Callable[..., Any],
+    *args: Any,
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = DEFAULT_FILER_TIMEOUT,
+    journal: Optional[RunJournal] = None,
+    on_failure: Optional[Callable[[Any], None]] = None,
+    **kwargs: Any
+) -> FleetResult:
+    """
+    Run func(filer, *args, **kwargs) for every filer over a bounded pool of workers.
+
+    cterasdk binds each portal session to the event loop it was created on, so
+    every worker thread runs its own event loop and a clone of the caller's
+    session, and re-resolves the filers it processes through that clone.
+    Requests of all workers share the adaptive limit of core.limiter, so the
+    worker count is an upper bound on concurrency rather than a fixed load.
+    Exceptions raised by func are recorded per filer instead of aborting the run.
+
+    filers may be a lazy iterable such as iter_filers: each filer is taken from
+    it when a worker is free, so work starts with the first filer listed.
+
+    Each filer gets a deadline of timeout seconds, reads it serves are retried on
+    transient errors, and a filer that keeps failing is skipped for the rest of
+    the run by a circuit breaker (see core.resilience).
+
+    With a journal, the outcome on each filer is recorded as it completes and
+    filers the journal already lists as succeeded are skipped.
+
+    on_failure is called with each filer that fails, including filers that
+    fail before func runs on them: skipped by the circuit breaker, not
+    resolved or out of time.
+
+    Args:
+        session: Authenticated GlobalAdmin session the filers were listed with
+        filers: Filer objects to operate on, a list or any iterable
+        func: Per-filer function, typically a tool's _xxx_on_filer helper
+        *args: Additional positional arguments passed to func
+        concurrency: Maximum number of filers processed at once
+        timeout: Seconds allowed per filer, None for no deadline
+        journal: Optional journal of the run, for resuming it
+        on_failure: Optional callback taking each filer that failed
+        **kwargs: Additional keyword arguments passed to func
+
+    Returns:
+        FleetResult with the return value or exception of each filer that was
+        not skipped, keyed by filer_key
+    """
+    workers = concurrency or DEFAULT_CONCURRENCY
+    if isinstance(filers, Sized):
+        workers = min(workers, len(filers))
+    if journal:
+        filers = _skip_done(filers, journal)
+    logging.debug("Running %s on up to %d filers at once", func.__name__, workers)
+    breaker = CircuitBreaker()
+
+    if workers <= 1:
+        result = FleetResult()
+        for filer in filers:
+            _run_one(
+                result, filer_key(filer), _run_guarded,
+                (None, filer, breaker, timeout, journal, on_failure, func, *args), kwargs
+            )
+        _log_failures(result)
+        return result
+
+    result = run_in_session_pool(
+        session, filers, _run_guarded, breaker, timeout, journal, on_failure, func, *args,
+        concurrency=concurrency, key=filer_key, **kwargs
+    )
+    _log_failures(result)
+    return result
+
+
+def run_in_session_pool(
+    session: Any,
+    items: Iterable[Any],
+    func: Callable[..., Any],
+    *args: Any,
+    concurrency: Optional[int] = None,
+    key: Callable[[Any], str] = str,
+    **kwargs: Any
+) -> FleetResult:
+    """
+    Run func(worker_session, item, *args, **kwargs) for every item over a pool of
+    worker threads, each with its own event loop and clone of session.
+
+    Items are handed out through a queue with room for one item per worker,
+    so a lazy iterable is only advanced as workers free up. Workers are
+    started as the first items arrive, at most one per item.
+
+    Args:
+        session: Authenticated GlobalAdmin session to clone for each worker
+        items: Work items, a list or any iterable
+        func: Function called with a worker session and one item
+        *args: Additional positional arguments passed to func
+        concurrency: Maximum number of items processed at once
+        key: Function mapping an item to its key in the result
+        **kwargs: Additional keyword arguments passed to func
+
+    Returns:
+        FleetResult with the return value or exception for each item key
+    """
+    result = FleetResult()
+    workers = max(1, concurrency or DEFAULT_CONCURRENCY)
+    pending: queue.Queue = queue.Queue(maxsize=workers)
+    threads: List[threading.Thread] = []
+    try:
+        for item in items:
+            if len(threads) < workers:
+                thread = threading.Thread(
+                    target=_worker,
+                    args=(session, pending, result, key, func, args, kwargs),
+                    name=f"fleet-{len(threads)}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+            if not _hand_out(pending, item, threads):
+                result.failed[key(item)] = RuntimeError("No fleet worker available")
+    finally:
+        for _ in threads:
+            _hand_out(pending, None, threads)
+        for thread in threads:
+            thread.join()
+
+    # Items left behind when every worker failed to start
+    while not pending.empty():
+        item = pending.get_nowait()
+        if item is not None:
+            result.failed[key(item)] = RuntimeError("No fleet worker available")
+
+    return result
+
+
+class FilerPool:
+    """
+    Worker threads that keep their session and filer handles across repeated runs.
+
+    run_on_filers re-resolves every filer on each call. For polling the same
+    filers again and again, each worker here clones the session and resolves
+    its share of the filers once, then runs every call on those handles. A
+    filer that could not be resolved is tried again on the next call. With a
+    concurrency of one, or a single filer, calls run in the caller's thread on
+    the filer objects themselves.
+
+    Use as a context manager; the workers are stopped on exit.
+
+    Args:
+        session: Authenticated GlobalAdmin session the filers were listed with
+        filers: Filer objects to operate on
+        concurrency: Maximum number of filers processed at once
+        timeout: Seconds allowed per filer and call, None for no deadline
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        filers: Iterable[Any],
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = DEFAULT_FILER_TIMEOUT
+    ):
+        self.filers = list(filers)
+        self.timeout = timeout
+        self._handles: Dict[str, Any] = {}
+        self._tasks: List[queue.Queue] = []
+        self._threads: List[threading.Thread] = []
+        workers = min(concurrency or DEFAULT_CONCURRENCY, len(self.filers))
+        if workers <= 1:
+            return
+        for i in range(workers):
+            tasks: queue.Queue = queue.Queue()
+            thread = threading.Thread(
+                target=self._work,
+                args=(session, self.filers[i::workers], tasks),
+                name=f"fleet-{i}",
+                daemon=True
+            )
+            self._tasks.append(tasks)
+            self._threads.append(thread)
+            thread.start()
+
+    def __enter__(self) -> 'FilerPool':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> FleetResult:
+        """
+        Run func(filer, *args, **kwargs) for every filer, under a new circuit breaker.
+
+        Args:
+            func: Per-filer function
+            *args: Additional positional arguments passed to func
+            **kwargs: Additional keyword arguments passed to func
+
+        Returns:
+            FleetResult with the return value or exception of each filer, keyed by filer_key
+        """
+        result = FleetResult()
+        breaker = CircuitBreaker()
+        if not self._threads:
+            self._run_task(None, self._handles, self.filers, func, args, kwargs, result, breaker)
+        else:
+            done = [threading.Event() for _ in self._threads]
+            for tasks, event in zip(self._tasks, done):
+                tasks.put((func, args, kwargs, result, breaker, event))
+            for event in done:
+                event.wait()
+        _log_failures(result)
+        return result
+
+    def close(self) -> None:
+        """Stop the workers."""
+        for tasks in self._tasks:
+            tasks.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._tasks, self._threads = [], []
+
+    def _work(self, session: Any, filers: List[Any], tasks: queue.Queue) -> None:
+        """Run tasks on a dedicated event loop, session and set of filer handles."""
+        loop = thread_event_loop()
+        stopped = False
+        try:
+            with clone_session(session) as worker_session:
+                handles: Dict[str, Any] = {}
+                for func, args, kwargs, result, breaker, done in iter(tasks.get, None):
+                    try:
+                        self._run_task(
+                            worker_session, handles, filers, func, args, kwargs, result, breaker
+                        )
+                    finally:
+                        done.set()
+                stopped = True
+        except Exception as e:
+            logging.error("Fleet worker failed: %s", e)
+            if not stopped:
+                # Answer the remaining calls so that run does not wait forever
+                for _, _, _, result, _, done in iter(tasks.get, None):
+                    for filer in filers:
+                        result.failed[filer_key(filer)] = e
+                    done.set()
+        finally:
+            loop.close()
+
+    def _run_task(
+        self,
+        worker_session: Optional[Any],
+        handles: Dict[str, Any],
+        filers: List[Any],
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        result: FleetResult,
+        breaker: CircuitBreaker
+    ) -> None:
+        """Run func on each of a worker's filers."""
+        for filer in filers:
+            _run_one(
+                result, filer_key(filer), self._run_kept,
+                (worker_session, handles, filer, breaker, func, *args), kwargs
+            )
+
+    def _run_kept(
+        self,
+        worker_session: Optional[Any],
+        handles: Dict[str, Any],
+        filer: Any,
+        breaker: CircuitBreaker,
+        func: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any
+    ) -> Any:
+        """Run func on the kept handle of a filer, resolving it on first use."""
+        key = filer_key(filer)
+        breaker.check(key)
+        with deadline(self.timeout, key):
+            handle = handles.get(key)
+            if handle is None:
+                handle = filer
+                if worker_session is not None:
+                    try:
+                        handle = worker_session.devices.device(filer.name, get_portal_name(filer))
+                    except Exception as e:
+                        logging.warning("Failed to connect to %s: %s", filer.name, e)
+                        raise
+                handle = handles[key] = limit_api(handle)
+            return func(protect(handle, breaker, key), *args, **kwargs)
+
+
+async def gather_on_filers(
+    filers: Iterable[Any],
+    func: Callable[..., Awaitable[Any]],
+    *args: Any,
+    concurrency: Optional[int] = None,
+    timeout: Optional[float] = DEFAULT_FILER_TIMEOUT,
+    **kwargs: Any
+) -> FleetResult:
+    """
+    Await func(filer, *args, **kwargs) for every filer on the running event loop.
+
+    A semaphore bounds the number of in-flight filers, so thousands of filers can
+    be processed from a single thread. A filer that runs past timeout seconds is
+    cancelled. Exceptions raised by func are recorded per filer instead of
+    aborting the run.
+
+    Args:
+        filers: AsyncFiler objects to operate on
+        func: Per-filer coroutine function
+        *args: Additional positional arguments passed to func
+        concurrency: Maximum number of filers processed at once
+        timeout: Seconds allowed per filer, None for no deadline
+        **kwargs: Additional keyword arguments passed to func
+
+    Returns:
+        FleetResult with the return value or exception of each filer, keyed by filer_key
+    """
+    result = FleetResult()
+    semaphore = asyncio.Semaphore(max(1, concurrency or DEFAULT_CONCURRENCY))
+
+    async def run_one(filer: Any) -> None:
+        key = filer_key(filer)
+        async with semaphore:
+            try:
+                result.succeeded[key] = await asyncio.wait_for(
+                    func(filer, *args, **kwargs), timeout or None
+                )
+            except asyncio.TimeoutError:
+                logging.warning("%s timed out on %s after %ss", func.__name__, filer.name, timeout)
+                result.failed[key] = DeadlineExceeded(
+                    f"{filer.name} exceeded its {timeout}s deadline"
+                )
+            except Exception as e:
+                logging.debug("%s failed on %s: %s", func.__name__, filer.name, e)
+                result.failed[key] = e
+
+    await asyncio.gather(*(run_one(filer) for filer in filers))
+
+    _log_failures(result)
+    return result
+
+
+def clone_session(session: Any) -> GlobalAdmin:
+    """
+    Create a GlobalAdmin bound to the current thread's event loop that shares
+    the server-side session of an existing login.
+
+    Args:
+        session: Authenticated GlobalAdmin session
+
+    Returns:
+        New GlobalAdmin object using the same session ID
+    """
+    clone = GlobalAdmin(session.host(), session.port())
+    clone.set_session_id(session.get_session_id())
+    return limit_api(clone)
+
+
+def _hand_out(pending: queue.Queue, item: Any, threads: List[threading.Thread]) -> bool:
+    """Queue an item for the workers once there is room; False if no worker is left."""
+    while any(thread.is_alive() for thread in threads):
+        try:
+            pending.put(item, timeout=HAND_OUT_POLL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _skip_done(filers: Iterable[Any], journal: RunJournal) -> Iterator[Any]:
+    """Yield the filers the journal does not list as succeeded."""
+    skipped = 0
+    for filer in filers:
+        if journal.is_done(filer_key(filer)):
+            skipped += 1
+        else:
+            yield filer
+    if skipped:
+        logging.info("Skipped %d filers already done in run %s", skipped, journal.run_id)
+
+
+def _worker(
+    session: Any,
+    pending: queue.Queue,
+    result: FleetResult,
+    key: Callable[[Any], str],
+    func: Callable[..., Any],
+    args: tuple,
+    kwargs: dict
+) -> None:
+    """Process items from the queue on a dedicated event loop and session, until None."""
+    loop = thread_event_loop()
+
+    try:
+        with clone_session(session) as worker_session:
+            for item in iter(pending.get, None):
+                _run_one(result, key(item), func, (worker_session, item, *args), kwargs)
+    except Exception as e:
+        logging.error("Fleet worker failed: %s", e)
+    finally:
+        loop.close()
+
+
+def _run_guarded(
+    worker_session: Optional[Any],
+    filer: Any,
+    breaker: CircuitBreaker,
+    timeout: Optional[float],
+    journal: Optional[RunJournal],
+    on_failure: Optional[Callable[[Any], None]],
+    func: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any
+) -> Any:
+    """
+    Run func on a filer under a deadline and the circuit breaker of the run,
+    recording the outcome in the journal if there is one and reporting a
+    failure to on_failure.
+
+    With a worker session, the filer is first re-resolved through it.
+    """
+    key = filer_key(filer)
+    try:
+        breaker.check(key)
+        with deadline(timeout, key):
+            device = filer
+            if worker_session is not None:
+                try:
+                    device = worker_session.devices.device(filer.name, get_portal_name(filer))
+                except Exception as e:
+                    logging.warning("Failed to connect to %s: %s", filer.name, e)
+                    raise
+            value = func(protect(limit_api(device), breaker, key), *args, **kwargs)
+    except Exception as e:
+        if journal:
+            journal.record(key, e)
+        if on_failure:
+            on_failure(filer)
+        raise
+    if journal:
+        journal.record(key)
+    return value
+
+
+def _run_one(
+    result: FleetResult,
+    name: str,
+    func: Callable[..., Any],
+    args: tuple,
+    kwargs: dict
+) -> None:
+    """Run func and record its outcome under name."""
+    try:
+        result.succeeded[name] = func(*args, **kwargs)
+    except Exception as e:
+        logging.debug("%s failed on %s: %s", getattr(func, '__name__', func), name, e)
+        result.failed[name] = e
+
+
+def _log_failures(result: FleetResult) -> None:
+    """Log a summary of failed items."""
+    if result.failed:
+        logging.warning(
+            "%d of %d filers failed: %s",
+            len(result.failed), result.total, ', '.join(sorted(result.failed))
+        )
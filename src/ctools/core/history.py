@@ -0,0 +1,190 @@
+"""Local time-series store of filer status snapshots."""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .inventory import user_cache_dir
+
+DEFAULT_GROWTH_DAYS = 7
+DEFAULT_TOP = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    portal TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    filer TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (portal, tenant, filer, metric, taken_at)
+);
+CREATE INDEX IF NOT EXISTS samples_by_metric ON samples (metric, taken_at);
+"""
+
+GROWTH_QUERY = """
+WITH span AS (
+    SELECT portal, tenant, filer, taken_at, value FROM samples
+    WHERE metric = ? AND taken_at >= ? AND (? IS NULL OR portal = ?)
+),
+bounds AS (
+    SELECT portal, tenant, filer, MIN(taken_at) AS first_at, MAX(taken_at) AS last_at
+    FROM span GROUP BY portal, tenant, filer
+)
+SELECT b.portal, b.tenant, b.filer, f.value, l.value, l.value - f.value, b.first_at, b.last_at
+FROM bounds b
+JOIN span f ON f.portal = b.portal AND f.tenant = b.tenant AND f.filer = b.filer
+    AND f.taken_at = b.first_at
+JOIN span l ON l.portal = b.portal AND l.tenant = b.tenant AND l.filer = b.filer
+    AND l.taken_at = b.last_at
+ORDER BY l.value - f.value DESC
+LIMIT ?
+"""
+
+
+@dataclass
+class Growth:
+    """Change of a metric on one filer over a time span."""
+
+    portal: str
+    tenant: str
+    filer: str
+    first: float
+    last: float
+    change: float
+    first_at: float
+    last_at: float
+
+
+def history_path() -> str:
+    """Get the default path of the status history database."""
+    return os.path.join(user_cache_dir(), 'status_history.sqlite3')
+
+
+class StatusHistory:
+    """
+    Numeric status values of filers over time, one sample per filer, metric and run.
+
+    Samples of a run share one timestamp and are written in a single
+    transaction by commit, so recording from fleet workers costs no I/O.
+
+    Args:
+        portal: Portal address the samples belong to
+        path: Database path, defaults to the user cache directory
+        taken_at: Timestamp of the samples, defaults to now
+    """
+
+    def __init__(
+        self,
+        portal: str = '',
+        path: Optional[str] = None,
+        taken_at: Optional[float] = None
+    ):
+        self.portal = portal
+        self.path = path or history_path()
+        self.taken_at = taken_at or time.time()
+        self._pending: List[Tuple[Any, ...]] = []
+        self._lock = threading.Lock()
+
+    def record(self, tenant: str, filer: str, values: Dict[str, Any]) -> None:
+        """
+        Buffer the numeric values of one filer; other values are ignored.
+
+        Args:
+            tenant: Tenant name
+            filer: Filer name
+            values: Status values by metric name
+        """
+        samples = [
+            (self.portal, tenant, filer, metric, self.taken_at, float(value))
+            for metric, value in values.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        ]
+        with self._lock:
+            self._pending.extend(samples)
+
+    def commit(self) -> None:
+        """Write the buffered samples."""
+        with self._lock:
+            samples, self._pending = self._pending, []
+        if not samples:
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany('INSERT OR REPLACE INTO samples VALUES (?,?,?,?,?,?)', samples)
+            logging.info("Recorded %d status samples in %s", len(samples), self.path)
+        except sqlite3.Error as e:
+            logging.warning("Failed to record status history: %s", e)
+
+    def metrics(self) -> List[str]:
+        """Get the names of the recorded metrics."""
+        with self._connect() as conn:
+            rows = conn.execute('SELECT DISTINCT metric FROM samples ORDER BY metric')
+            return [row[0] for row in rows]
+
+    def growth(
+        self,
+        metric: str,
+        days: float = DEFAULT_GROWTH_DAYS,
+        top: int = DEFAULT_TOP
+    ) -> List[Growth]:
+        """
+        Rank filers by the change of a metric between their first and last
+        sample within the last days.
+
+        Args:
+            metric: Metric name, e.g. 'uploadingFiles'
+            days: Length of the span
+            top: Maximum number of filers returned
+
+        Returns:
+            Growth of each filer, largest first
+        """
+        since = time.time() - days * 86400
+        portal = self.portal or None
+        with self._connect() as conn:
+            rows = conn.execute(GROWTH_QUERY, (metric, since, portal, portal, top)).fetchall()
+        return [Growth(*row) for row in rows]
+
+    def series(
+        self,
+        filer: str,
+        metric: str,
+        days: float = DEFAULT_GROWTH_DAYS
+    ) -> List[Tuple[float, str, float]]:
+        """
+        Get the samples of a metric on filers with a given name.
+
+        Args:
+            filer: Filer name
+            metric: Metric name
+            days: Length of the span
+
+        Returns:
+            (taken_at, tenant, value) tuples in time order
+        """
+        since = time.time() - days * 86400
+        portal = self.portal or None
+        with self._connect() as conn:
+            return conn.execute(
+                'SELECT taken_at, tenant, value FROM samples WHERE filer = ? AND metric = ? '
+                'AND taken_at >= ? AND (? IS NULL OR portal = ?) ORDER BY taken_at',
+                (filer, metric, since, portal, portal)
+            ).fetchall()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the history database in a transaction, creating it if needed."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.executescript(SCHEMA)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
@@ -0,0 +1,398 @@
+"""Persistent on-disk cache of discovered filers."""
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from cterasdk import Object
+from cterasdk.core import remote
+
+from .resilience import thread_event_loop
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_STALE = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    portal TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    selection TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (portal, scope, selection)
+);
+CREATE TABLE IF NOT EXISTS filers (
+    portal TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    selection TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    tenant TEXT,
+    portal_ref TEXT NOT NULL,
+    device_type TEXT,
+    version TEXT,
+    remote_access_url TEXT,
+    connected INTEGER,
+    hostname TEXT,
+    PRIMARY KEY (portal, scope, selection, position)
+);
+"""
+
+
+@dataclass
+class InventorySettings:
+    """
+    Inventory cache configuration.
+
+    Attributes:
+        enabled: Use the cache for filer discovery
+        ttl: Seconds a cached inventory is served without revalidation
+        max_stale: Seconds after which a cached inventory is discovered again
+            before use, instead of being served while refreshed in the background
+        refresh: Ignore cached inventories and discover again
+        path: Cache database path, defaults to the user cache directory
+    """
+
+    enabled: bool = True
+    ttl: float = DEFAULT_TTL
+    max_stale: float = DEFAULT_MAX_STALE
+    refresh: bool = False
+    path: Optional[str] = None
+
+
+settings = InventorySettings()
+
+_revalidations: List[threading.Thread] = []
+
+# Inventories discovered or loaded by this process, shared by all its tools and
+# written by background revalidation, so only accessed under _memory_lock
+_memory: Dict[tuple, 'InventoryEntry'] = {}
+_memory_lock = threading.Lock()
+
+
+@dataclass
+class InventoryEntry:
+    """Cached result of one filer discovery."""
+
+    fetched_at: float
+    rows: List[tuple]
+
+    @property
+    def age(self) -> float:
+        """Seconds since the inventory was discovered."""
+        return time.time() - self.fetched_at
+
+    @property
+    def fresh(self) -> bool:
+        """True if the inventory is within the configured TTL."""
+        return self.age <= settings.ttl
+
+    def filers(self, portal_session: Any) -> List[Any]:
+        """
+        Rebuild remote filer objects bound to a portal session.
+
+        Args:
+            portal_session: Portal session object
+
+        Returns:
+            List of filer objects
+        """
+        return list(self.iter_filers(portal_session))
+
+    def iter_filers(self, portal_session: Any) -> Iterator[Any]:
+        """Rebuild remote filer objects bound to a portal session, one at a time."""
+        return (remote.remote_command(portal_session, _device(row)) for row in self.rows)
+
+
+def user_cache_dir() -> str:
+    """Get the CTools directory under the user's cache directory."""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA', os.path.expanduser('~\\AppData\\Local'))
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache'))
+    return os.path.join(base, 'ctools')
+
+
+def cache_path() -> str:
+    """Get the path of the inventory database."""
+    return settings.path or os.path.join(user_cache_dir(), 'inventory.sqlite3')
+
+
+def selection_key(selection: Any) -> str:
+    """Serialize a filer selection into a stable cache key."""
+    return json.dumps(selection, default=lambda o: o.__dict__, sort_keys=True)
+
+
+def lookup(portal_session: Any, scope: str, selection: str) -> Optional[InventoryEntry]:
+    """
+    Get the cached inventory of a discovery scope.
+
+    Inventories discovered by this process are reused within the TTL even when
+    a refresh was requested, so tools run together share one discovery.
+
+    Args:
+        portal_session: Portal session object
+        scope: Discovery scope, a tenant name or '*' for all tenants
+        selection: Serialized filer selection
+
+    Returns:
+        Cached entry, or None if caching is disabled, a refresh was requested,
+        or nothing is cached
+    """
+    if not settings.enabled:
+        return None
+
+    key = (portal_session.host(), scope, selection)
+    with _memory_lock:
+        entry = _memory.get(key)
+    if entry and entry.fresh:
+        logging.info("Reusing inventory of %d filers (%.0fs old)", len(entry.rows), entry.age)
+        return entry
+    if settings.refresh:
+        return None
+
+    try:
+        with _connect() as conn:
+            scan = conn.execute(
+                'SELECT fetched_at FROM scans WHERE portal=? AND scope=? AND selection=?',
+                key
+            ).fetchone()
+            if not scan:
+                return None
+            rows = conn.execute(
+                'SELECT name, portal_ref, device_type, version, remote_access_url, connected, '
+                'hostname FROM filers WHERE portal=? AND scope=? AND selection=? ORDER BY position',
+                key
+            ).fetchall()
+    except sqlite3.Error as e:
+        logging.debug("Failed to read inventory cache: %s", e)
+        return None
+
+    entry = InventoryEntry(scan[0], rows)
+    with _memory_lock:
+        # A background refresh may have stored a newer discovery meanwhile
+        known = _memory.get(key)
+        if known and known.fetched_at > entry.fetched_at:
+            entry = known
+        _memory[key] = entry
+    logging.info("Using cached inventory of %d filers (%.0fs old)", len(rows), entry.age)
+    return entry
+
+
+def store(portal_session: Any, scope: str, selection: str, filers: Iterable[Any]) -> None:
+    """
+    Replace the cached inventory of a discovery scope.
+
+    Args:
+        portal_session: Portal session object
+        scope: Discovery scope, a tenant name or '*' for all tenants
+        selection: Serialized filer selection
+        filers: Discovered filer or portal device objects
+    """
+    store_rows(portal_session, scope, selection, (cache_row(filer) for filer in filers))
+
+
+def store_rows(portal_session: Any, scope: str, selection: str, filers: Iterable[tuple]) -> None:
+    """
+    Replace the cached inventory of a discovery scope with rows kept during discovery.
+
+    Args:
+        portal_session: Portal session object
+        scope: Discovery scope, a tenant name or '*' for all tenants
+        selection: Serialized filer selection
+        filers: cache_row of each discovered filer, in discovery order
+    """
+    if not settings.enabled:
+        return
+
+    key = (portal_session.host(), scope, selection)
+    rows = [key + (position,) + row for position, row in enumerate(filers)]
+    entry = InventoryEntry(time.time(), [row[4:5] + row[6:] for row in rows])
+    with _memory_lock:
+        _memory[key] = entry
+    try:
+        with _connect() as conn:
+            conn.execute('DELETE FROM filers WHERE portal=? AND scope=? AND selection=?', key)
+            conn.executemany('INSERT INTO filers VALUES (?,?,?,?,?,?,?,?,?,?,?,?)', rows)
+            conn.execute('INSERT OR REPLACE INTO scans VALUES (?,?,?,?)', key + (time.time(),))
+    except sqlite3.Error as e:
+        logging.debug("Failed to write inventory cache: %s", e)
+
+
+def get_or_discover(
+    portal_session: Any,
+    scope: str,
+    selection: str,
+    discover: Callable[[Any], Optional[List[Any]]],
+    current: bool = False
+) -> Optional[List[Any]]:
+    """
+    Serve filers from the inventory cache, discovering them when needed.
+
+    A fresh inventory is returned as is. A stale inventory up to
+    settings.max_stale old is returned right away and rediscovered in the
+    background (stale-while-revalidate). Without a cached inventory, with an
+    older one, or when current is set, discover is called and its result cached.
+
+    Args:
+        portal_session: Portal session object
+        scope: Discovery scope, a tenant name or '*' for all tenants
+        selection: Serialized filer selection
+        discover: Function returning the filers for a portal session, or None on error
+        current: Always discover, for tools that change filers and must not act
+            on a filer list or connection state read from the cache
+
+    Returns:
+        List of filer objects or None on error
+    """
+    entry = cached(portal_session, scope, selection, discover, current)
+    if entry:
+        return entry.filers(portal_session)
+
+    filers = discover(portal_session)
+    if filers is not None:
+        store(portal_session, scope, selection, filers)
+    return filers
+
+
+def cached(
+    portal_session: Any,
+    scope: str,
+    selection: str,
+    discover: Callable[[Any], Optional[List[Any]]],
+    current: bool = False
+) -> Optional[InventoryEntry]:
+    """
+    Get the cached inventory to serve instead of discovering filers now.
+
+    A fresh inventory is served as is. A stale inventory up to
+    settings.max_stale old is served while discover runs in the background
+    (stale-while-revalidate).
+
+    Args:
+        portal_session: Portal session object
+        scope: Discovery scope, a tenant name or '*' for all tenants
+        selection: Serialized filer selection
+        discover: Function returning the filers for a portal session, or None on error
+        current: Never serve the cache, see get_or_discover
+
+    Returns:
+        Entry to serve, or None if the filers must be discovered now
+    """
+    entry = None if current else lookup(portal_session, scope, selection)
+    if entry and entry.fresh:
+        return entry
+    if entry and entry.age <= settings.max_stale:
+        revalidate(portal_session, scope, selection, discover)
+        return entry
+    if entry:
+        logging.info("Cached inventory is %.0fs old, discovering filers again", entry.age)
+    return None
+
+
+def revalidate(
+    portal_session: Any,
+    scope: str,
+    selection: str,
+    discover: Callable[[Any], Optional[List[Any]]]
+) -> None:
+    """
+    Rediscover a stale inventory on a background thread.
+
+    The thread uses its own event loop and a clone of the portal session, so
+    the session must stay logged in until wait_for_revalidation returns.
+
+    Args:
+        portal_session: Portal session object
+        scope: Discovery scope, a tenant name or '*' for all tenants
+        selection: Serialized filer selection
+        discover: Function returning the filers for a portal session, or None on error
+    """
+    from .fleet import clone_session  # pylint: disable=import-outside-toplevel
+
+    def run() -> None:
+        loop = thread_event_loop()
+        try:
+            with clone_session(portal_session) as worker_session:
+                filers = discover(worker_session)
+                if filers is not None:
+                    store(worker_session, scope, selection, filers)
+                    logging.debug("Refreshed inventory of %s (%d filers)", scope, len(filers))
+        except Exception as e:
+            logging.debug("Failed to refresh inventory of %s: %s", scope, e)
+        finally:
+            loop.close()
+
+    logging.info("Cached inventory is stale, refreshing in the background")
+    thread = threading.Thread(target=run, name=f"inventory-{scope}", daemon=True)
+    thread.start()
+    _revalidations.append(thread)
+
+
+def wait_for_revalidation(timeout: Optional[float] = None) -> None:
+    """
+    Wait for background inventory refreshes to finish.
+
+    Args:
+        timeout: Maximum seconds to wait for each refresh
+    """
+    while _revalidations:
+        _revalidations.pop().join(timeout)
+
+
+@contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    """Open the inventory database in a transaction, creating it if needed."""
+    path = cache_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def cache_row(filer: Any) -> tuple:
+    """Extract the cached columns from a filer or device object."""
+    from .filer import get_portal_name  # pylint: disable=import-outside-toplevel
+
+    connection = getattr(filer, 'deviceConnectionStatus', None)
+    reported = getattr(filer, 'deviceReportedStatus', None)
+    config = getattr(reported, 'config', None)
+    return (
+        filer.name,
+        get_portal_name(filer),
+        filer.portal,
+        getattr(filer, 'deviceType', None),
+        getattr(filer, 'version', None),
+        getattr(filer, 'remoteAccessUrl', None),
+        int(bool(getattr(connection, 'connected', False))),
+        getattr(config, 'hostname', None),
+    )
+
+
+def _device(row: tuple) -> Object:
+    """Rebuild a portal device object from a cached row."""
+    name, portal_ref, device_type, version, remote_access_url, connected, hostname = row
+    device = Object()
+    device.name = name
+    device.portal = portal_ref
+    device.deviceType = device_type
+    device.version = version
+    device.remoteAccessUrl = remote_access_url
+    device.deviceConnectionStatus = Object()
+    device.deviceConnectionStatus.connected = bool(connected)
+    device.deviceReportedStatus = Object()
+    device.deviceReportedStatus.config = Object()
+    device.deviceReportedStatus.config.hostname = hostname
+    return device
@@ -0,0 +1,170 @@
+"""Append-only run journals for resuming fleet-wide operations."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from typing import Any, Dict, Optional, Set
+
+from .filer import get_portal_name
+from .inventory import user_cache_dir
+
+RUN_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]+$')
+
+# PBKDF2-SHA256 iterations of the arguments fingerprint in a journal header
+DIGEST_ITERATIONS = 600_000
+
+
+class RunJournal:
+    """
+    Per-filer outcomes of one run of an operation, one JSON line each.
+
+    The first line names the operation and fingerprints its scope and
+    arguments; every later line records a filer and whether the operation
+    succeeded on it. Lines are flushed as they are written, so a journal
+    survives the process dying mid-run and a rerun with the same run ID skips
+    the filers that already succeeded. A run is only resumed with the scope and
+    arguments it was started with, so a fleet never ends up half done with
+    other values. Arguments may hold secrets such as passwords, so they are
+    only kept as a salted PBKDF2 hash, slow enough to make guessing them from
+    a journal impractical.
+
+    Args:
+        operation: Name of the operation, e.g. the tool name
+        run_id: Run to resume, or None to start a new run
+        scope: Selection of filers the run covers, e.g. tenant and filters
+        arguments: Values the operation applies to each filer
+
+    Raises:
+        ValueError: If the run to resume does not exist, is of another
+            operation, or was started with another scope or other arguments
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        run_id: Optional[str] = None,
+        scope: Optional[Dict[str, Any]] = None,
+        arguments: Optional[Dict[str, Any]] = None
+    ):
+        self.operation = operation
+        self.scope = _canonical(scope or {})
+        self.arguments = _canonical(arguments or {})
+        self.completed: Set[str] = set()
+        self._lock = threading.Lock()
+
+        if run_id:
+            if not RUN_ID_PATTERN.match(run_id):
+                raise ValueError(f"Invalid run ID '{run_id}'")
+            self.run_id = run_id
+            self._load()
+            logging.info(
+                "Resuming run %s, skipping %d completed filers", run_id, len(self.completed)
+            )
+        else:
+            self.run_id = f"{operation}-{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(2)}"
+            os.makedirs(journal_dir(), exist_ok=True)
+            salt = secrets.token_hex(16)
+            self._append({
+                'run': self.run_id, 'operation': operation, 'started': time.time(),
+                'scope': self.scope, 'salt': salt, 'arguments': _digest(salt, self.arguments)
+            })
+            logging.info("Run ID: %s (rerun with --resume %s to continue it)",
+                         self.run_id, self.run_id)
+
+    @property
+    def path(self) -> str:
+        """Path of the journal file."""
+        return os.path.join(journal_dir(), f'{self.run_id}.jsonl')
+
+    def is_done(self, key: str) -> bool:
+        """Check whether the operation already succeeded on a filer."""
+        return key in self.completed
+
+    def record(self, key: str, error: Optional[BaseException] = None) -> None:
+        """
+        Append the outcome of the operation on a filer.
+
+        Args:
+            key: Filer key, see filer_key
+            error: Exception the operation failed with, None on success
+        """
+        entry = {'filer': key, 'status': 'failed' if error else 'succeeded', 'time': time.time()}
+        if error:
+            entry['error'] = str(error)
+        with self._lock:
+            if not error:
+                self.completed.add(key)
+            try:
+                self._append(entry)
+            except OSError as e:
+                logging.warning("Failed to write run journal %s: %s", self.path, e)
+
+    def _append(self, entry: dict) -> None:
+        """Write one line to the journal."""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+
+    def _load(self) -> None:
+        """Read the outcomes of the run being resumed."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError as e:
+            raise ValueError(f"Unknown run ID '{self.run_id}'") from e
+
+        for number, line in enumerate(lines):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A line cut short by the previous run dying
+                logging.debug("Skipping damaged line %d of %s", number + 1, self.path)
+                continue
+            if number == 0:
+                self._check_header(entry)
+            elif entry.get('status') == 'succeeded':
+                self.completed.add(entry['filer'])
+
+    def _check_header(self, header: Dict[str, Any]) -> None:
+        """Make sure the run being resumed is this operation with the same scope and arguments."""
+        if header.get('operation') != self.operation:
+            raise ValueError(
+                f"Run {self.run_id} is a {header.get('operation')} run, not {self.operation}"
+            )
+        if header.get('scope') != self.scope:
+            raise ValueError(
+                f"Run {self.run_id} was started for other filers; start a new run instead"
+            )
+        salt = header.get('salt')
+        if not salt or header.get('arguments') != _digest(salt, self.arguments):
+            raise ValueError(
+                f"Run {self.run_id} was started with other arguments; start a new run instead"
+            )
+
+
+def _canonical(values: Dict[str, Any]) -> Any:
+    """Convert values to plain JSON data, so they compare equal to what a journal holds."""
+    return json.loads(json.dumps(values, default=lambda o: o.__dict__, sort_keys=True))
+
+
+def _digest(salt: str, values: Any) -> str:
+    """Hash values with a salt and a slow key derivation, as they may hold secrets."""
+    text = json.dumps(values, sort_keys=True)
+    return hashlib.pbkdf2_hmac(
+        'sha256', text.encode('utf-8'), salt.encode('utf-8'), DIGEST_ITERATIONS
+    ).hex()
+
+
+def journal_dir() -> str:
+    """Get the directory holding run journals."""
+    return os.path.join(user_cache_dir(), 'journals')
+
+
+def filer_key(filer: Any) -> str:
+    """Identify a filer in a journal by tenant and name."""
+    return f'{get_portal_name(filer)}/{filer.name}'
@@ -0,0 +1,204 @@
+"""Adaptive concurrency limit for portal and remote filer API requests."""
+
+import asyncio
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, Optional
+
+from cterasdk.exceptions import ClientResponseException
+
+# HTTP statuses that mean the portal or the remote access tunnel is overloaded
+OVERLOAD_STATUSES = (429, 502, 503, 504)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD (additive increase, multiplicative decrease) limit on in-flight requests.
+
+    Every healthy response raises the limit by 1/limit, about one extra request
+    per round trip. A timeout, connection error or HTTP 429/5xx overload
+    response multiplies the limit by backoff, and a response slower than
+    latency_tolerance times the baseline latency of the same operation by
+    slowdown_backoff. Decreases happen at most once per baseline round trip,
+    so a burst of failures counts as one signal.
+
+    Args:
+        initial: Starting limit
+        minimum: Lowest limit
+        maximum: Highest limit
+        latency_tolerance: Slowdown factor over the baseline treated as congestion
+        backoff: Factor applied to the limit on overload
+        slowdown_backoff: Factor applied to the limit on congestion
+    """
+
+    def __init__(
+        self,
+        initial: float = 10,
+        minimum: float = 1,
+        maximum: float = 64,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.5,
+        slowdown_backoff: float = 0.9
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+        self.slowdown_backoff = slowdown_backoff
+        self._limit = float(initial)
+        self._inflight = 0
+        self._baselines: Dict[Hashable, float] = {}
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return max(int(self._limit), 1)
+
+    @property
+    def inflight(self) -> int:
+        """Number of requests in flight."""
+        return self._inflight
+
+    def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        with self._condition:
+            while self._inflight >= self.limit:
+                self._condition.wait()
+            self._inflight += 1
+
+    def release(self, latency: float, overloaded: bool = False, key: Hashable = None) -> None:
+        """
+        Record the outcome of a request and free its slot.
+
+        Args:
+            latency: Seconds the request took
+            overloaded: True if the request failed with an overload signal
+            key: Operation the request performed, for its latency baseline
+        """
+        with self._condition:
+            self._inflight -= 1
+            now = time.monotonic()
+            baseline = self._baselines.get(key)
+
+            if overloaded:
+                self._decrease(now, self.backoff, baseline)
+            else:
+                if baseline is None or latency < baseline:
+                    baseline = latency
+                else:
+                    # Let the baseline follow lasting latency changes slowly
+                    baseline += 0.01 * (latency - baseline)
+                self._baselines[key] = baseline
+                if latency <= baseline * self.latency_tolerance:
+                    self._limit = min(self.maximum, self._limit + 1 / self._limit)
+                else:
+                    self._decrease(now, self.slowdown_backoff, baseline)
+
+            self._condition.notify_all()
+
+    def _decrease(self, now: float, factor: float, baseline: Optional[float]) -> None:
+        """Lower the limit unless it was lowered within the last round trip."""
+        if now - self._last_decrease < (baseline or 0):
+            return
+        self._limit = max(self.minimum, self._limit * factor)
+        self._last_decrease = now
+        logging.debug("Portal congestion, concurrency limit lowered to %d", self.limit)
+
+    @contextmanager
+    def slot(self, key: Hashable = None) -> Iterator[None]:
+        """
+        Hold a request slot for the duration of the block.
+
+        Args:
+            key: Operation the request performs, for its latency baseline
+        """
+        self.acquire()
+        start = time.monotonic()
+        overloaded = False
+        try:
+            yield
+        except Exception as e:
+            overloaded = is_overload(e)
+            raise
+        finally:
+            self.release(time.monotonic() - start, overloaded, key)
+
+
+class ClientProxy:
+    """Base of the proxies ctools puts around SDK API clients."""
+
+    def __init__(self, client: Any):
+        self._client = client
+
+
+def client_layers(client: Any) -> Iterator[Any]:
+    """Iterate over the proxies around an API client, outermost first, then the client."""
+    while isinstance(client, ClientProxy):
+        yield client
+        client = client._client  # pylint: disable=protected-access
+    yield client
+
+
+class LimitedClient(ClientProxy):
+    """Proxy that sends every call of an SDK API client through a limiter."""
+
+    def __init__(self, client: Any, limiter: AdaptiveLimiter):
+        super().__init__(client)
+        self._limiter = limiter
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            # Schema methods run anything from lookups to CLI commands on one path
+            operation = args[:2] if name == 'execute' else args[:1]
+            key = (name,) + tuple(str(arg) for arg in operation)
+            with self._limiter.slot(key):
+                return attr(*args, **kwargs)
+
+        return call
+
+
+# Shared by every tool in the process
+portal_limiter = AdaptiveLimiter()
+
+
+def is_overload(error: Exception) -> bool:
+    """Check whether an exception signals an overloaded portal or tunnel."""
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    if isinstance(error, ClientResponseException):
+        status = getattr(getattr(error, 'response', None), 'status', None)
+        return status in OVERLOAD_STATUSES
+    return False
+
+
+def limit_api(target: Any, limiter: Optional[AdaptiveLimiter] = None) -> Any:
+    """
+    Route the API clients of a portal session or filer through a limiter.
+
+    Covers target.api and everything built on it, such as filer.cli. A client
+    already routed through a limiter, under any other proxy, is left as is, so
+    filer objects reused across runs are not limited twice.
+
+    Args:
+        target: GlobalAdmin session or remote filer object
+        limiter: Limiter to use, defaults to the shared portal_limiter
+
+    Returns:
+        The same target, for chaining
+    """
+    clients = getattr(target, 'clients', None)
+    for name in ('api', 'ctera'):
+        client = getattr(clients, name, None)
+        if client is None:
+            continue
+        if not any(isinstance(layer, LimitedClient) for layer in client_layers(client)):
+            setattr(clients, name, LimitedClient(client, limiter or portal_limiter))
+    return target
@@ -0,0 +1,152 @@
+"""Statistics of filer performance monitor samples."""
+
+import threading
+import warnings
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Sample attributes of proc/perfMonitor.samples
+PERF_METRICS = ('cpu', 'memUsage')
+
+# Statistics computed for each metric; 'above' is the share of samples over the threshold
+PERF_STATS = ('p50', 'p95', 'p99', 'mean', 'max', 'above')
+PERCENTILES = (50, 95, 99)
+
+# Usage, in percent, treated as busy
+DEFAULT_PERF_THRESHOLD = 80.0
+
+Stats = Dict[str, Dict[str, Optional[float]]]
+
+
+def sample_series(samples: Any, metrics: Sequence[str] = PERF_METRICS) -> np.ndarray:
+    """
+    Arrange performance samples as one row of values per metric.
+
+    Args:
+        samples: Sample objects, e.g. proc/perfMonitor.samples, or None
+        metrics: Sample attributes to extract
+
+    Returns:
+        Array of shape (len(metrics), len(samples)), NaN where a value is not numeric
+    """
+    samples = list(samples or [])
+    series = np.full((len(metrics), len(samples)), np.nan)
+    for i, metric in enumerate(metrics):
+        for j, sample in enumerate(samples):
+            try:
+                series[i, j] = float(getattr(sample, metric))
+            except (AttributeError, TypeError, ValueError):
+                pass
+    return series
+
+
+def series_stats(series: np.ndarray, threshold: float = DEFAULT_PERF_THRESHOLD) -> np.ndarray:
+    """
+    Compute PERF_STATS along the last axis of NaN-padded sample series.
+
+    Args:
+        series: Samples of any shape (..., n), NaN marking missing samples
+        threshold: Value counted for the 'above' statistic
+
+    Returns:
+        Array of shape (..., len(PERF_STATS)), NaN where a series has no samples
+    """
+    if series.shape[-1] == 0:
+        return np.full(series.shape[:-1] + (len(PERF_STATS),), np.nan)
+    counts = np.sum(~np.isnan(series), axis=-1)
+    with warnings.catch_warnings():
+        # Series without samples yield NaN, which is what we want
+        warnings.simplefilter('ignore', RuntimeWarning)
+        percentiles = np.nanpercentile(series, PERCENTILES, axis=-1)
+        mean = np.nanmean(series, axis=-1)
+        peak = np.nanmax(series, axis=-1)
+        above = np.sum(series > threshold, axis=-1) * 100.0 / counts
+    return np.stack([*percentiles, mean, peak, above], axis=-1)
+
+
+def _stats_dict(values: np.ndarray, metrics: Sequence[str]) -> Stats:
+    """Convert a (metrics, stats) array to nested dicts of rounded floats or None."""
+    return {
+        metric: {
+            stat: None if np.isnan(value) else round(float(value), 2)
+            for stat, value in zip(PERF_STATS, row)
+        }
+        for metric, row in zip(metrics, values)
+    }
+
+
+def perf_stats(
+    samples: Any,
+    threshold: float = DEFAULT_PERF_THRESHOLD,
+    metrics: Sequence[str] = PERF_METRICS
+) -> Stats:
+    """
+    Compute the statistics of one filer's performance samples.
+
+    Args:
+        samples: Sample objects, e.g. proc/perfMonitor.samples, or None
+        threshold: Value counted for the 'above' statistic
+        metrics: Sample attributes to analyze
+
+    Returns:
+        Statistics by metric and PERF_STATS name, None where there are no samples
+    """
+    return _stats_dict(series_stats(sample_series(samples, metrics), threshold), metrics)
+
+
+class PerfSamples:
+    """
+    Sample series of a fleet, collected as filers complete and analyzed in one batch.
+
+    Safe to add to from fleet workers.
+
+    Args:
+        threshold: Value counted for the 'above' statistic
+        metrics: Sample attributes collected
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_PERF_THRESHOLD,
+        metrics: Sequence[str] = PERF_METRICS
+    ):
+        self.threshold = threshold
+        self.metrics = tuple(metrics)
+        self.series: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: str, samples: Any) -> None:
+        """
+        Keep the samples of a filer.
+
+        Args:
+            key: Filer key
+            samples: Sample objects, e.g. proc/perfMonitor.samples
+        """
+        series = sample_series(samples, self.metrics)
+        with self._lock:
+            self.series[key] = series
+
+    def stats(self) -> Tuple[Dict[str, Stats], Stats]:
+        """
+        Compute the statistics of every filer, and of all samples pooled, in one batch.
+
+        Returns:
+            Statistics by filer key, and statistics of the whole fleet
+        """
+        with self._lock:
+            keys = list(self.series)
+            arrays = [self.series[key] for key in keys]
+        width = max((a.shape[1] for a in arrays), default=0)
+        batch = np.full((len(arrays), len(self.metrics), width), np.nan)
+        for i, array in enumerate(arrays):
+            batch[i, :, :array.shape[1]] = array
+
+        per_filer = series_stats(batch, self.threshold)
+        pooled = batch.transpose(1, 0, 2).reshape(len(self.metrics), -1)
+        pooled = series_stats(pooled, self.threshold)
+        return (
+            {key: _stats_dict(values, self.metrics) for key, values in zip(keys, per_filer)},
+            _stats_dict(pooled, self.metrics)
+        )
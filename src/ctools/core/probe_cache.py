@@ -0,0 +1,97 @@
+"""Persistent per-filer cache of slow, slowly changing probe results."""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from .inventory import user_cache_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    probe TEXT NOT NULL,
+    portal TEXT NOT NULL,
+    filer TEXT NOT NULL,
+    measured_at REAL NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (probe, portal, filer)
+);
+"""
+
+
+class ProbeCache:
+    """
+    Results of one probe per filer, reused until they are older than a TTL.
+
+    Safe to use from fleet workers: every call opens its own connection.
+
+    Args:
+        probe: Probe name
+        portal: Portal address the filers belong to
+        ttl: Seconds a result is reused, 0 to always probe again
+        path: Cache database path, defaults to the user cache directory
+    """
+
+    def __init__(self, probe: str, portal: str, ttl: float, path: Optional[str] = None):
+        self.probe = probe
+        self.portal = portal
+        self.ttl = ttl
+        self.path = path or os.path.join(user_cache_dir(), 'probes.sqlite3')
+
+    def get(self, filer: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the cached result of a filer.
+
+        Args:
+            filer: Filer key
+
+        Returns:
+            Cached result, or None if there is none within the TTL
+        """
+        if self.ttl <= 0:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT measured_at, value FROM probes WHERE probe=? AND portal=? AND filer=?',
+                    (self.probe, self.portal, filer)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logging.debug("Failed to read probe cache: %s", e)
+            return None
+        if not row or time.time() - row[0] > self.ttl:
+            return None
+        value: Dict[str, Any] = json.loads(row[1])
+        return value
+
+    def put(self, filer: str, value: Dict[str, Any]) -> None:
+        """
+        Cache the result of a filer.
+
+        Args:
+            filer: Filer key
+            value: JSON-serializable result
+        """
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO probes VALUES (?,?,?,?,?)',
+                    (self.probe, self.portal, filer, time.time(), json.dumps(value))
+                )
+        except sqlite3.Error as e:
+            logging.debug("Failed to write probe cache: %s", e)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the cache database in a transaction, creating it if needed."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.executescript(SCHEMA)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
@@ -0,0 +1,369 @@
+"""Report files written once, in batches, and replaced atomically."""
+
+import csv
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence
+
+DEFAULT_FLUSH_ROWS = 50
+
+REPORT_ENCODING = 'utf-8-sig'
+
+# Output formats; csv keeps the Excel-friendly text columns, the others are typed
+REPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+
+def report_format(filename: str, fmt: Optional[str] = None) -> str:
+    """
+    Resolve the output format of a report.
+
+    Args:
+        filename: Report path
+        fmt: Requested format, or None to use the file extension
+
+    Returns:
+        One of REPORT_FORMATS, csv when the extension is not a known format
+    """
+    if fmt:
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"Unknown report format '{fmt}'")
+        return fmt
+    extension = os.path.splitext(filename)[1].lstrip('.').lower()
+    return extension if extension in REPORT_FORMATS else 'csv'
+
+
+class RowSink(Protocol):
+    """What row producers need of a report: its columns, their kind and a write."""
+
+    headers: List[str]
+
+    @property
+    def typed(self) -> bool:
+        """True if rows should hold numbers as numbers."""
+
+    def write(self, row: Sequence[Any]) -> None:
+        """Add a row."""
+
+
+class ReportSink:
+    """
+    Report that concurrent collectors stream rows into.
+
+    Rows are spooled to a temporary file next to the report, flushed every
+    flush_rows rows, and the temporary file replaces the report on close, so
+    readers never see a half-written report. Rows already in an existing
+    report are kept unless keep_existing is off: new rows are appended, or with
+    key_columns, replace the existing row with the same key (upsert). Existing
+    rows are matched to columns by name, so a report gains columns added since
+    it was written. An existing report that cannot be read, or that has columns
+    the new headers lack, is left untouched and open raises ValueError rather
+    than replacing it and losing data.
+
+    csv reports hold text as Excel shows it. jsonl and parquet keep the values
+    as written, so numbers stay numbers. parquet needs pandas with pyarrow and
+    is assembled from the spool on close.
+
+    Use as a context manager; the report is committed on exit, including
+    after an error, so rows collected before the error are not lost.
+
+    Args:
+        filename: Report path
+        headers: Column names
+        key_columns: Columns identifying a row, to replace rows instead of appending
+        fmt: Output format, see report_format
+        keep_existing: Keep the rows of an existing report
+        flush_rows: Number of buffered rows that triggers a write
+        encoding: Text encoding of csv reports
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        headers: Sequence[str],
+        key_columns: Optional[Sequence[str]] = None,
+        fmt: Optional[str] = None,
+        keep_existing: bool = True,
+        flush_rows: int = DEFAULT_FLUSH_ROWS,
+        encoding: str = REPORT_ENCODING
+    ):
+        self.filename = filename
+        self.headers = list(headers)
+        self.key_columns = list(key_columns or [])
+        self.format = report_format(filename, fmt)
+        self.keep_existing = keep_existing
+        self.flush_rows = max(1, flush_rows)
+        self.encoding = encoding if self.format == 'csv' else 'utf-8'
+        self.rows_written = 0
+        self._buffer: List[List[Any]] = []
+        self._lock = threading.Lock()
+        self._file: Any = None
+        self._writer: Any = None
+        self._temp_path = ''
+        self._existing: List[List[Any]] = []
+
+    @property
+    def typed(self) -> bool:
+        """True if the format keeps value types, so rows should hold numbers as numbers."""
+        return self.format != 'csv'
+
+    def __enter__(self) -> 'ReportSink':
+        self.open()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """
+        Create the temporary file and carry over the rows of an existing report.
+
+        Raises:
+            ValueError: If the existing report cannot be read or has columns
+                missing from the headers
+        """
+        if self.format == 'parquet':
+            # Fail before collecting anything if the report cannot be written
+            try:
+                import pyarrow  # noqa: F401 pylint: disable=import-outside-toplevel,unused-import
+            except ImportError as e:
+                raise ImportError("parquet reports need pyarrow: pip install pyarrow") from e
+
+        self._existing = self._read_existing() if self.keep_existing else []
+
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        os.makedirs(directory, exist_ok=True)
+        fd, self._temp_path = tempfile.mkstemp(
+            dir=directory, prefix=f'.{os.path.basename(self.filename)}.', suffix='.tmp'
+        )
+        self._file = os.fdopen(fd, 'w', newline='', encoding=self.encoding)
+        if self.format == 'csv':
+            self._writer = csv.writer(self._file, dialect='excel')
+            self._writer.writerow(self.headers)
+
+        if self._existing and not self.key_columns and self.format != 'parquet':
+            logging.info('Appending to existing file.')
+            self._spool(self._existing)
+            self._existing = []
+
+    def write(self, row: Sequence[Any]) -> None:
+        """
+        Add a row; safe to call from several threads.
+
+        Args:
+            row: Values in header order
+        """
+        with self._lock:
+            self._buffer.append(list(row))
+            if len(self._buffer) >= self.flush_rows:
+                self._flush()
+
+    def close(self) -> None:
+        """Write buffered rows and replace the report with the temporary file."""
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._flush()
+                self._file.close()
+                if self.key_columns or self.format == 'parquet':
+                    self._rewrite()
+                if os.path.exists(self.filename):
+                    shutil.copymode(self.filename, self._temp_path)
+                else:
+                    os.chmod(self._temp_path, 0o644)
+                os.replace(self._temp_path, self.filename)
+            except (OSError, ValueError, ImportError) as e:
+                logging.error("Unable to write report %s: %s", self.filename, e)
+                self._discard()
+                raise
+            finally:
+                self._file = None
+        logging.debug("Wrote %d rows to %s", self.rows_written, self.filename)
+
+    def _flush(self) -> None:
+        """Write the buffered rows to the temporary file."""
+        if self._buffer:
+            self._spool(self._buffer)
+            self.rows_written += len(self._buffer)
+            self._buffer.clear()
+            self._file.flush()
+
+    def _spool(self, rows: List[List[Any]]) -> None:
+        """Write rows to the temporary file, as csv or as JSON lines."""
+        if self.format == 'csv':
+            self._writer.writerows(rows)
+        else:
+            self._file.writelines(
+                json.dumps(dict(zip(self.headers, row)), default=str) + '\n' for row in rows
+            )
+
+    def _read_spool(self) -> List[List[Any]]:
+        """Read back the rows of the temporary file."""
+        with open(self._temp_path, newline='', encoding=self.encoding) as f:
+            if self.format == 'csv':
+                return list(csv.reader(f, dialect='excel'))[1:]
+            records = [json.loads(line) for line in f if line.strip()]
+        return [[record.get(column) for column in self.headers] for record in records]
+
+    def _read_existing(self) -> List[List[Any]]:
+        """
+        Read the rows of an existing report, arranged in the current column order.
+
+        Raises:
+            ValueError: If the report cannot be read or has columns missing from the headers
+        """
+        if not os.path.exists(self.filename):
+            return []
+        try:
+            if self.format == 'parquet':
+                import pandas  # pylint: disable=import-outside-toplevel
+
+                frame = pandas.read_parquet(self.filename)
+                columns = list(frame.columns)
+                records = frame.astype(object).where(frame.notna(), None).to_dict('records')
+            else:
+                with open(self.filename, newline='', encoding=self.encoding) as f:
+                    if self.format == 'csv':
+                        reader = csv.DictReader(f, dialect='excel')
+                        records = list(reader)
+                        columns = list(reader.fieldnames or [])
+                    else:
+                        records = [json.loads(line) for line in f if line.strip()]
+                        if not all(isinstance(record, dict) for record in records):
+                            raise ValueError("a line is not a JSON object")
+                        columns = list(dict.fromkeys(k for record in records for k in record))
+        except (OSError, ValueError, csv.Error, ImportError) as e:
+            raise ValueError(
+                f"Could not read existing report {self.filename}, leaving it unchanged: {e}"
+            ) from e
+
+        dropped = [column for column in columns if column not in self.headers]
+        if dropped:
+            raise ValueError(
+                f"Existing report {self.filename} has columns this run does not write "
+                f"({', '.join(map(str, dropped))}); leaving it unchanged, use another filename"
+            )
+
+        empty = '' if self.format == 'csv' else None
+        return [[record.get(column, empty) for column in self.headers] for record in records]
+
+    def _rewrite(self) -> None:
+        """Rewrite the temporary file with the final rows, upserted or in parquet."""
+        rows = self._read_spool()
+
+        if self.key_columns:
+            indexes = [self.headers.index(column) for column in self.key_columns]
+
+            def key(row: List[Any]) -> tuple:
+                return tuple(str(row[i]) for i in indexes)
+
+            merged: Dict[tuple, List[Any]] = {}
+            if self.keep_existing:
+                merged = {key(row): row for row in self._existing}
+            replaced = sum(1 for row in rows if key(row) in merged)
+            merged.update((key(row), row) for row in rows)
+            if replaced:
+                logging.info("Replaced %d existing rows in %s", replaced, self.filename)
+            rows = list(merged.values())
+        elif self.format == 'parquet' and self.keep_existing:
+            rows = self._existing + rows
+
+        if self.format == 'parquet':
+            _write_parquet(self._temp_path, self.headers, rows)
+            return
+
+        with open(self._temp_path, 'w', newline='', encoding=self.encoding) as f:
+            if self.format == 'csv':
+                writer = csv.writer(f, dialect='excel')
+                writer.writerow(self.headers)
+                writer.writerows(rows)
+            else:
+                f.writelines(
+                    json.dumps(dict(zip(self.headers, row)), default=str) + '\n' for row in rows
+                )
+
+    def _discard(self) -> None:
+        """Remove the temporary file."""
+        try:
+            os.remove(self._temp_path)
+        except OSError:
+            pass
+
+
+class OrderedRows:
+    """
+    Writes rows to a report in a fixed order of keys as their producers complete.
+
+    The rows of a key are written as soon as every key before it has
+    completed, so the report fills in while a fleet run is in progress and
+    ends up in key order regardless of which filers finish first. Keys can
+    be given up front or added as work is handed out, see follow.
+
+    Args:
+        report: Report the rows are written to
+        keys: Keys in the order their rows are written, e.g. filer keys
+    """
+
+    def __init__(self, report: RowSink, keys: Sequence[str] = ()):
+        self.report = report
+        self.order = list(keys)
+        self.done: Dict[str, Sequence[Sequence[Any]]] = {}
+        self.written = 0
+        self.lock = threading.Lock()
+
+    def add(self, key: str) -> None:
+        """Append a key to the order."""
+        with self.lock:
+            self.order.append(key)
+
+    def follow(self, items: Iterable[Any], key: Callable[[Any], str]) -> Iterator[Any]:
+        """
+        Yield items, appending the key of each to the order as it is taken.
+
+        Args:
+            items: Work items, e.g. a lazy iterable of filers
+            key: Function mapping an item to its key, e.g. filer_key
+
+        Yields:
+            The items, unchanged
+        """
+        for item in items:
+            self.add(key(item))
+            yield item
+
+    def complete(self, key: str, rows: Sequence[Sequence[Any]] = ()) -> None:
+        """Record the rows of a key, none if it failed, and write what is ready."""
+        with self.lock:
+            self.done[key] = rows
+            self._write_ready()
+
+    def close(self) -> None:
+        """Write the remaining rows, skipping keys that never completed."""
+        with self.lock:
+            while self.written < len(self.order):
+                self.done.setdefault(self.order[self.written], ())
+                self._write_ready()
+
+    def _write_ready(self) -> None:
+        """Write rows up to the first key still in progress."""
+        while self.written < len(self.order) and self.order[self.written] in self.done:
+            for row in self.done.pop(self.order[self.written]):
+                self.report.write(row)
+            self.written += 1
+
+
+def _write_parquet(path: str, headers: List[str], rows: List[List[Any]]) -> None:
+    """Write rows to a parquet file, storing columns of mixed types as text."""
+    import pandas  # pylint: disable=import-outside-toplevel
+
+    frame = pandas.DataFrame(rows, columns=headers)
+    for column in headers:
+        kinds = {type(value) for value in frame[column].dropna()}
+        mixed = len(kinds) > 1 and not kinds <= {int, float}
+        if mixed or kinds - {int, float, bool, str}:
+            frame[column] = frame[column].map(lambda v: None if v is None else str(v))
+    frame.to_parquet(path, index=False)
@@ -0,0 +1,207 @@
+"""Deadlines, retries and circuit breaking for per-filer operations."""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from .limiter import ClientProxy, is_overload
+
+_thread = threading.local()
+
+# Seconds a whole per-filer operation may take
+DEFAULT_FILER_TIMEOUT = 120
+
+# Consecutive failed requests after which a filer is skipped for the rest of a run
+DEFAULT_FAILURE_THRESHOLD = 3
+
+# Idempotent reads are retried with full-jitter exponential backoff
+READ_METHODS = ('get', 'get_multi')
+READ_RETRIES = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+
+
+class DeadlineExceeded(TimeoutError):
+    """A per-filer operation ran past its deadline."""
+
+
+class CircuitOpenError(Exception):
+    """A filer was skipped after too many consecutive failures."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive failure count per filer for the duration of a run.
+
+    Filers are named by their run key (see core.journal.filer_key), so that
+    same-named filers of different tenants are counted apart. Once a filer
+    reaches the threshold, further requests to it fail with CircuitOpenError
+    without being sent.
+
+    Args:
+        threshold: Consecutive failures that open the circuit of a filer
+    """
+
+    def __init__(self, threshold: int = DEFAULT_FAILURE_THRESHOLD):
+        self.threshold = threshold
+        self._failures: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def check(self, name: str) -> None:
+        """Raise CircuitOpenError if the circuit of a filer is open."""
+        if self.is_open(name):
+            raise CircuitOpenError(f"Skipping {name} after {self.threshold} consecutive failures")
+
+    def is_open(self, name: str) -> bool:
+        """Check whether a filer is being skipped."""
+        with self._lock:
+            return self._failures.get(name, 0) >= self.threshold
+
+    def record_success(self, name: str) -> None:
+        """Reset the failure count of a filer."""
+        with self._lock:
+            self._failures[name] = 0
+
+    def record_failure(self, name: str) -> None:
+        """Count a failure of a filer."""
+        with self._lock:
+            self._failures[name] = self._failures.get(name, 0) + 1
+            if self._failures[name] == self.threshold:
+                logging.warning(
+                    "%s failed %d times in a row, skipping it for the rest of the run",
+                    name, self.threshold
+                )
+
+
+class ResilientClient(ClientProxy):
+    """Proxy that retries reads and feeds the circuit breaker of a filer."""
+
+    def __init__(self, client: Any, name: str, breaker: CircuitBreaker):
+        super().__init__(client)
+        self._name = name
+        self._breaker = breaker
+
+    def __getattr__(self, attr_name: str) -> Any:
+        attr = getattr(self._client, attr_name)
+        if attr_name.startswith('_') or not callable(attr):
+            return attr
+
+        retries = READ_RETRIES if attr_name in READ_METHODS else 0
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            for attempt in range(retries + 1):
+                self._breaker.check(self._name)
+                try:
+                    result = attr(*args, **kwargs)
+                except Exception as e:
+                    if not is_transient(e):
+                        raise
+                    self._breaker.record_failure(self._name)
+                    if attempt == retries or self._breaker.is_open(self._name):
+                        raise
+                    delay = retry_delay(attempt)
+                    logging.debug("Retrying %s on %s in %.1fs: %s", attr_name, self._name, delay, e)
+                    time.sleep(delay)
+                else:
+                    self._breaker.record_success(self._name)
+                    return result
+            return None
+
+        return call
+
+
+def is_transient(error: Exception) -> bool:
+    """Check whether an error may succeed when retried."""
+    return is_overload(error) and not isinstance(error, DeadlineExceeded)
+
+
+def retry_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff delay for a retry attempt."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+def protect(filer: Any, breaker: CircuitBreaker, key: str) -> Any:
+    """
+    Route the API client of a filer through retries and a circuit breaker.
+
+    Covers filer.api and everything built on it, such as filer.cli.
+
+    Args:
+        filer: Remote filer object
+        breaker: Circuit breaker of the current run
+        key: Name of the filer in the breaker, see core.journal.filer_key
+
+    Returns:
+        The same filer, for chaining
+    """
+    clients: Any = getattr(filer, 'clients', None)
+    client = getattr(clients, 'api', None)
+    while isinstance(client, ResilientClient):
+        # Filer objects outlive runs, rebind to the breaker of this one
+        client = client._client  # pylint: disable=protected-access
+    if client is not None:
+        clients.api = ResilientClient(client, key, breaker)
+    return filer
+
+
+def thread_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the event loop of the current thread, creating it on first use.
+
+    The loop is set as the thread's event loop, where cterasdk runs its
+    requests. Threads that make portal requests call this before their first
+    one, so that deadline() finds the loop those requests run on.
+
+    Returns:
+        Open event loop of the current thread
+    """
+    loop: Optional[asyncio.AbstractEventLoop] = getattr(_thread, 'loop', None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        _thread.loop = loop
+    return loop
+
+
+@contextmanager
+def deadline(seconds: Optional[float], name: str = 'operation') -> Iterator[None]:
+    """
+    Abort the requests of the current thread's event loop after a deadline.
+
+    cterasdk runs every request to completion on the thread's event loop, so
+    when the deadline passes the loop's tasks are cancelled and the pending
+    request fails with DeadlineExceeded. The loop is the one of
+    thread_event_loop().
+
+    Args:
+        seconds: Time allowed for the block, None for no deadline
+        name: Description used in the error message
+
+    Raises:
+        DeadlineExceeded: If a request was aborted by the deadline
+    """
+    if not seconds:
+        yield
+        return
+
+    loop = thread_event_loop()
+    expired = threading.Event()
+
+    def expire() -> None:
+        expired.set()
+        for task in asyncio.all_tasks(loop):
+            task.cancel()
+
+    handle = loop.call_later(seconds, expire)
+    try:
+        yield
+    except asyncio.CancelledError as e:
+        if expired.is_set():
+            raise DeadlineExceeded(f"{name} exceeded its {seconds}s deadline") from e
+        raise
+    finally:
+        handle.cancel()
@@ -0,0 +1,283 @@
+"""Local index of the shares and access control entries of filers."""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .inventory import user_cache_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS filers (
+    portal TEXT NOT NULL,
+    tenant TEXT NOT NULL COLLATE NOCASE,
+    filer TEXT NOT NULL COLLATE NOCASE,
+    ip TEXT,
+    indexed_at REAL NOT NULL,
+    PRIMARY KEY (portal, tenant, filer)
+);
+CREATE TABLE IF NOT EXISTS shares (
+    portal TEXT NOT NULL,
+    tenant TEXT NOT NULL COLLATE NOCASE,
+    filer TEXT NOT NULL COLLATE NOCASE,
+    share TEXT NOT NULL COLLATE NOCASE,
+    path TEXT COLLATE NOCASE,
+    PRIMARY KEY (portal, tenant, filer, share)
+);
+CREATE INDEX IF NOT EXISTS shares_by_name ON shares (share);
+CREATE INDEX IF NOT EXISTS shares_by_path ON shares (path);
+CREATE TABLE IF NOT EXISTS aces (
+    portal TEXT NOT NULL,
+    tenant TEXT NOT NULL COLLATE NOCASE,
+    filer TEXT NOT NULL COLLATE NOCASE,
+    share TEXT NOT NULL COLLATE NOCASE,
+    principal_type TEXT NOT NULL,
+    principal TEXT NOT NULL COLLATE NOCASE,
+    permission TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (portal, tenant, filer, share, principal_type, principal, permission)
+);
+CREATE INDEX IF NOT EXISTS aces_by_principal ON aces (principal, permission);
+"""
+
+# Version 2 made tenant and filer names case-insensitive
+SCHEMA_VERSION = 2
+TABLES = ('filers', 'shares', 'aces')
+INDEXES = ('shares_by_name', 'shares_by_path', 'aces_by_principal')
+
+# Short permission names, as in create_shares CSV files, and the names filers report
+PERMISSION_ALIASES = {'RW': 'ReadWrite', 'RO': 'ReadOnly', 'NA': 'None'}
+
+# An access control entry: principal type, principal name and permission
+Ace = Tuple[str, str, str]
+
+# A share: name, path if known and its access control entries
+Share = Tuple[str, Optional[str], Sequence[Ace]]
+
+QUERY = """
+SELECT s.portal, s.tenant, s.filer, f.ip, s.share, s.path,
+       a.principal_type, a.principal, a.permission, f.indexed_at
+FROM shares s
+JOIN filers f ON f.portal = s.portal AND f.tenant = s.tenant AND f.filer = s.filer
+{join} aces a ON a.portal = s.portal AND a.tenant = s.tenant AND a.filer = s.filer
+    AND a.share = s.share
+WHERE {where}
+ORDER BY s.tenant, s.filer, s.share, a.principal_type, a.principal
+LIMIT ?
+"""
+
+
+@dataclass
+class ShareEntry:
+    """A share of a filer, with one of its access control entries if any."""
+
+    portal: str
+    tenant: str
+    filer: str
+    ip: Optional[str]
+    share: str
+    path: Optional[str]
+    principal_type: Optional[str]
+    principal: Optional[str]
+    permission: Optional[str]
+    indexed_at: float
+
+
+def shares_index_path() -> str:
+    """Get the default path of the shares index database."""
+    return os.path.join(user_cache_dir(), 'shares_index.sqlite3')
+
+
+def _match(column: str, pattern: str) -> Tuple[str, List[str]]:
+    """
+    Build a case-insensitive condition on a column.
+
+    '*' and '?' act as wildcards; a pattern without them must match exactly,
+    which lets SQLite answer it from the column's index.
+    """
+    if '*' not in pattern and '?' not in pattern:
+        return f'{column} = ?', [pattern]
+    like = pattern.replace('!', '!!').replace('%', '!%').replace('_', '!_')
+    like = like.replace('*', '%').replace('?', '_')
+    return f"{column} LIKE ? ESCAPE '!'", [like]
+
+
+class SharesIndex:
+    """
+    Shares of filers and one row per access control entry, queryable offline.
+
+    Each indexed filer's shares are replaced as a whole, so a run refreshes the
+    filers it reached and keeps what is known about the others, such as filers
+    that were disconnected or failed; indexed_at tells how current each is. Filers are
+    buffered by record and written in a single transaction by commit, so
+    recording from fleet workers costs no I/O.
+
+    Args:
+        portal: Portal address the shares belong to
+        path: Database path, defaults to the user cache directory
+    """
+
+    def __init__(self, portal: str = '', path: Optional[str] = None):
+        self.portal = portal
+        self.path = path or shares_index_path()
+        self._pending: List[Tuple[str, str, str, List[Share], float]] = []
+        self._lock = threading.Lock()
+
+    def record(self, tenant: str, filer: str, ip: str, shares: Iterable[Share]) -> None:
+        """
+        Buffer the current shares of one filer.
+
+        Args:
+            tenant: Tenant name
+            filer: Filer name
+            ip: Filer IP address
+            shares: (name, path, aces) of every share on the filer
+        """
+        entry = (tenant, filer, ip, list(shares), time.time())
+        with self._lock:
+            self._pending.append(entry)
+
+    def commit(self) -> None:
+        """Write the buffered filers, replacing what was indexed for them."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            with self._connect() as conn:
+                for tenant, filer, ip, shares, indexed_at in pending:
+                    self._replace(conn, tenant, filer, ip, shares, indexed_at)
+            logging.info("Indexed the shares of %d filers in %s", len(pending), self.path)
+        except sqlite3.Error as e:
+            logging.warning("Failed to update the shares index: %s", e)
+
+    def query(
+        self,
+        principal: Optional[str] = None,
+        permission: Optional[str] = None,
+        path: Optional[str] = None,
+        name: Optional[str] = None,
+        tenant: Optional[str] = None,
+        filer: Optional[str] = None,
+        limit: int = -1
+    ) -> List[ShareEntry]:
+        """
+        Find shares, and their entries granting access, by any combination of criteria.
+
+        Text criteria are case-insensitive and accept '*' and '?' wildcards.
+
+        Args:
+            principal: Principal name, e.g. 'CTERA\\Contractors'
+            permission: Permission, e.g. 'ReadWrite' or 'RW'
+            path: Share path
+            name: Share name
+            tenant: Tenant name
+            filer: Filer name
+            limit: Maximum number of entries returned, -1 for all
+
+        Returns:
+            One entry per matching access control entry; without principal and
+            permission, shares that have no entries are listed too
+        """
+        conditions, params = ['1'], []
+        if self.portal:
+            conditions.append('s.portal = ?')
+            params.append(self.portal)
+        if permission:
+            permission = PERMISSION_ALIASES.get(permission.upper(), permission)
+        for column, value in (
+            ('a.principal', principal), ('a.permission', permission), ('s.path', path),
+            ('s.share', name), ('s.tenant', tenant), ('s.filer', filer)
+        ):
+            if value:
+                condition, values = _match(column, value)
+                conditions.append(condition)
+                params += values
+        join = 'JOIN' if principal or permission else 'LEFT JOIN'
+        sql = QUERY.format(join=join, where=' AND '.join(conditions))
+        with self._connect() as conn:
+            rows = conn.execute(sql, (*params, limit)).fetchall()
+        return [ShareEntry(*row) for row in rows]
+
+    def filers(self) -> List[Tuple[str, str, float]]:
+        """Get (tenant, filer, indexed_at) of every indexed filer."""
+        portal = self.portal or None
+        with self._connect() as conn:
+            return conn.execute(
+                'SELECT tenant, filer, indexed_at FROM filers WHERE (? IS NULL OR portal = ?) '
+                'ORDER BY tenant, filer',
+                (portal, portal)
+            ).fetchall()
+
+    def _replace(
+        self,
+        conn: sqlite3.Connection,
+        tenant: str,
+        filer: str,
+        ip: str,
+        shares: List[Share],
+        indexed_at: float
+    ) -> None:
+        """Replace the shares and entries of one filer."""
+        key = (self.portal, tenant, filer)
+        for table in ('aces', 'shares'):
+            conn.execute(
+                f'DELETE FROM {table} WHERE portal = ? AND tenant = ? AND filer = ?', key
+            )
+        conn.execute('INSERT OR REPLACE INTO filers VALUES (?,?,?,?,?)', (*key, ip, indexed_at))
+        conn.executemany(
+            'INSERT OR REPLACE INTO shares VALUES (?,?,?,?,?)',
+            [(*key, share, path) for share, path, _ in shares]
+        )
+        conn.executemany(
+            'INSERT OR IGNORE INTO aces VALUES (?,?,?,?,?,?,?)',
+            [(*key, share, *ace) for share, _, aces in shares for ace in aces]
+        )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the index database in a transaction, creating it if needed."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            _migrate(conn)
+            conn.executescript(SCHEMA)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """
+    Bring an index written by an older version to the current schema.
+
+    Column collations cannot be altered, so older tables are renamed,
+    recreated and copied over, in one transaction that also keeps another
+    process from migrating at the same time.
+    """
+    if conn.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+        return
+    with conn:
+        conn.execute('BEGIN IMMEDIATE')
+        if conn.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+            return
+        existing = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        old = [table for table in TABLES if table in existing]
+        for index in INDEXES:
+            conn.execute(f'DROP INDEX IF EXISTS {index}')
+        for table in old:
+            conn.execute(f'ALTER TABLE {table} RENAME TO old_{table}')
+        for statement in SCHEMA.split(';'):
+            conn.execute(statement)
+        for table in old:
+            conn.execute(f'INSERT OR REPLACE INTO {table} SELECT * FROM old_{table}')
+            conn.execute(f'DROP TABLE old_{table}')
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    if old:
+        logging.info("Updated the shares index to schema version %d", SCHEMA_VERSION)
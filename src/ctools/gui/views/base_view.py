@@ -1,6 +1,5 @@
 """Base view class for tool views."""
 
-import asyncio
 import logging
 from abc import abstractmethod
 from typing import Optional
@@ -19,8 +18,11 @@ from ..theme import COLORS
 from ...core.resources import get_logo_path
 from ..widgets import FormField, PasswordField, CheckboxField, FormSection
 from ..widgets import PrimaryButton, SecondaryButton, OutputCard
-from ...core.auth import global_admin_login, enable_device_sso
+from ...core.auth import global_admin_login, ensure_device_sso
+from ...core.fleet import DEFAULT_CONCURRENCY
+from ...core.journal import RUN_ID_PATTERN
 from ...core.logging import setup_logging
+from ...core.resilience import thread_event_loop
 
 
 class WorkerThread(QThread):
@@ -39,8 +41,7 @@ class WorkerThread(QThread):
 
     def run(self):
         # Create a new event loop for this thread (required by cterasdk)
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        loop = thread_event_loop()
 
         # Set up logging with signal callback for real-time output
         setup_logging(
@@ -257,22 +258,54 @@ class BaseToolView(QWidget):
         if not self.password_field.text():
             self.output_card.appendText("Error: Password is required\n")
             return False
+        concurrency = getattr(self, 'concurrency_field', None)
+        if concurrency and concurrency.text():
+            if not concurrency.text().isdigit() or int(concurrency.text()) < 1:
+                self.output_card.appendText("Error: Concurrency must be a positive number\n")
+                return False
+        resume = getattr(self, 'resume_field', None)
+        if resume and resume.text() and not RUN_ID_PATTERN.match(resume.text()):
+            self.output_card.appendText("Error: Invalid run ID to resume\n")
+            return False
         return True
 
+    def _create_concurrency_field(self) -> FormField:
+        """Create the fleet worker pool size field."""
+        self.concurrency_field = FormField(
+            "Concurrency", f"Filers processed in parallel (default: {DEFAULT_CONCURRENCY})"
+        )
+        return self.concurrency_field
+
+    def _get_concurrency(self) -> int:
+        """Get the fleet worker pool size from the concurrency field."""
+        concurrency = getattr(self, 'concurrency_field', None)
+        if concurrency and concurrency.text():
+            return int(concurrency.text())
+        return DEFAULT_CONCURRENCY
+
+    def _create_resume_field(self) -> FormField:
+        """Create the field of the run journal to resume."""
+        self.resume_field = FormField("Resume Run ID", "Leave blank to start a new run")
+        return self.resume_field
+
+    def _get_resume(self) -> Optional[str]:
+        """Get the run ID to resume from the resume field, or None for a new run."""
+        resume = getattr(self, 'resume_field', None)
+        run_id: str = resume.text() if resume else ''
+        return run_id or None
+
     def _get_session(self):
         """Create and return an authenticated session."""
         address = self.address_field.text()
         username = self.username_field.text()
         password = self.password_field.text()
 
-        # First login to enable SSO
         admin = global_admin_login(address, username, password, ignore_cert=True)
-        if admin:
-            enable_device_sso(admin)
+        if admin and ensure_device_sso(admin):
+            # SSO applies to sessions opened after it was enabled
             admin.logout()
-
-        # Second login with SSO enabled
-        return global_admin_login(address, username, password, ignore_cert=True)
+            return global_admin_login(address, username, password, ignore_cert=True)
+        return admin
 
     @abstractmethod
     def _execute_tool(self) -> None:
@@ -29,6 +29,7 @@ class DeleteSharesView(BaseToolView):
 
         section.addField(self.substring_field)
         section.addField(self.output_file_field)
+        section.addField(self._create_resume_field())
         section.addField(self.verbose_checkbox)
 
         self.content_layout.addWidget(section)
@@ -53,7 +54,8 @@ class DeleteSharesView(BaseToolView):
             results = delete_shares(
                 session,
                 substring=self.substring_field.text(),
-                output_file=output_file
+                output_file=output_file,
+                resume=self._get_resume()
             )
 
             # Report results
@@ -22,6 +22,8 @@ class AddMappingView(BaseToolView):
 
         section.addField(self.domain_field)
         section.addRow(self.tenant_field, self.device_field)
+        section.addField(self._create_concurrency_field())
+        section.addField(self._create_resume_field())
         section.addField(self.verbose_checkbox)
 
         self.content_layout.addWidget(section)
@@ -48,7 +50,9 @@ class AddMappingView(BaseToolView):
                 domain=self.domain_field.text(),
                 tenant=tenant,
                 device=self.device_field.text() or None,
-                all_tenants=not tenant
+                all_tenants=not tenant,
+                concurrency=self._get_concurrency(),
+                resume=self._get_resume()
             )
         finally:
             try:
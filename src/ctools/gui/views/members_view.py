@@ -25,6 +25,7 @@ class AddRemoveMembersView(BaseToolView):
         section.addField(self.operation_field)
         section.addRow(self.user_field, self.group_field)
         section.addRow(self.tenant_field, self.device_field)
+        section.addField(self._create_concurrency_field())
         section.addField(self.verbose_checkbox)
 
         self.content_layout.addWidget(section)
@@ -55,7 +56,8 @@ class AddRemoveMembersView(BaseToolView):
                 group=self.group_field.text() or None,
                 tenant=tenant,
                 device=device,
-                all_tenants=not tenant and not device
+                all_tenants=not tenant and not device,
+                concurrency=self._get_concurrency()
             )
         finally:
             try:
@@ -24,6 +24,8 @@ class ResetPasswordView(BaseToolView):
         section.addField(self.username_field)
         section.addField(self.new_password_field)
         section.addRow(self.tenant_field, self.device_field)
+        section.addField(self._create_concurrency_field())
+        section.addField(self._create_resume_field())
         section.addField(self.verbose_checkbox)
 
         self.content_layout.addWidget(section)
@@ -51,7 +53,9 @@ class ResetPasswordView(BaseToolView):
                 username=self.username_field.text() or "admin",
                 tenant=tenant,
                 device=self.device_field.text() or None,
-                all_tenants=not tenant
+                all_tenants=not tenant,
+                concurrency=self._get_concurrency(),
+                resume=self._get_resume()
             )
         finally:
             try:
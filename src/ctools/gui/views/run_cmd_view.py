@@ -25,6 +25,7 @@ class RunCmdView(BaseToolView):
 
         section.addField(self.command_field)
         section.addRow(self.tenant_field, self.device_field)
+        section.addField(self._create_concurrency_field())
         section.addField(self.verbose_checkbox)
 
         self.content_layout.addWidget(section)
@@ -53,7 +54,8 @@ class RunCmdView(BaseToolView):
                 command=self.command_field.text(),
                 tenant=tenant,
                 device=device,
-                all_tenants=not tenant
+                all_tenants=not tenant,
+                concurrency=self._get_concurrency()
             )
         finally:
             try:
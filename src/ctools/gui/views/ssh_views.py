@@ -23,6 +23,7 @@ class EnableSSHView(BaseToolView):
 
         section.addField(self.public_key_field)
         section.addRow(self.tenant_field, self.device_field)
+        section.addField(self._create_concurrency_field())
         section.addField(self.verbose_checkbox)
 
         self.content_layout.addWidget(section)
@@ -49,7 +50,8 @@ class EnableSSHView(BaseToolView):
                 public_key=self.public_key_field.text(),
                 tenant=tenant,
                 device=self.device_field.text() or None,
-                all_tenants=not tenant
+                all_tenants=not tenant,
+                concurrency=self._get_concurrency()
             )
         finally:
             try:
@@ -73,6 +75,7 @@ class DisableSSHView(BaseToolView):
         self.verbose_checkbox = CheckboxField("Verbose logging")
 
         section.addRow(self.tenant_field, self.device_field)
+        section.addField(self._create_concurrency_field())
         section.addField(self.verbose_checkbox)
 
         self.content_layout.addWidget(section)
@@ -89,7 +92,8 @@ class DisableSSHView(BaseToolView):
                 session,
                 tenant=tenant,
                 device=self.device_field.text() or None,
-                all_tenants=not tenant
+                all_tenants=not tenant,
+                concurrency=self._get_concurrency()
             )
         finally:
             try:
@@ -21,6 +21,7 @@ class SuspendSyncView(BaseToolView):
         self.verbose_checkbox = CheckboxField("Verbose logging")
 
         section.addRow(self.tenant_field, self.device_field)
+        section.addField(self._create_concurrency_field())
         section.addField(self.verbose_checkbox)
 
         self.content_layout.addWidget(section)
@@ -37,7 +38,8 @@ class SuspendSyncView(BaseToolView):
                 session,
                 tenant=tenant,
                 device=self.device_field.text() or None,
-                all_tenants=not tenant
+                all_tenants=not tenant,
+                concurrency=self._get_concurrency()
             )
         finally:
             try:
@@ -61,6 +63,7 @@ class UnsuspendSyncView(BaseToolView):
         self.verbose_checkbox = CheckboxField("Verbose logging")
 
         section.addRow(self.tenant_field, self.device_field)
+        section.addField(self._create_concurrency_field())
         section.addField(self.verbose_checkbox)
 
         self.content_layout.addWidget(section)
@@ -77,7 +80,8 @@ class UnsuspendSyncView(BaseToolView):
                 session,
                 tenant=tenant,
                 device=self.device_field.text() or None,
-                all_tenants=not tenant
+                all_tenants=not tenant,
+                concurrency=self._get_concurrency()
             )
         finally:
             try:
@@ -22,6 +22,7 @@ class EnableTelnetView(BaseToolView):
 
         section.addField(self.code_field)
         section.addRow(self.tenant_field, self.device_field)
+        section.addField(self._create_concurrency_field())
         section.addField(self.verbose_checkbox)
 
         self.content_layout.addWidget(section)
@@ -48,7 +49,8 @@ class EnableTelnetView(BaseToolView):
                 code=self.code_field.text(),
                 tenant=tenant,
                 device=self.device_field.text() or None,
-                all_tenants=not tenant
+                all_tenants=not tenant,
+                concurrency=self._get_concurrency()
             )
         finally:
             try:
@@ -5,7 +5,9 @@ from typing import Any, Optional
 
 from cterasdk import common_types
 
-from ..core.filer import get_filer, get_filers
+from ..core.filer import FilerFilter, get_filer, get_filers
+from ..core.fleet import DEFAULT_CONCURRENCY, run_on_filers
+from ..core.journal import RunJournal
 
 
 def add_mapping(
@@ -13,8 +15,11 @@ def add_mapping(
     domain: str,
     tenant: Optional[str] = None,
     device: Optional[str] = None,
-    all_tenants: bool = False
-) -> None:
+    all_tenants: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: Optional[FilerFilter] = None,
+    resume: Optional[str] = None
+) -> bool:
     """
     Add domain to advanced ID mapping on filers.
 
@@ -24,23 +29,41 @@ def add_mapping(
         tenant: Optional tenant name
         device: Optional device name (adds on single device if provided)
         all_tenants: If True and no device specified, run on all tenants
+        concurrency: Maximum number of filers processed at once
+        filters: Optional selection of filers when no device is specified
+        resume: Optional run ID of an interrupted run, to skip filers it completed
+
+    Returns:
+        True if the task succeeded on every selected filer
     """
     logging.info("Starting add mapping task.")
 
     try:
+        journal = RunJournal(
+            'add_mapping', resume,
+            scope={
+                'tenant': tenant, 'device': device, 'all_tenants': all_tenants, 'filters': filters
+            },
+            arguments={'domain': domain}
+        )
         if device:
             filer = get_filer(session, device, tenant)
-            if filer:
-                _add_mapping_to_filer(filer, domain)
+            filers = [filer] if filer else None
         else:
-            filers = get_filers(session, all_tenants, tenant)
-            if filers:
-                for filer in filers:
-                    _add_mapping_to_filer(filer, domain)
+            filers = get_filers(session, all_tenants, tenant, filters=filters, current=True)
+
+        if filers is None:
+            return False
+        result = run_on_filers(
+            session, filers, _add_mapping_to_filer, domain,
+            concurrency=concurrency, journal=journal
+        )
 
         logging.info("Finished add mapping task.")
+        return not result.failed
     except Exception as e:
         logging.warning("An error occurred: %s", e)
+        return False
 
 
 def _get_advanced_mapping(filer: Any) -> tuple:
@@ -89,3 +112,4 @@ def _add_mapping_to_filer(filer: Any, domain: str) -> None:
         logging.info("Successfully added domain mapping %s on %s", domain, filer.name)
     except Exception as e:
         logging.warning("Error adding mapping on %s: %s", filer.name, e)
+        raise
@@ -5,7 +5,8 @@ from typing import Any, Optional
 
 from cterasdk import CTERAException, edge_types, edge_enum, settings
 
-from ..core.filer import get_filer, get_filers
+from ..core.filer import FilerFilter, get_filer, get_filers
+from ..core.fleet import DEFAULT_CONCURRENCY, run_on_filers
 
 
 def add_remove_members(
@@ -15,7 +16,9 @@ def add_remove_members(
     group: Optional[str] = None,
     tenant: Optional[str] = None,
     device: Optional[str] = None,
-    all_tenants: bool = False
+    all_tenants: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: Optional[FilerFilter] = None
 ) -> None:
     """
     Add or remove domain users/groups to/from Administrators group on filers.
@@ -28,6 +31,8 @@ def add_remove_members(
         tenant: Optional tenant name
         device: Optional device name
         all_tenants: If True, run on all tenants
+        concurrency: Maximum number of filers processed at once
+        filters: Optional selection of filers when no device is specified
     """
     logging.info("Starting add/remove members task.")
     logging.info("Operation: %s, User: %s, Group: %s", operation, user, group)
@@ -36,8 +41,15 @@ def add_remove_members(
         logging.error("No user or group specified")
         return
 
+    if operation == "Add":
+        member_func = _add_member
+    elif operation == "Remove":
+        member_func = _remove_member
+    else:
+        logging.error("Unknown operation: %s", operation)
+        return
+
     settings.sessions.management.ssl = False
-    error_string = ""
 
     try:
         # Get filers based on scope
@@ -45,9 +57,9 @@ def add_remove_members(
             filers = [get_filer(session, device, tenant)]
             filers = [f for f in filers if f is not None]
         elif all_tenants:
-            filers = get_filers(session, all_tenants=True)
+            filers = get_filers(session, all_tenants=True, filters=filters, current=True)
         elif tenant:
-            filers = get_filers(session, False, tenant=tenant)
+            filers = get_filers(session, False, tenant=tenant, filters=filters, current=True)
         else:
             logging.error("No device name, tenant name, or all_tenants flag specified")
             return
@@ -56,20 +68,12 @@ def add_remove_members(
             logging.error("No devices found")
             return
 
-        for filer in filers:
-            try:
-                if operation == "Add":
-                    _add_member(filer, user, group, error_string)
-                elif operation == "Remove":
-                    _remove_member(filer, user, group, error_string)
-                else:
-                    logging.error("Unknown operation: %s", operation)
-                    return
-            except Exception as e:
-                error_string += f"Error on {filer.name}: {e}\n"
-                logging.warning("Error processing filer %s: %s", filer.name, e)
-
-        if error_string:
+        result = run_on_filers(session, filers, member_func, user, group, concurrency=concurrency)
+
+        if result.failed:
+            error_string = "".join(
+                f"Error on {name}: {error}\n" for name, error in sorted(result.failed.items())
+            )
             logging.error("Errors occurred during operation:\n%s", error_string)
 
         logging.info("Finished add/remove members task.")
@@ -79,15 +83,16 @@ def add_remove_members(
         raise
 
 
-def _add_member(filer: Any, user: Optional[str], group: Optional[str], error_string: str) -> None:
+def _add_member(filer: Any, user: Optional[str], group: Optional[str]) -> None:
     """Add a user or group to Administrators on a filer."""
+    errors = []
     if user:
         domain_user = edge_types.UserGroupEntry(edge_enum.PrincipalType.DU, user)
         try:
             filer.groups.add_members('Administrators', [domain_user])
             logging.info("Added user '%s' to Administrators on %s", user, filer.name)
         except Exception as e:
-            error_string += f"Failed to add user on {filer.name}: {e}\n"
+            errors.append(f"Failed to add user on {filer.name}: {e}")
             logging.warning("Failed to add user on %s: %s", filer.name, e)
 
     if group:
@@ -96,19 +101,23 @@ def _add_member(filer: Any, user: Optional[str], group: Optional[str], error_str
             filer.groups.add_members('Administrators', [domain_group])
             logging.info("Added group '%s' to Administrators on %s", group, filer.name)
         except Exception as e:
-            error_string += f"Failed to add group on {filer.name}: {e}\n"
+            errors.append(f"Failed to add group on {filer.name}: {e}")
             logging.warning("Failed to add group on %s: %s", filer.name, e)
 
+    if errors:
+        raise RuntimeError("; ".join(errors))
 
-def _remove_member(filer: Any, user: Optional[str], group: Optional[str], error_string: str) -> None:
+
+def _remove_member(filer: Any, user: Optional[str], group: Optional[str]) -> None:
     """Remove a user or group from Administrators on a filer."""
+    errors = []
     if user:
         domain_user = edge_types.UserGroupEntry(edge_enum.PrincipalType.DU, user)
         try:
             filer.groups.remove_members('Administrators', [domain_user])
             logging.info("Removed user '%s' from Administrators on %s", user, filer.name)
         except Exception as e:
-            error_string += f"Failed to remove user on {filer.name}: {e}\n"
+            errors.append(f"Failed to remove user on {filer.name}: {e}")
             logging.warning("Failed to remove user on %s: %s", filer.name, e)
 
     if group:
@@ -117,5 +126,8 @@ def _remove_member(filer: Any, user: Optional[str], group: Optional[str], error_
             filer.groups.remove_members('Administrators', [domain_group])
             logging.info("Removed group '%s' from Administrators on %s", group, filer.name)
         except Exception as e:
-            error_string += f"Failed to remove group on {filer.name}: {e}\n"
+            errors.append(f"Failed to remove group on {filer.name}: {e}")
             logging.warning("Failed to remove group on %s: %s", filer.name, e)
+
+    if errors:
+        raise RuntimeError("; ".join(errors))
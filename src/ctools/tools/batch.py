@@ -0,0 +1,315 @@
+"""Run a list of tool invocations over one portal login."""
+
+import importlib
+import logging
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from ..core.filer import FilerFilter
+from ..core.fleet import FleetResult, clone_session
+from ..core.resilience import thread_event_loop
+
+DEFAULT_BATCH_CONCURRENCY = 4
+
+# Job tool name -> (module in ctools.tools, entry function)
+BATCH_TOOLS = {
+    'show_status': ('status', 'run_status'),
+    'run_cmd': ('run_cmd', 'run_cmd'),
+    'suspend_sync': ('suspend_sync', 'suspend_sync'),
+    'unsuspend_sync': ('unsuspend_sync', 'unsuspend_sync'),
+    'enable_ssh': ('enable_ssh', 'enable_ssh'),
+    'disable_ssh': ('disable_ssh', 'disable_ssh'),
+    'enable_telnet': ('enable_telnet', 'enable_telnet'),
+    'reset_password': ('reset_password', 'reset_password'),
+    'report_zones': ('report_zones', 'report_zones'),
+    'shares_report': ('shares_report', 'shares_report'),
+    'copy_shares': ('copy_shares', 'copy_shares'),
+    'populate_shares': ('populate_shares', 'populate_shares'),
+    'add_mapping': ('add_mapping', 'add_mapping'),
+    'worm_settings': ('worm_settings', 'worm_settings'),
+}
+
+# Tools that log in to filers themselves and take no portal session
+SESSIONLESS_TOOLS = {'copy_shares'}
+
+
+@dataclass
+class BatchJob:
+    """
+    One tool invocation of a batch.
+
+    Attributes:
+        name: Unique job name, defaults to the tool name and position
+        tool: Tool name, as in the CLI subcommand
+        args: Keyword arguments passed to the tool entry function
+        after: Names of jobs that must finish before this one starts
+    """
+
+    name: str
+    tool: str
+    args: Dict[str, Any] = field(default_factory=dict)
+    after: List[str] = field(default_factory=list)
+
+
+def resolve_tool(tool: str) -> Callable[..., Any]:
+    """
+    Get the entry function of a tool.
+
+    Args:
+        tool: Tool name, as in the CLI subcommand
+
+    Returns:
+        Tool entry function taking a session as first argument, which tools
+        in SESSIONLESS_TOOLS ignore. Entry functions catch and log their
+        errors, and return False when the task failed.
+
+    Raises:
+        ValueError: If the tool is unknown
+    """
+    if tool not in BATCH_TOOLS:
+        raise ValueError(f"Unknown tool '{tool}'")
+    module, function = BATCH_TOOLS[tool]
+    tool_module = importlib.import_module(f'.{module}', __package__)
+    entry: Callable[..., Any] = getattr(tool_module, function)
+    if tool in SESSIONLESS_TOOLS:
+        return lambda session, **kwargs: entry(**kwargs)
+    return entry
+
+
+def tool_arguments(args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert plain (YAML or JSON) tool arguments to keyword arguments.
+
+    Args:
+        args: Argument mapping; a 'filters' mapping becomes a FilerFilter
+
+    Returns:
+        Keyword arguments for the tool entry function
+
+    Raises:
+        ValueError: If the filters mapping has keys FilerFilter does not know
+    """
+    args = dict(args)
+    if isinstance(args.get('filters'), dict):
+        unknown = set(args['filters']) - {f.name for f in fields(FilerFilter)}
+        if unknown:
+            raise ValueError(f"Unknown filters: {', '.join(sorted(map(str, unknown)))}")
+        args['filters'] = FilerFilter(**args['filters'])
+    return args
+
+
+def load_jobs(jobs_file: str) -> List[BatchJob]:
+    """
+    Load batch jobs from a YAML file.
+
+    The file holds a 'jobs' list; each job has a 'tool', optional 'name',
+    'args' and 'after' (a job name or list of job names). A 'filters' mapping
+    in args is turned into a FilerFilter.
+
+    Example:
+        jobs:
+          - name: status
+            tool: show_status
+            args: {filename: status.csv, all_tenants: true}
+          - tool: run_cmd
+            args: {command: show version, all_tenants: true}
+            after: status
+
+    Args:
+        jobs_file: Path to the YAML file
+
+    Returns:
+        List of jobs in file order
+
+    Raises:
+        ValueError: If the file is not a valid job list
+    """
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    with open(jobs_file, encoding='utf-8') as f:
+        document = yaml.safe_load(f) or {}
+
+    entries = document.get('jobs') if isinstance(document, dict) else document
+    if not isinstance(entries, list):
+        raise ValueError(f"{jobs_file}: expected a 'jobs' list")
+
+    jobs = []
+    for position, entry in enumerate(entries, 1):
+        tool = entry.get('tool')
+        if tool not in BATCH_TOOLS:
+            raise ValueError(f"Job {position}: unknown tool '{tool}'")
+
+        args = tool_arguments(entry.get('args') or {})
+        after = entry.get('after') or []
+        jobs.append(BatchJob(
+            name=str(entry.get('name') or f"{tool}-{position}"),
+            tool=tool,
+            args=args,
+            after=[after] if isinstance(after, str) else list(after)
+        ))
+
+    names = [job.name for job in jobs]
+    for job in jobs:
+        if names.count(job.name) > 1:
+            raise ValueError(f"Duplicate job name '{job.name}'")
+        for dependency in job.after:
+            if dependency not in names:
+                raise ValueError(f"Job '{job.name}': unknown dependency '{dependency}'")
+    return jobs
+
+
+def run_batch(
+    session: Any,
+    jobs_file: str,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    session_factory: Optional[Callable[[], Any]] = None
+) -> FleetResult:
+    """
+    Run the jobs of a batch file in one process.
+
+    Jobs start in file order once the jobs they run after have succeeded, and
+    independent jobs run concurrently. Filers discovered by one job are shared
+    with the others through the inventory cache.
+
+    Concurrent jobs run on worker threads, each with its own event loop and
+    session. Filer discovery and tools such as report_zones browse between
+    tenants, which changes the context of the server-side session, so
+    concurrent workers cannot share one. The caller's thread runs jobs on
+    session, and each additional worker logs in with session_factory when
+    given, only falling back to a clone of session.
+
+    Args:
+        session: Authenticated GlobalAdmin session
+        jobs_file: Path to the YAML job file
+        concurrency: Maximum number of jobs running at once
+        session_factory: Optional function returning a new authenticated session,
+            opened like session (see core.auth.open_portal_session)
+
+    Returns:
+        FleetResult with the return value or exception of each job
+    """
+    logging.info("Starting batch %s.", jobs_file)
+    try:
+        jobs = load_jobs(jobs_file)
+    except Exception as e:
+        logging.error("Failed to load batch file %s: %s", jobs_file, e)
+        return FleetResult()
+
+    scheduler = _Scheduler(jobs)
+    workers = max(1, min(concurrency, len(jobs)))
+
+    # The caller's thread is the first worker, on session itself
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(scheduler, session, session_factory),
+            name=f"batch-{i}",
+            daemon=True
+        )
+        for i in range(1, workers)
+    ]
+    for thread in threads:
+        thread.start()
+    _run_jobs(scheduler, session)
+    for thread in threads:
+        thread.join()
+
+    result = scheduler.result
+    if result.failed:
+        logging.warning(
+            "%d of %d jobs failed: %s",
+            len(result.failed), result.total, ', '.join(sorted(result.failed))
+        )
+    logging.info("Finished batch %s.", jobs_file)
+    return result
+
+
+class _Scheduler:
+    """Hands out jobs whose dependencies have succeeded."""
+
+    def __init__(self, jobs: List[BatchJob]):
+        self.pending = list(jobs)
+        self.running: Set[str] = set()
+        self.result = FleetResult()
+        self.condition = threading.Condition()
+
+    def next_job(self) -> Optional[BatchJob]:
+        """Block until a job is ready, or return None when none are left."""
+        with self.condition:
+            while True:
+                self._skip_blocked()
+                for job in self.pending:
+                    if all(dependency in self.result.succeeded for dependency in job.after):
+                        self.pending.remove(job)
+                        self.running.add(job.name)
+                        return job
+                if not self.pending:
+                    return None
+                if not self.running:
+                    # Remaining jobs depend on each other
+                    for job in self.pending:
+                        self.result.failed[job.name] = RuntimeError("Circular job dependencies")
+                    self.pending.clear()
+                    return None
+                self.condition.wait()
+
+    def finish(self, job: BatchJob, value: Any = None, error: Optional[Exception] = None) -> None:
+        """Record the outcome of a job."""
+        with self.condition:
+            self.running.discard(job.name)
+            if error is None:
+                self.result.succeeded[job.name] = value
+            else:
+                self.result.failed[job.name] = error
+            self.condition.notify_all()
+
+    def _skip_blocked(self) -> None:
+        """Fail pending jobs that depend on a failed job."""
+        for job in list(self.pending):
+            failed = [dependency for dependency in job.after if dependency in self.result.failed]
+            if failed:
+                logging.warning("Skipping job %s: %s failed", job.name, ', '.join(failed))
+                self.pending.remove(job)
+                self.result.failed[job.name] = RuntimeError(f"Dependency failed: {failed[0]}")
+
+
+def _worker(
+    scheduler: _Scheduler,
+    session: Any,
+    session_factory: Optional[Callable[[], Any]]
+) -> None:
+    """Run jobs on a dedicated event loop and session."""
+    loop = thread_event_loop()
+
+    try:
+        worker_session = session_factory() if session_factory else clone_session(session)
+        try:
+            _run_jobs(scheduler, worker_session)
+        finally:
+            if session_factory:
+                worker_session.logout()
+    except Exception as e:
+        logging.error("Batch worker failed: %s", e)
+    finally:
+        loop.close()
+
+
+def _run_jobs(scheduler: _Scheduler, session: Any) -> None:
+    """Run jobs from the scheduler until none are left."""
+    while True:
+        job = scheduler.next_job()
+        if job is None:
+            return
+
+        logging.info("Starting job %s (%s).", job.name, job.tool)
+        try:
+            value = resolve_tool(job.tool)(session, **job.args)
+            if value is False:
+                raise RuntimeError(f"{job.tool} failed, see the log for details")
+        except Exception as e:
+            logging.error("Job %s failed: %s", job.name, e)
+            scheduler.finish(job, error=e)
+        else:
+            logging.info("Finished job %s.", job.name)
+            scheduler.finish(job, value)
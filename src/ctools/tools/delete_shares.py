@@ -2,11 +2,12 @@
 
 import csv
 import logging
-from typing import Any, List, Tuple
+from typing import Any, List, Optional, Tuple
 
 from cterasdk import CTERAException
 
 from ..core.filer import get_filers
+from ..core.journal import RunJournal, filer_key
 
 
 def find_shares_to_delete(session: Any, substring: str) -> List[Tuple[Any, List[Any]]]:
@@ -23,7 +24,7 @@ def find_shares_to_delete(session: Any, substring: str) -> List[Tuple[Any, List[
     logging.info("Searching for shares containing: %s", substring)
 
     results = []
-    filers = get_filers(session, all_tenants=True)
+    filers = get_filers(session, all_tenants=True, current=True)
 
     if not filers:
         logging.warning("No filers found")
@@ -52,7 +53,8 @@ def find_shares_to_delete(session: Any, substring: str) -> List[Tuple[Any, List[
 def delete_shares(
     session: Any,
     substring: str,
-    output_file: str = "deleted_shares.csv"
+    output_file: str = "deleted_shares.csv",
+    resume: Optional[str] = None
 ) -> List[Tuple[str, str, str]]:
     """
     Delete shares matching a substring (returns list for confirmation).
@@ -61,6 +63,7 @@ def delete_shares(
         session: Authenticated GlobalAdmin session
         substring: Substring to match in share names
         output_file: CSV file to log deletions
+        resume: Optional run ID of an interrupted run, to skip filers it completed
 
     Returns:
         List of tuples (filer_name, share_name, status) for each deletion
@@ -69,7 +72,17 @@ def delete_shares(
     logging.info("Searching for shares containing: %s", substring)
 
     results = []
-    filers = get_filers(session, all_tenants=True)
+    try:
+        journal = RunJournal(
+            'delete_shares', resume,
+            scope={'all_tenants': True},
+            arguments={'substring': substring}
+        )
+    except ValueError as e:
+        logging.error("Failed delete shares task: %s", e)
+        return results
+
+    filers = get_filers(session, all_tenants=True, current=True)
 
     if not filers:
         logging.warning("No filers found")
@@ -86,6 +99,12 @@ def delete_shares(
         logging.warning("Could not initialize output file: %s", e)
 
     for filer in filers:
+        key = filer_key(filer)
+        if journal.is_done(key):
+            logging.debug("Skipping %s, done in run %s", filer.name, journal.run_id)
+            continue
+
+        failures = 0
         try:
             shares = filer.api.get('/config/fileservices/share')
 
@@ -98,6 +117,7 @@ def delete_shares(
                     except CTERAException as error:
                         logging.warning("Failed to delete share %s from %s: %s", share.name, filer.name, error)
                         status = 'NotDeleted'
+                        failures += 1
 
                     results.append((filer.name, share.name, status))
 
@@ -111,6 +131,13 @@ def delete_shares(
 
         except Exception as e:
             logging.warning("Error processing filer %s: %s", filer.name, e)
+            journal.record(key, e)
+            continue
+
+        if failures:
+            journal.record(key, RuntimeError(f"{failures} shares not deleted"))
+        else:
+            journal.record(key)
 
     logging.info("Finished delete shares task. Processed %d shares.", len(results))
     return results
@@ -3,7 +3,8 @@
 import logging
 from typing import Any, Optional
 
-from ..core.filer import get_filer, get_filers
+from ..core.filer import FilerFilter, get_filer, get_filers
+from ..core.fleet import DEFAULT_CONCURRENCY, run_on_filers
 
 
 def enable_ssh(
@@ -11,8 +12,10 @@ def enable_ssh(
     public_key: str,
     tenant: Optional[str] = None,
     device: Optional[str] = None,
-    all_tenants: bool = False
-) -> None:
+    all_tenants: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: Optional[FilerFilter] = None
+) -> bool:
     """
     Enable SSH on filers.
 
@@ -22,23 +25,32 @@ def enable_ssh(
         tenant: Optional tenant name
         device: Optional device name (enables on single device if provided)
         all_tenants: If True and no device specified, run on all tenants
+        concurrency: Maximum number of filers processed at once
+        filters: Optional selection of filers when no device is specified
+
+    Returns:
+        True if the task succeeded on every selected filer
     """
     logging.info("Starting enable SSH task.")
 
     try:
         if device:
             filer = get_filer(session, device, tenant)
-            if filer:
-                _enable_ssh_on_filer(filer, public_key)
+            filers = [filer] if filer else None
         else:
-            filers = get_filers(session, all_tenants, tenant)
-            if filers:
-                for filer in filers:
-                    _enable_ssh_on_filer(filer, public_key)
+            filers = get_filers(session, all_tenants, tenant, filters=filters, current=True)
+
+        if filers is None:
+            return False
+        result = run_on_filers(
+            session, filers, _enable_ssh_on_filer, public_key, concurrency=concurrency
+        )
 
-            logging.info("Finished enable SSH task.")
+        logging.info("Finished enable SSH task.")
+        return not result.failed
     except Exception as e:
         logging.warning("An error occurred: %s", e)
+        return False
 
 
 def _enable_ssh_on_filer(filer: Any, public_key: str) -> None:
@@ -48,3 +60,4 @@ def _enable_ssh_on_filer(filer: Any, public_key: str) -> None:
         logging.info("Enabled SSH on %s", filer.name)
     except Exception as e:
         logging.warning("Error enabling SSH on %s: %s", filer.name, e)
+        raise
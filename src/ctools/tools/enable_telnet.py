@@ -4,7 +4,8 @@ import hashlib
 import logging
 from typing import Any, Optional
 
-from ..core.filer import get_filer, get_filers
+from ..core.filer import FilerFilter, get_filer, get_filers
+from ..core.fleet import DEFAULT_CONCURRENCY, run_on_filers
 
 
 def enable_telnet(
@@ -12,8 +13,10 @@ def enable_telnet(
     code: str,
     tenant: Optional[str] = None,
     device: Optional[str] = None,
-    all_tenants: bool = False
-) -> None:
+    all_tenants: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: Optional[FilerFilter] = None
+) -> bool:
     """
     Enable telnet on filers.
 
@@ -23,23 +26,32 @@ def enable_telnet(
         tenant: Optional tenant name
         device: Optional device name (enables on single device if provided)
         all_tenants: If True and no device specified, run on all tenants
+        concurrency: Maximum number of filers processed at once
+        filters: Optional selection of filers when no device is specified
+
+    Returns:
+        True if the task succeeded on every selected filer
     """
     logging.info("Starting enable telnet task.")
 
     try:
         if device:
             filer = get_filer(session, device, tenant)
-            if filer:
-                _enable_telnet_on_filer(filer, code)
+            filers = [filer] if filer else None
         else:
-            filers = get_filers(session, all_tenants, tenant)
-            if filers:
-                for filer in filers:
-                    _enable_telnet_on_filer(filer, code)
+            filers = get_filers(session, all_tenants, tenant, filters=filters, current=True)
+
+        if filers is None:
+            return False
+        result = run_on_filers(
+            session, filers, _enable_telnet_on_filer, code, concurrency=concurrency
+        )
 
-            logging.info("Finished enable telnet task.")
+        logging.info("Finished enable telnet task.")
+        return not result.failed
     except Exception as e:
         logging.warning("An error occurred: %s", e)
+        return False
 
 
 def _enable_telnet_on_filer(filer: Any, code: str) -> None:
@@ -49,3 +61,4 @@ def _enable_telnet_on_filer(filer: Any, code: str) -> None:
         logging.info("Enabled telnet on %s", filer.name)
     except Exception as e:
         logging.warning("Error enabling telnet on %s: %s", filer.name, e)
+        raise
@@ -53,7 +53,7 @@ def populate_shares(
     session: Any,
     device: str,
     domain: Optional[str] = None
-) -> None:
+) -> bool:
     """
     Populate cloud folders as shares on a device.
 
@@ -65,6 +65,9 @@ def populate_shares(
         session: Authenticated GlobalAdmin session
         device: Device name to populate shares on
         domain: Domain name (only needed if domain users are cloud folder owners)
+
+    Returns:
+        True if the task ran to completion, even if some shares were not created
     """
     logging.info("Starting populate shares task.")
 
@@ -76,20 +79,20 @@ def populate_shares(
         if not folders:
             logging.warning("No cloud folders found")
             logging.info("Finished populate shares task.")
-            return
+            return True
 
         # Get the filer device
         filer = get_filer(session, device)
         if not filer:
             logging.error("Device not found: %s", device)
-            return
+            return False
 
         # Build user lookup dictionaries
         local_users_dict, domain_users_dict = _build_user_dicts(session, domain)
 
         if not local_users_dict and not domain_users_dict:
             logging.error("No users found. Cannot create shares.")
-            return
+            return False
 
         # Create shares for each cloud folder
         for folder in folders:
@@ -141,5 +144,7 @@ def populate_shares(
                 )
 
         logging.info("Finished populate shares task.")
+        return True
     except Exception as e:
         logging.error("Error in populate shares task: %s", e)
+        return False
@@ -1,6 +1,5 @@
 """Generate zones report for CTERA portal."""
 
-import csv
 import logging
 import os
 from datetime import datetime
@@ -9,21 +8,33 @@ from typing import Any, Optional
 from cterasdk import CTERAException, Object
 from cterasdk.core import query
 
+from ..core.report import ReportSink, report_format
+
+ZONES_HEADER = [
+    'Portal', 'Zone', 'Cloud Folders', 'Devices',
+    'Total Size', 'Total Folders', 'Total Files'
+]
+
 
 def report_zones(
     session: Any,
     filename: str,
     tenant: Optional[str] = None,
-    all_tenants: bool = True
-) -> None:
+    all_tenants: bool = True,
+    fmt: Optional[str] = None
+) -> bool:
     """
     Generate zones report.
 
     Args:
         session: Authenticated GlobalAdmin session
-        filename: Output CSV filename or directory
+        filename: Output filename or directory
         tenant: Optional specific tenant name
         all_tenants: If True, report on all tenants
+        fmt: Output format (csv, jsonl or parquet), defaults to the file extension
+
+    Returns:
+        True if the report was written
     """
     logging.info("Starting zones report task.")
 
@@ -31,33 +42,32 @@ def report_zones(
     output_path = os.path.expandvars(filename)
     if os.path.isdir(output_path):
         timestamp = datetime.now().strftime('Zones-%Y_%m_%d-%H_%M_%S')
-        output_path = os.path.join(output_path, f"{timestamp}.csv")
+        output_path = os.path.join(output_path, f"{timestamp}.{fmt or 'csv'}")
 
+    succeeded = True
     try:
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = [
-                'Portal', 'Zone', 'Cloud Folders', 'Devices',
-                'Total Size', 'Total Folders', 'Total Files'
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-
-            _gather_zones_report(session, writer, tenant, all_tenants)
+        fmt = report_format(output_path, fmt)
+        with ReportSink(
+            output_path, ZONES_HEADER, fmt=fmt, keep_existing=False, encoding='utf-8'
+        ) as report:
+            _gather_zones_report(session, report, tenant, all_tenants)
 
         logging.info("Zones report saved to %s", output_path)
     except Exception as e:
         logging.error("Error generating zones report: %s", e)
+        succeeded = False
 
     logging.info("Finished zones report task.")
+    return succeeded
 
 
 def _gather_zones_report(
     session: Any,
-    writer: csv.DictWriter,
+    report: ReportSink,
     tenant: Optional[str],
     all_tenants: bool
 ) -> None:
-    """Gather zone data and write to CSV."""
+    """Gather zone data and write it to the report."""
     try:
         session.portals.browse_global_admin()
 
@@ -76,18 +86,18 @@ def _gather_zones_report(
                 logging.warning("Error getting zones for %s: %s", tenant_name, e)
                 continue
 
+            # Typed reports leave missing statistics empty instead of 'N/A'
+            missing = None if report.typed else 'N/A'
             for zone in zones:
-                zone_data = {
-                    'Portal': tenant_name,
-                    'Zone': zone.name,
-                    'Cloud Folders': _get_cloud_folders(session, zone),
-                    'Devices': _get_zone_devices(zone),
-                    'Total Size': getattr(zone.zoneStatistics, 'totalSize', 'N/A'),
-                    'Total Folders': getattr(zone.zoneStatistics, 'totalFolders', 'N/A'),
-                    'Total Files': getattr(zone.zoneStatistics, 'totalFiles', 'N/A'),
-                }
-
-                writer.writerow(zone_data)
+                report.write([
+                    tenant_name,
+                    zone.name,
+                    _get_cloud_folders(session, zone),
+                    _get_zone_devices(zone),
+                    getattr(zone.zoneStatistics, 'totalSize', missing),
+                    getattr(zone.zoneStatistics, 'totalFolders', missing),
+                    getattr(zone.zoneStatistics, 'totalFiles', missing),
+                ])
                 logging.info("Wrote entry for zone %s on %s", zone.name, tenant_name)
 
     except CTERAException as e:
@@ -5,7 +5,9 @@ from typing import Any, Optional
 
 from cterasdk import CTERAException
 
-from ..core.filer import get_filer, get_filers
+from ..core.filer import FilerFilter, get_filer, get_filers
+from ..core.fleet import DEFAULT_CONCURRENCY, run_on_filers
+from ..core.journal import RunJournal
 
 
 def reset_password(
@@ -14,8 +16,11 @@ def reset_password(
     tenant: Optional[str] = None,
     device: Optional[str] = None,
     all_tenants: bool = False,
-    username: str = "admin"
-) -> None:
+    username: str = "admin",
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: Optional[FilerFilter] = None,
+    resume: Optional[str] = None
+) -> bool:
     """
     Reset local user password on filers.
 
@@ -26,27 +31,48 @@ def reset_password(
         device: Optional device name (resets single device if provided)
         all_tenants: If True and no device specified, run on all tenants
         username: Local username to reset (default: admin)
+        concurrency: Maximum number of filers processed at once
+        filters: Optional selection of filers when no device is specified
+        resume: Optional run ID of an interrupted run, to skip filers it completed
+
+    Returns:
+        True if the task succeeded on every selected filer
     """
     logging.info("Starting reset_password task.")
 
     try:
+        journal = RunJournal(
+            'reset_password', resume,
+            scope={
+                'tenant': tenant, 'device': device, 'all_tenants': all_tenants, 'filters': filters
+            },
+            arguments={'username': username, 'new_password': new_password}
+        )
         if device:
             filer = get_filer(session, device, tenant)
-            if filer:
-                _reset_filer_password(filer, username, new_password)
+            filers = [filer] if filer else None
         else:
-            filers = get_filers(session, all_tenants, tenant)
-            if filers:
-                for filer in filers:
-                    _reset_filer_password(filer, username, new_password)
+            filers = get_filers(session, all_tenants, tenant, filters=filters, current=True)
+
+        if filers is None:
+            return False
+        result = run_on_filers(
+            session, filers, _reset_filer_password, username, new_password,
+            concurrency=concurrency, journal=journal
+        )
 
-            logging.info("Finished reset_password task.")
+        logging.info("Finished reset_password task.")
+        return not result.failed
+    except ValueError as e:
+        logging.error("Failed reset_password task: %s", e)
+        return False
     except CTERAException as error:
         logging.debug(error)
         logging.error(
             "Failed reset_password task. Ensure password is 8+ characters "
             "with at least one letter, digit, and special character."
         )
+        return False
 
 
 def _reset_filer_password(filer: Any, username: str, password: str) -> None:
@@ -56,3 +82,4 @@ def _reset_filer_password(filer: Any, username: str, password: str) -> None:
         logging.info("Password set for %s on %s", username, filer.name)
     except Exception as e:
         logging.warning("Error resetting password on %s: %s", filer.name, e)
+        raise
@@ -5,7 +5,9 @@ from typing import Any, Optional
 
 from cterasdk import CTERAException
 
-from ..core.filer import get_filer, get_filers
+from ..core.aio import AsyncFiler, get_filers_async
+from ..core.filer import FilerFilter, get_filer, get_filers
+from ..core.fleet import DEFAULT_CONCURRENCY, gather_on_filers, run_on_filers
 
 
 def run_cmd(
@@ -13,8 +15,10 @@ def run_cmd(
     command: str,
     tenant: Optional[str] = None,
     device: Optional[str] = None,
-    all_tenants: bool = False
-) -> None:
+    all_tenants: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: Optional[FilerFilter] = None
+) -> bool:
     """
     Run a CLI command on connected filers.
 
@@ -24,6 +28,11 @@ def run_cmd(
         tenant: Optional tenant name
         device: Optional device name (runs on single device if provided)
         all_tenants: If True and no device specified, run on all tenants
+        concurrency: Maximum number of filers processed at once
+        filters: Optional selection of filers when no device is specified
+
+    Returns:
+        True if the task succeeded on every selected filer
     """
     logging.info('Starting run_cmd task.')
 
@@ -31,30 +40,88 @@ def run_cmd(
         if device:
             # Single device mode
             filer = get_filer(session, device, tenant)
-            if filer:
-                _run_on_filer(filer, command)
+            filers = [filer] if filer else None
         else:
             # Multi-filer mode
-            filers = get_filers(session, all_tenants, tenant)
-            if filers:
-                for filer in filers:
-                    _run_on_filer(filer, command)
+            filers = get_filers(session, all_tenants, tenant, filters=filters, current=True)
+
+        if filers is None:
+            return False
+        result = run_on_filers(session, filers, _run_on_filer, command, concurrency=concurrency)
 
-            logging.info('Finished run_cmd task on all filers.')
+        logging.info('Finished run_cmd task on all filers.')
+        return not result.failed
     except Exception as e:
         logging.warning("An error occurred: %s", e)
+        return False
 
 
-def _run_on_filer(filer: Any, command: str) -> None:
-    """Execute command on a single filer."""
+def _run_on_filer(filer: Any, command: str) -> Any:
+    """Execute command on a single filer and return its response."""
     try:
         logging.info("Running command on: %s", filer.name)
         response = filer.cli.run_command(command)
         logging.info(response)
         logging.info("Finished command on: %s", filer.name)
+        return response
     except CTERAException as error:
         logging.debug(error)
         logging.warning("Failed to run command on %s", filer.name)
+        raise
     except AttributeError as error:
         logging.debug(error)
         logging.warning("Command execution error on %s", filer.name)
+        raise
+
+
+async def run_cmd_async(
+    admin: Any,
+    command: str,
+    tenant: Optional[str] = None,
+    all_tenants: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: Optional[FilerFilter] = None
+) -> bool:
+    """
+    Run a CLI command on connected filers using the asyncio engine.
+
+    Args:
+        admin: Authenticated AsyncGlobalAdmin session
+        command: CLI command to execute
+        tenant: Optional tenant name
+        all_tenants: If True, run on all tenants
+        concurrency: Maximum number of filers processed at once
+        filters: Optional selection of filers when no device is specified
+
+    Returns:
+        True if the task succeeded on every selected filer
+    """
+    logging.info('Starting run_cmd task.')
+
+    try:
+        filers = await get_filers_async(admin, all_tenants, tenant, filters=filters)
+        if filers is None:
+            return False
+        result = await gather_on_filers(
+            filers, _run_on_filer_async, command, concurrency=concurrency
+        )
+
+        logging.info('Finished run_cmd task on all filers.')
+        return not result.failed
+    except Exception as e:
+        logging.warning("An error occurred: %s", e)
+        return False
+
+
+async def _run_on_filer_async(filer: AsyncFiler, command: str) -> Any:
+    """Execute command on a single filer asynchronously and return its response."""
+    try:
+        logging.info("Running command on: %s", filer.name)
+        response = await filer.run_command(command)
+        logging.info(response)
+        logging.info("Finished command on: %s", filer.name)
+        return response
+    except CTERAException as error:
+        logging.debug(error)
+        logging.warning("Failed to run command on %s", filer.name)
+        raise
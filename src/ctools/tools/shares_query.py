@@ -0,0 +1,73 @@
+"""Lookups in the local shares index, without connecting to the portal."""
+
+import logging
+import time
+from typing import Optional
+
+from ..core.shares_index import SharesIndex
+
+DEFAULT_LIMIT = 1000
+
+
+def _timestamp(seconds: float) -> str:
+    """Format an epoch timestamp for display."""
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(seconds))
+
+
+def run_shares_query(
+    principal: Optional[str] = None,
+    permission: Optional[str] = None,
+    path: Optional[str] = None,
+    name: Optional[str] = None,
+    tenant: Optional[str] = None,
+    filer: Optional[str] = None,
+    portal: str = '',
+    limit: int = DEFAULT_LIMIT,
+    list_filers: bool = False,
+    index_path: Optional[str] = None
+) -> None:
+    """
+    Print the shares indexed by shares_report --index that match all criteria.
+
+    Text criteria are case-insensitive and accept '*' and '?' wildcards.
+
+    Args:
+        principal: Principal name, e.g. 'CTERA\\Contractors'
+        permission: Permission, e.g. 'ReadWrite' or 'RW'
+        path: Share path
+        name: Share name
+        tenant: Tenant name
+        filer: Filer name
+        portal: Only consider shares of this portal address
+        limit: Maximum number of entries printed
+        list_filers: Print the indexed filers and when they were indexed instead
+        index_path: Index database path, defaults to the user cache directory
+    """
+    index = SharesIndex(portal, index_path)
+
+    if list_filers:
+        print(f"{'Tenant':<24}  {'Filer':<32}  Indexed")
+        for tenant_name, filer_name, indexed_at in index.filers():
+            print(f"{tenant_name:<24}  {filer_name:<32}  {_timestamp(indexed_at)}")
+        return
+
+    start = time.monotonic()
+    entries = index.query(principal, permission, path, name, tenant, filer, limit + 1)
+    elapsed = time.monotonic() - start
+    if not entries:
+        logging.warning("No indexed shares match")
+        return
+
+    print(
+        f"{'Tenant':<20}  {'Filer':<24}  {'Share':<24}  {'Path':<32}  "
+        f"{'Principal':<32}  {'Permission':<10}  Indexed"
+    )
+    for entry in entries[:limit]:
+        principal_text = f"{entry.principal_type}: {entry.principal}" if entry.principal else ''
+        print(
+            f"{entry.tenant:<20}  {entry.filer:<24}  {entry.share:<24}  {entry.path or '':<32}  "
+            f"{principal_text:<32}  {entry.permission or '':<10}  {_timestamp(entry.indexed_at)}"
+        )
+    if len(entries) > limit:
+        logging.warning("Showing the first %d matches; use --limit to see more", limit)
+    logging.debug("Query answered in %.1fms", elapsed * 1000)
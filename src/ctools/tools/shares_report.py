@@ -1,10 +1,24 @@
 """Generate shares report for CTERA filers."""
 
-import csv
+import itertools
 import logging
-from typing import Any, Optional
+import time
+from typing import Any, Dict, Iterable, List, Optional
 
-from ..core.filer import get_filer, get_filers
+from ..core.aio import AsyncFiler, get_filers_async
+from ..core.filer import FilerFilter, get_filer, get_portal_name, iter_filers
+from ..core.fleet import DEFAULT_CONCURRENCY, gather_on_filers, run_on_filers
+from ..core.journal import filer_key
+from ..core.report import OrderedRows, ReportSink
+from ..core.shares_index import Ace, SharesIndex
+
+SHARES_HEADER = ['Share Name', 'Share Path', 'Edge Filer Name', 'Edge Filer IP', 'ACL Permissions']
+
+# Subtrees holding the shares and the IP address, fetched in one request
+SHARES_PATHS = ['config/fileservices/share', 'config/network/ports']
+
+# Number of slowest filers listed in the timing summary
+SLOWEST_FILERS = 10
 
 
 def shares_report(
@@ -12,45 +26,78 @@ def shares_report(
     filename: str,
     tenant: Optional[str] = None,
     device: Optional[str] = None,
-    all_tenants: bool = False
-) -> None:
+    all_tenants: bool = False,
+    filters: Optional[FilerFilter] = None,
+    fmt: Optional[str] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    index: bool = False
+) -> bool:
     """
     Generate shares report.
 
+    Filers are processed concurrently as the portal lists them, page by page;
+    their rows are written in filer order as they become available, and the
+    time spent on each filer is summarized at the end. With index, the shares
+    and ACL entries of every filer reached also replace what the local shares
+    index holds for it.
+
     Args:
         session: Authenticated GlobalAdmin session
-        filename: Output CSV filename
+        filename: Output filename
         tenant: Optional tenant name
         device: Optional device name (reports single device if provided)
         all_tenants: If True and no device specified, run on all tenants
+        filters: Optional selection of filers when no device is specified
+        fmt: Output format (csv, jsonl or parquet), defaults to the file extension
+        concurrency: Maximum number of filers processed at once
+        index: Also update the local shares index, see 'ctools shares query'
+
+    Returns:
+        True if the report was written or there were no filers to report
     """
     logging.info("Starting shares report task.")
 
+    store = SharesIndex(session.host()) if index else None
+    succeeded = True
     try:
         if device:
-            filers = [get_filer(session, device, tenant)]
-            filers = [f for f in filers if f]  # Filter None
-        elif tenant:
-            filers = get_filers(session, all_tenants=False, tenant=tenant)
+            filer = get_filer(session, device, tenant)
+            if not filer:
+                logging.warning("No filers found")
+                return False
+            filers: Iterable[Any] = [filer]
         else:
-            filers = get_filers(session, all_tenants=all_tenants)
-
-        if not filers:
-            logging.warning("No filers found")
-            return
-
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Share Name', 'Share Path', 'Edge Filer Name', 'Edge Filer IP', 'ACL Permissions'])
+            listed = iter_filers(session, all_tenants and not tenant, tenant, filters=filters)
+            first = next(listed, None)
+            if first is None:
+                logging.warning("No filers found")
+                return True
+            filers = itertools.chain([first], listed)
 
-            for filer in filers:
-                _write_filer_shares(writer, filer)
+        start = time.monotonic()
+        timings: Dict[str, float] = {}
+        with _open_report(filename, fmt) as report:
+            rows = OrderedRows(report)
+            try:
+                run_on_filers(
+                    session, rows.follow(filers, filer_key), _collect_shares, rows, timings, store,
+                    concurrency=concurrency,
+                    on_failure=lambda filer: rows.complete(filer_key(filer))
+                )
+            finally:
+                rows.close()
+        _log_timings(timings, time.monotonic() - start)
 
         logging.info("Shares report saved to %s", filename)
     except Exception as e:
         logging.error("Error generating shares report: %s", e)
+        succeeded = False
+    finally:
+        if store is not None:
+            store.commit()
 
     logging.info("Finished shares report task.")
+    return succeeded
 
 
 def _get_principal_name(acl_entry: Any) -> tuple:
@@ -68,46 +115,191 @@ def _get_principal_name(acl_entry: Any) -> tuple:
     return name, classname
 
 
-def _format_acl(share: Any) -> str:
-    """Format all ACL entries for a share into a single string."""
+def _share_aces(share: Any) -> List[Ace]:
+    """Get the (principal type, principal name, permission) of each ACL entry of a share."""
     if not hasattr(share, 'acl') or not share.acl:
-        return ''
+        return []
 
-    entries = []
+    aces = []
     for acl_entry in share.acl:
         try:
             name, principal_type = _get_principal_name(acl_entry)
-            permission = acl_entry.permissions.allowedFileAccess
-            entries.append(f"{principal_type}: {name} ({permission})")
+            aces.append((principal_type, name, acl_entry.permissions.allowedFileAccess))
         except Exception as e:
             logging.debug("Error reading ACL entry: %s", e)
 
-    return "; ".join(entries)
+    return aces
+
+
+def _format_acl(share: Any) -> str:
+    """Format all ACL entries for a share into a single string."""
+    return "; ".join(
+        f"{principal_type}: {name} ({permission})"
+        for principal_type, name, permission in _share_aces(share)
+    )
+
+
+def _share_rows(filer_name: str, shares: Any, ip_address: str) -> List[List[Any]]:
+    """Build report rows for the shares of a single filer."""
+    rows = []
+    for share in shares:
+        logging.info("Writing %s stats to file", share.name)
+        rows.append([
+            share.name,
+            getattr(share, 'directory', 'N/A'),
+            filer_name,
+            ip_address,
+            _format_acl(share)
+        ])
+    return rows
+
+
+def _open_report(filename: str, fmt: Optional[str]) -> ReportSink:
+    """Open a new shares report, replacing an existing one."""
+    return ReportSink(filename, SHARES_HEADER, fmt=fmt, keep_existing=False, encoding='utf-8')
+
+
+def _filer_ip(info: Any) -> str:
+    """Get the IP address of a filer's first port from a get_multi result."""
+    try:
+        address: str = info.config.network.ports[0].ip.address
+    except (AttributeError, IndexError, TypeError):
+        return 'N/A'
+    return address
+
 
+def _info_rows(filer: Any, info: Any, index: Optional[SharesIndex]) -> List[List[Any]]:
+    """Build the share rows of a filer from a get_multi result, indexing its shares if asked."""
+    shares = getattr(info.config.fileservices, 'share', None) or []
+    ip_address = _filer_ip(info)
+    if index is not None:
+        index.record(get_portal_name(filer), filer.name, ip_address, [
+            (share.name, getattr(share, 'directory', None), _share_aces(share))
+            for share in shares
+        ])
+    return _share_rows(filer.name, shares, ip_address)
 
-def _write_filer_shares(writer: csv.writer, filer: Any) -> None:
-    """Write shares for a single filer."""
+
+def _filer_shares(filer: Any, index: Optional[SharesIndex] = None) -> List[List[Any]]:
+    """Get the share rows of a filer with a single request."""
     try:
-        shares = filer.shares.get()
-        ip_address = _get_filer_ip(filer)
-
-        for share in shares:
-            logging.info("Writing %s stats to file", share.name)
-            acl_str = _format_acl(share)
-            writer.writerow([
-                share.name,
-                getattr(share, 'directory', 'N/A'),
-                filer.name,
-                ip_address,
-                acl_str
-            ])
+        info = filer.api.get_multi('/', SHARES_PATHS)
     except Exception as e:
         logging.warning("Error getting shares for %s: %s", filer.name, e)
+        raise
+    return _info_rows(filer, info, index)
+
 
+def _collect_shares(
+    filer: Any,
+    rows: OrderedRows,
+    timings: Dict[str, float],
+    index: Optional[SharesIndex] = None
+) -> None:
+    """
+    Gather the share rows of one filer, hand them to the ordered writer and time it.
 
-def _get_filer_ip(filer: Any) -> str:
-    """Get filer IP address."""
+    Failures are completed by the on_failure callback of run_on_filers.
+    """
+    key = filer_key(filer)
+    start = time.monotonic()
     try:
-        return filer.network.ipconfig().ip.address
-    except Exception:
-        return 'N/A'
+        shares = _filer_shares(filer, index)
+    finally:
+        timings[key] = time.monotonic() - start
+    rows.complete(key, shares)
+
+
+async def _filer_shares_async(
+    filer: AsyncFiler,
+    timings: Dict[str, float],
+    index: Optional[SharesIndex] = None
+) -> List[List[Any]]:
+    """Gather share rows for a single filer asynchronously."""
+    start = time.monotonic()
+    try:
+        info = await filer.api.get_multi('/', SHARES_PATHS)
+    except Exception as e:
+        logging.warning("Error getting shares for %s: %s", filer.name, e)
+        raise
+    finally:
+        timings[filer_key(filer)] = time.monotonic() - start
+    return _info_rows(filer, info, index)
+
+
+def _log_timings(timings: Dict[str, float], elapsed: float) -> None:
+    """Log how long the run took and which filers took longest."""
+    if not timings:
+        return
+    durations = sorted(timings.values())
+    logging.info(
+        "Collected shares of %d filers in %.1fs (median %.2fs, slowest %.2fs per filer)",
+        len(durations), elapsed, durations[len(durations) // 2], durations[-1]
+    )
+    ranked = sorted(timings.items(), key=lambda item: item[1], reverse=True)
+    for key, seconds in ranked[:SLOWEST_FILERS]:
+        logging.info("  %-48s %.2fs", key, seconds)
+    for key, seconds in ranked[SLOWEST_FILERS:]:
+        logging.debug("  %-48s %.2fs", key, seconds)
+
+
+async def shares_report_async(
+    admin: Any,
+    filename: str,
+    tenant: Optional[str] = None,
+    all_tenants: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: Optional[FilerFilter] = None,
+    fmt: Optional[str] = None,
+    index: bool = False
+) -> bool:
+    """
+    Generate shares report using the asyncio engine.
+
+    Args:
+        admin: Authenticated AsyncGlobalAdmin session
+        filename: Output filename
+        tenant: Optional tenant name
+        all_tenants: If True, run on all tenants
+        concurrency: Maximum number of filers processed at once
+        filters: Optional selection of filers
+        fmt: Output format (csv, jsonl or parquet), defaults to the file extension
+        index: Also update the local shares index, see 'ctools shares query'
+
+    Returns:
+        True if the report was written or there were no filers to report
+    """
+    logging.info("Starting shares report task.")
+
+    store = SharesIndex(admin.host()) if index else None
+    succeeded = True
+    try:
+        filers = await get_filers_async(admin, all_tenants, tenant, filters=filters)
+
+        if not filers:
+            logging.warning("No filers found")
+            # None if the filers could not be listed
+            return filers is not None
+
+        start = time.monotonic()
+        timings: Dict[str, float] = {}
+        result = await gather_on_filers(
+            filers, _filer_shares_async, timings, store, concurrency=concurrency
+        )
+
+        with _open_report(filename, fmt) as report:
+            for filer in filers:
+                for row in result.succeeded.get(filer_key(filer), []):
+                    report.write(row)
+        _log_timings(timings, time.monotonic() - start)
+
+        logging.info("Shares report saved to %s", filename)
+    except Exception as e:
+        logging.error("Error generating shares report: %s", e)
+        succeeded = False
+    finally:
+        if store is not None:
+            store.commit()
+
+    logging.info("Finished shares report task.")
+    return succeeded
@@ -1,38 +1,120 @@
 """Status reporting tool for CTERA filers."""
 
+import asyncio
 import csv
 import hashlib
+import itertools
+import json
 import logging
 import os
 import re
-from typing import Any, Optional
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
-from ..core.filer import get_filers, safe_cli_command, get_portal_name
+from cterasdk.core import remote
 
+from ..core.aio import AsyncFiler, get_filers_async
+from ..core.filer import (
+    FilerFilter, get_filers, get_reported_devices, iter_filers, safe_cli_command,
+    get_portal_name
+)
+from ..core.fleet import DEFAULT_CONCURRENCY, FilerPool, gather_on_filers, run_on_filers
+from ..core.history import StatusHistory
+from ..core.journal import filer_key
+from ..core.perf import DEFAULT_PERF_THRESHOLD, PERF_METRICS, PerfSamples, perf_stats
+from ..core.probe_cache import ProbeCache
+from ..core.report import REPORT_ENCODING, OrderedRows, ReportSink, RowSink, report_format
 
-def write_header(filename: str) -> None:
-    """Write CSV header to the given filename."""
-    headers = [
-        'Tenant', 'Filer Name', 'CloudSync Status', 'selfScanIntervalInHours',
-        'uploadingFiles', 'scanningFiles', 'selfVerificationscanningFiles',
-        'MetaLogsSetting', 'AuditLogsStatus', 'DeviceLocation', 'AuditLogsPath',
-        'MetaLogMaxSize', 'MetaLogMaxFiles', 'CurrentFirmware', 'License',
-        'EvictionPercentage', 'CurrentVolumeStorage', 'SN', 'MAC', 'IP Config',
-        'DNS Server1', 'DNS Server2', 'AD Domain Status', 'AD Mapping', 'Alerts',
-        'TimeServer', 'uptime', 'Current Performance', 'Max CPU', 'Max Memory',
-        'DB Size'
-    ]
+# Values read from the config tree
+AUDIT_STATUS_PATH = ('config', 'logging', 'files', 'mode')
+DEVICE_LOCATION_PATH = ('config', 'device', 'location')
+AUDIT_PATH_PATH = ('config', 'logging', 'files', 'path')
+AD_MAPPING_PATH = ('config', 'fileservices', 'cifs', 'idMapping', 'map')
+LICENSE_PATH = ('config', 'device', 'activeLicenseType')
 
-    try:
-        with open(filename, mode='a', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f, dialect='excel')
-            writer.writerow(headers)
-    except FileNotFoundError as error:
-        logging.error("Unable to open file: %s - %s", filename, error)
-        raise
+# Runtime state with no config path, still read through the CLI
+STATUS_CLI_COMMANDS = [
+    'dbg level',
+]
+
+# One shell call covers the database, its WAL and the inode usage of the volumes
+DB_SIZE_COMMAND = 'stat /var/volumes/*/.ctera/cloudSync/CloudSync.db*; df -i /var/volumes/*'
+
+# CloudSync database metrics are cached per filer, as the database grows slowly
+DB_SIZE_PROBE = 'cloudsync_db'
+DEFAULT_DB_SIZE_TTL = 6 * 3600
+DB_SIZE_SKIPPED = 'Not Collected'
+
+
+# Columns of the full reports; any of STATUS_COLUMNS can be selected instead
+STATUS_HEADERS = [
+    'Tenant', 'Filer Name', 'CloudSync Status', 'selfScanIntervalInHours',
+    'uploadingFiles', 'scanningFiles', 'selfVerificationscanningFiles',
+    'MetaLogsSetting', 'AuditLogsStatus', 'DeviceLocation', 'AuditLogsPath',
+    'MetaLogMaxSize', 'MetaLogMaxFiles', 'CurrentFirmware', 'License',
+    'EvictionPercentage', 'CurrentVolumeStorage', 'SN', 'MAC', 'IP Config',
+    'DNS Server1', 'DNS Server2', 'AD Domain Status', 'AD Mapping', 'Alerts',
+    'TimeServer', 'uptime', 'Current Performance', 'Max CPU', 'Max Memory',
+    'DB Size'
+]
+
+# Distribution of the perfMonitor samples, by report label and sample attribute
+PERF_LABELS = dict(zip(PERF_METRICS, ['CPU', 'Memory']))
+PERF_STAT_LABELS = {
+    'p50': 'p50', 'p95': 'p95', 'p99': 'p99', 'mean': 'Mean',
+    'above': f'% Above {DEFAULT_PERF_THRESHOLD:g}'
+}
+PERF_HEADERS = [
+    f'{PERF_LABELS[metric]} {label}'
+    for metric in PERF_METRICS for label in PERF_STAT_LABELS.values()
+]
+
+# Typed formats split the composite text columns into numbers
+STATUS_TYPED_HEADERS = (
+    STATUS_HEADERS[:16] + ['Volume Total', 'Volume Used', 'Volume Free'] + STATUS_HEADERS[17:26]
+    + ['Uptime Seconds', 'CPU', 'Memory', 'Max CPU', 'Max Memory'] + PERF_HEADERS + ['DB Size']
+)
+
+# Identify a filer's row when a report is updated in place
+STATUS_KEY_COLUMNS = ['Tenant', 'Filer Name']
+
+# Placeholders written to csv reports, empty values in typed reports
+MISSING_VALUES = ('Not Applicable', 'N/A', DB_SIZE_SKIPPED)
+
+
+def open_report(
+    filename: str,
+    upsert: bool = False,
+    fmt: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    portal_only: bool = False
+) -> ReportSink:
+    """
+    Open the status report for writing.
+
+    Args:
+        filename: Output filename
+        upsert: Replace the existing rows of the same filers instead of appending
+        fmt: Output format (csv, jsonl or parquet), defaults to the file extension
+        columns: Report only these columns, see STATUS_COLUMNS
+        portal_only: Default to the columns the portal holds, see from_portal
+
+    Returns:
+        ReportSink to use as a context manager
+
+    Raises:
+        ValueError: If a column name is unknown
+    """
+    key_columns = STATUS_KEY_COLUMNS if upsert else None
+    fmt = report_format(filename, fmt)
+    headers = report_columns(columns, fmt != 'csv', portal_only)
+    StatusPlan(headers)  # Fail on unknown columns before anything is collected
+    return ReportSink(filename, headers, key_columns, fmt)
 
 
-def get_safe_attr(obj: Any, *attrs: str, default: str = 'Not Applicable') -> Any:
+def get_safe_attr(obj: Any, *attrs: str, default: Any = 'Not Applicable') -> Any:
     """Safely get nested attribute from object."""
     current = obj
     for attr in attrs:
@@ -51,219 +133,1099 @@ def get_ad_status(join_status: int) -> str:
 
 def get_max_metric(samples: Any, metric: str) -> str:
     """Get maximum value of a metric from performance samples."""
-    try:
-        if samples is None:
-            return 'N/A'
-        values = [getattr(s, metric) for s in samples]
-        return f"{max(values)}%"
-    except (AttributeError, TypeError, ValueError):
-        return 'N/A'
+    return _percent(perf_stats(samples, metrics=(metric,))[metric]['max'])
+
 
+def _percent(value: Optional[float]) -> str:
+    """Format a usage statistic for the csv report."""
+    return 'N/A' if value is None else f"{value:g}%"
 
-def get_db_size(filer: Any) -> str:
-    """Get CloudSync database size."""
+
+def _number(value: Any) -> Any:
+    """Convert a reported value to an int or float, or None if it is not numeric."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
     try:
-        info = filer.api.get_multi('/', ['status', 'config'])
+        text = str(value).strip().rstrip('%')
+        return int(text) if text.lstrip('-').isdigit() else float(text)
+    except ValueError:
+        return None
 
-        mac_addr = info.status.device.MacAddress
-        if isinstance(mac_addr, list):
-            mac_addr = mac_addr[0] if mac_addr else ''
-        mac_addr = str(mac_addr)
 
-        firmware = str(info.status.device.runningFirmware)
+def _uptime_seconds(uptime: Any) -> Any:
+    """Convert a reported uptime, in seconds or as '[N days,] H:MM[:SS]', to seconds."""
+    seconds = _number(uptime)
+    if seconds is not None:
+        return seconds
+    match = re.search(r'(?:(\d+)\s*days?,?\s*)?(\d+):(\d+)(?::(\d+))?', str(uptime))
+    if not match:
+        return None
+    days, hours, minutes, secs = (int(part or 0) for part in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + secs
 
-        filer.telnet.enable(
-            hashlib.sha1((mac_addr + '-' + firmware).encode('utf-8')).hexdigest()[:8]
-        )
 
-        output = filer.shell.run_command('stat /var/volumes/*/.ctera/cloudSync/CloudSync.db')
-        size_bytes = int(re.search(r'(?<=Size:\ )[0-9]*', output).group())
-        size_gb = round(size_bytes / 2**30, 2)
+def _telnet_code(info: Any) -> str:
+    """Derive the telnet authorization code from the device MAC and firmware."""
+    mac_addr = info.status.device.MacAddress
+    if isinstance(mac_addr, list):
+        mac_addr = mac_addr[0] if mac_addr else ''
+    mac_addr = str(mac_addr)
+
+    firmware = str(info.status.device.runningFirmware)
+
+    return hashlib.sha1((mac_addr + '-' + firmware).encode('utf-8')).hexdigest()[:8]
+
+
+def _parse_db_metrics(output: str) -> Dict[str, Any]:
+    """
+    Parse CloudSync database metrics from the output of DB_SIZE_COMMAND.
+
+    Returns:
+        Dictionary with db_bytes, wal_bytes, allocated_bytes (all database
+        files) and volume_inodes_used_pct (highest of the volumes, or None)
+
+    Raises:
+        ValueError: If the output has no database file
+    """
+    metrics: Dict[str, Any] = {'db_bytes': None, 'wal_bytes': 0, 'allocated_bytes': 0}
+    for block in re.split(r'^\s*File:\s*', output, flags=re.MULTILINE)[1:]:
+        name = block.split()[0].strip('\'"\u2018\u2019')
+        size_match = re.search(r'Size:\s*(\d+)', block)
+        if not size_match:
+            continue
+        size = int(size_match.group(1))
+        blocks = re.search(r'Blocks:\s*(\d+)', block)
+        if blocks:
+            metrics['allocated_bytes'] += int(blocks.group(1)) * 512
+        if name.endswith('CloudSync.db'):
+            metrics['db_bytes'] = (metrics['db_bytes'] or 0) + size
+        elif name.endswith('-wal'):
+            metrics['wal_bytes'] += size
+
+    if metrics['db_bytes'] is None:
+        raise ValueError("No CloudSync database in stat output")
+
+    inode_usage = [int(pct) for pct in re.findall(r'(\d+)%\s+/var/volumes', output)]
+    metrics['volume_inodes_used_pct'] = max(inode_usage) if inode_usage else None
+    return metrics
+
+
+def _db_size_gb(metrics: Dict[str, Any]) -> str:
+    """Format the database size of CloudSync metrics in GB."""
+    return str(round(metrics['db_bytes'] / 2**30, 2))
+
+
+def _format_license(license_type: Any) -> Any:
+    """Format a raw activeLicenseType value the way cterasdk licenses.get() does."""
+    if not isinstance(license_type, str) or license_type == 'NA':
+        return license_type if license_type is not None else 'Not Applicable'
+    if len(license_type) == 8:
+        license_type = license_type + '16'
+    return 'EV' + license_type[8:]
+
+
+def get_db_metrics(filer: Any, info: Any = None) -> Dict[str, Any]:
+    """
+    Measure the CloudSync database over telnet, see _parse_db_metrics.
 
+    Telnet is enabled for a single shell call and always disabled again.
+
+    Args:
+        filer: Filer object
+        info: Optional result of a get_multi including 'status', to save a request
+    """
+    if info is None:
+        info = filer.api.get_multi('/', ['status', 'config'])
+
+    filer.telnet.enable(_telnet_code(info))
+    try:
+        return _parse_db_metrics(filer.shell.run_command(DB_SIZE_COMMAND))
+    finally:
         filer.telnet.disable()
-        return str(size_gb)
+
+
+def get_db_size(filer: Any, info: Any = None) -> str:
+    """
+    Get CloudSync database size.
+
+    Args:
+        filer: Filer object
+        info: Optional result of a get_multi including 'status', to save a request
+    """
+    try:
+        return _db_size_gb(get_db_metrics(filer, info))
     except Exception as e:
         logging.debug("get_db_size failed: %s", e)
         return 'N/A'
 
 
-def write_filer_status(
-    session: Any,
-    filename: str,
-    all_tenants: bool,
-    tenant: Optional[str] = None
-) -> None:
-    """Write status information for all filers to CSV."""
-    get_list = [
-        'config', 'status', 'proc/cloudsync',
-        'proc/time/', 'proc/storage/summary', 'proc/perfMonitor'
-    ]
+def _cached_db_size(cache: Optional[ProbeCache], filer: Any, info: Any) -> str:
+    """Get the database size from the probe cache, measuring it when missing or stale."""
+    if cache is None:
+        return DB_SIZE_SKIPPED
+    key = filer_key(filer)
+    metrics = cache.get(key)
+    if metrics is None:
+        try:
+            metrics = get_db_metrics(filer, info)
+        except Exception as e:
+            logging.debug("get_db_size failed on %s: %s", filer.name, e)
+            return 'N/A'
+        cache.put(key, metrics)
+    return _db_size_gb(metrics)
 
-    logging.info("Gathering status for all filers...")
-    filers = get_filers(session, all_tenants, tenant)
 
-    if not filers:
-        logging.warning("No filers found")
-        return
+def _config_value(info: Any, path: tuple) -> Any:
+    """Get a config value from a get_multi result, as compact JSON for structured values."""
+    value = get_safe_attr(info, *path)
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return json.dumps(value, default=lambda o: o.__dict__, separators=(',', ':'))
 
-    for filer in filers:
-        logging.info("Gathering status for %s...", filer.name)
 
+def _get_license(info: Any) -> Any:
+    """Get the active license of a filer from a get_multi result."""
+    license_type = get_safe_attr(info, *LICENSE_PATH, default=None)
+    if license_type is not None and hasattr(license_type, 'current'):
+        license_type = license_type.current
+    return _format_license(license_type)
+
+
+class _StatusData:
+    """Everything gathered from one filer for its status row, with shared values derived once."""
+
+    def __init__(self, tenant: str, filer_name: str, info: Any, cli: Dict[str, str], db_size: str):
+        self.tenant = tenant
+        self.filer_name = filer_name
+        self.info = info
+        self.cli = cli
+        self.db_size = db_size
+
+    def attr(self, *path: str) -> Any:
+        """Get a value of the get_multi result, 'Not Applicable' if missing."""
+        return get_safe_attr(self.info, *path)
+
+    @cached_property
+    def perf(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Statistics of the perfMonitor samples."""
+        return perf_stats(get_safe_attr(self.info, 'proc', 'perfMonitor', 'samples', default=None))
+
+    @cached_property
+    def port(self) -> Any:
+        """First network port, or None."""
+        ports = get_safe_attr(self.info, 'status', 'network', 'ports', default=None)
+        return ports[0] if isinstance(ports, list) and ports else None
+
+    @cached_property
+    def volume(self) -> Optional[tuple]:
+        """Total, used and free volume space, or None."""
         try:
-            info = filer.api.get_multi('/', get_list)
-        except Exception as e:
-            logging.warning("Failed to get info for %s: %s", filer.name, e)
-            continue
+            summary = self.info.proc.storage.summary
+            return summary.totalVolumeSpace, summary.usedVolumeSpace, summary.freeVolumeSpace
+        except AttributeError:
+            return None
+
+
+@dataclass(frozen=True)
+class StatusColumn:
+    """
+    A status report column: the data it needs and how its value is extracted.
+
+    Attributes:
+        name: Column header
+        text: Extracts the value written to csv reports
+        paths: get_multi paths the extractors read
+        typed: Extracts the value written to typed reports, defaults to text
+        cli: CLI commands whose output the extractors read
+        db_size: True if the column needs the CloudSync database size probe
+    """
+
+    name: str
+    text: Callable[[_StatusData], Any]
+    paths: Tuple[str, ...] = ()
+    typed: Optional[Callable[[_StatusData], Any]] = None
+    cli: Tuple[str, ...] = ()
+    db_size: bool = False
+
+    def value(self, data: _StatusData, typed: bool = False) -> Any:
+        """Extract the value of the column, with None for missing values if typed."""
+        if not typed:
+            return self.text(data)
+        value = (self.typed or self.text)(data)
+        return None if isinstance(value, str) and value in MISSING_VALUES else value
+
+
+def _metalogs_setting(data: _StatusData) -> Any:
+    """Extract the debug level from the 'dbg level' output."""
+    metalogs = data.cli.get('dbg level', 'Not Applicable')
+    if isinstance(metalogs, str) and len(metalogs) >= 28:
+        return metalogs[-28:-18]
+    return metalogs
+
+
+def _metalog(data: _StatusData, field: str) -> Any:
+    """Get a MetaLog setting, which older firmware keeps under log2File."""
+    value = data.attr('config', 'logging', 'metalog', field)
+    if value == 'Not Applicable':
+        value = data.attr('config', 'logging', 'log2File', field)
+    return value
+
+
+def _port_value(data: _StatusData, field: str) -> Any:
+    """Get an IP setting of the first network port."""
+    return get_safe_attr(data.port, 'ip', field, default='N/A')
+
+
+def _current_perf(data: _StatusData, metric: str) -> Any:
+    """Get the current value of a perfMonitor metric."""
+    try:
+        return getattr(data.info.proc.perfMonitor.current, metric)
+    except (AttributeError, TypeError):
+        return 'N/A'
+
+
+def _volume_text(data: _StatusData) -> str:
+    """Format the volume space summary."""
+    if data.volume is None:
+        return 'N/A'
+    return "Total: {} Used: {} Free: {}".format(*data.volume)
+
+
+def _volume_part(index: int) -> Callable[[_StatusData], Any]:
+    """Extract one number of the volume space summary."""
+    return lambda data: None if data.volume is None else _number(data.volume[index])
 
-        tenant = get_portal_name(filer)
-        logging.info("Tenant: %s", tenant)
 
-        # Extract all metrics with safe fallbacks
-        sync_id = get_safe_attr(info, 'proc', 'cloudsync', 'serviceStatus', 'id')
-        self_scan_interval = get_safe_attr(
-            info, 'config', 'cloudsync', 'selfScanVerificationIntervalInHours'
+def _time_servers(data: _StatusData) -> str:
+    """Format the time configuration."""
+    time_config = get_safe_attr(data.info, 'config', 'time', default=None)
+    if not time_config:
+        return 'N/A'
+    return f"Mode: {getattr(time_config, 'NTPMode', 'N/A')} " \
+           f"Zone: {getattr(time_config, 'TimeZone', 'N/A')} " \
+           f"Servers: {getattr(time_config, 'NTPServer', 'N/A')}"
+
+
+def _perf_stat(metric: str, stat: str, typed: bool = False) -> Callable[[_StatusData], Any]:
+    """Extract a statistic of the perfMonitor samples, as a percentage unless typed."""
+    if typed:
+        return lambda data: data.perf[metric][stat]
+    return lambda data: _percent(data.perf[metric][stat])
+
+
+def _attr(*path: str) -> Callable[[_StatusData], Any]:
+    """Extract a value of the get_multi result."""
+    return lambda data: data.attr(*path)
+
+
+def _config(path: tuple) -> Callable[[_StatusData], Any]:
+    """Extract a config value, as text for structured values."""
+    return lambda data: _config_value(data.info, path)
+
+
+# Every column either report format can hold. Each column names the smallest
+# get_multi subtrees it reads, so a report of a few columns fetches only those.
+STATUS_COLUMNS = [
+    StatusColumn('Tenant', lambda data: data.tenant),
+    StatusColumn('Filer Name', lambda data: data.filer_name),
+    StatusColumn(
+        'CloudSync Status', _attr('proc', 'cloudsync', 'serviceStatus', 'id'), ('proc/cloudsync',)
+    ),
+    StatusColumn(
+        'selfScanIntervalInHours',
+        _attr('config', 'cloudsync', 'selfScanVerificationIntervalInHours'), ('config/cloudsync',)
+    ),
+    StatusColumn(
+        'uploadingFiles',
+        _attr('proc', 'cloudsync', 'serviceStatus', 'uploadingFiles'), ('proc/cloudsync',)
+    ),
+    StatusColumn(
+        'scanningFiles',
+        _attr('proc', 'cloudsync', 'serviceStatus', 'scanningFiles'), ('proc/cloudsync',)
+    ),
+    StatusColumn(
+        'selfVerificationscanningFiles',
+        _attr('proc', 'cloudsync', 'serviceStatus', 'selfVerificationScanningFiles'),
+        ('proc/cloudsync',)
+    ),
+    StatusColumn('MetaLogsSetting', _metalogs_setting, cli=('dbg level',)),
+    StatusColumn('AuditLogsStatus', _config(AUDIT_STATUS_PATH), ('config/logging',)),
+    StatusColumn('DeviceLocation', _config(DEVICE_LOCATION_PATH), ('config/device',)),
+    StatusColumn('AuditLogsPath', _config(AUDIT_PATH_PATH), ('config/logging',)),
+    StatusColumn(
+        'MetaLogMaxSize', lambda data: _metalog(data, 'maxFileSizeMB'), ('config/logging',)
+    ),
+    StatusColumn('MetaLogMaxFiles', lambda data: _metalog(data, 'maxfiles'), ('config/logging',)),
+    StatusColumn(
+        'CurrentFirmware', _attr('status', 'device', 'runningFirmware'), ('status/device',)
+    ),
+    StatusColumn('License', lambda data: _get_license(data.info), ('config/device',)),
+    StatusColumn(
+        'EvictionPercentage',
+        _attr('config', 'cloudsync', 'cloudExtender', 'storageThresholdPercentTrigger'),
+        ('config/cloudsync',)
+    ),
+    StatusColumn('CurrentVolumeStorage', _volume_text, ('proc/storage/summary',)),
+    StatusColumn('Volume Total', _volume_part(0), ('proc/storage/summary',)),
+    StatusColumn('Volume Used', _volume_part(1), ('proc/storage/summary',)),
+    StatusColumn('Volume Free', _volume_part(2), ('proc/storage/summary',)),
+    StatusColumn('SN', _attr('status', 'device', 'SerialNumber'), ('status/device',)),
+    StatusColumn('MAC', _attr('status', 'device', 'MacAddress'), ('status/device',)),
+    StatusColumn('IP Config', lambda data: _port_value(data, 'address'), ('status/network',)),
+    StatusColumn('DNS Server1', lambda data: _port_value(data, 'DNSServer1'), ('status/network',)),
+    StatusColumn('DNS Server2', lambda data: _port_value(data, 'DNSServer2'), ('status/network',)),
+    StatusColumn(
+        'AD Domain Status',
+        lambda data: get_ad_status(
+            get_safe_attr(data.info, 'status', 'fileservices', 'cifs', 'joinStatus', default=-1)
+        ),
+        ('status/fileservices',)
+    ),
+    StatusColumn('AD Mapping', _config(AD_MAPPING_PATH), ('config/fileservices',)),
+    StatusColumn('Alerts', _attr('config', 'logging', 'alert'), ('config/logging',)),
+    StatusColumn('TimeServer', _time_servers, ('config/time',)),
+    StatusColumn('uptime', _attr('proc', 'time', 'uptime'), ('proc/time/',)),
+    StatusColumn(
+        'Uptime Seconds', lambda data: _uptime_seconds(data.attr('proc', 'time', 'uptime')),
+        ('proc/time/',)
+    ),
+    StatusColumn(
+        'Current Performance',
+        lambda data: f"CPU: {_current_perf(data, 'cpu')}% Mem: {_current_perf(data, 'memUsage')}%",
+        ('proc/perfMonitor',)
+    ),
+    StatusColumn(
+        'CPU', lambda data: _current_perf(data, 'cpu'), ('proc/perfMonitor',),
+        lambda data: _number(_current_perf(data, 'cpu'))
+    ),
+    StatusColumn(
+        'Memory', lambda data: _current_perf(data, 'memUsage'), ('proc/perfMonitor',),
+        lambda data: _number(_current_perf(data, 'memUsage'))
+    ),
+    StatusColumn(
+        'Max CPU', _perf_stat('cpu', 'max'), ('proc/perfMonitor',), _perf_stat('cpu', 'max', True)
+    ),
+    StatusColumn(
+        'Max Memory', _perf_stat('memUsage', 'max'), ('proc/perfMonitor',),
+        _perf_stat('memUsage', 'max', True)
+    ),
+    *(
+        StatusColumn(
+            f'{PERF_LABELS[metric]} {label}', _perf_stat(metric, stat), ('proc/perfMonitor',),
+            _perf_stat(metric, stat, True)
         )
-        uploading = get_safe_attr(info, 'proc', 'cloudsync', 'serviceStatus', 'uploadingFiles')
-        scanning = get_safe_attr(info, 'proc', 'cloudsync', 'serviceStatus', 'scanningFiles')
-        self_verification = get_safe_attr(
-            info, 'proc', 'cloudsync', 'serviceStatus', 'selfVerificationScanningFiles'
+        for metric in PERF_METRICS for stat, label in PERF_STAT_LABELS.items()
+    ),
+    StatusColumn(
+        'DB Size', lambda data: data.db_size, ('status/device',),
+        lambda data: _number(data.db_size), db_size=True
+    ),
+]
+
+STATUS_COLUMN_MAP = {column.name: column for column in STATUS_COLUMNS}
+
+# Trees the portal keeps a copy of for each filer, under REPORTED_STATUS
+PORTAL_TREES = ('config', 'status')
+REPORTED_STATUS = 'deviceReportedStatus'
+
+# Subtrees that change from minute to minute; watch mode polls only these by default
+VOLATILE_PATHS = {'proc/cloudsync', 'proc/perfMonitor', 'proc/storage/summary'}
+WATCH_COLUMNS = [
+    column.name for column in STATUS_COLUMNS
+    if column.name in STATUS_TYPED_HEADERS and column.name not in PERF_HEADERS
+    and column.paths and set(column.paths) <= VOLATILE_PATHS
+]
+DEFAULT_WATCH_INTERVAL = 60
+CHANGE_HEADERS = ['Time', 'Tenant', 'Filer Name', 'Column', 'Previous', 'Current']
+
+
+class _CombinedInfo:
+    """A get_multi result assembled from the portal's copy and the filer's own subtrees."""
+
+    def __init__(self, *sources: Any):
+        self._sources = [source for source in sources if source is not None]
+
+    def __getattr__(self, name: str) -> Any:
+        for source in self._sources:
+            value = getattr(source, name, None)
+            if value is not None:
+                return value
+        raise AttributeError(name)
+
+
+def from_portal(column: StatusColumn) -> bool:
+    """Check if the portal holds everything a column needs, so no filer has to be called."""
+    return not column.cli and not column.db_size and all(
+        path.split('/')[0] in PORTAL_TREES for path in column.paths
+    )
+
+
+class StatusPlan:
+    """
+    The columns of a status report and what must be fetched from each filer for them.
+
+    With portal set, the config and status subtrees are read from the copy
+    the portal keeps of each filer (the include list of the device query),
+    and paths, cli and db_size are what is left to ask the filers for.
+
+    Args:
+        columns: Column names, see STATUS_COLUMNS
+        typed: Build rows for a typed report format
+        portal: Read what the portal holds from its device query
+
+    Raises:
+        ValueError: If a column name is unknown
+    """
+
+    def __init__(self, columns: Sequence[str], typed: bool = False, portal: bool = False):
+        unknown = [name for name in columns if name not in STATUS_COLUMN_MAP]
+        if unknown:
+            raise ValueError(
+                f"Unknown status columns: {', '.join(unknown)}. "
+                f"Available: {', '.join(STATUS_COLUMN_MAP)}"
+            )
+        self.names = list(columns)
+        self.columns = [STATUS_COLUMN_MAP[name] for name in columns]
+        self.typed = typed
+
+        paths = sorted({path for column in self.columns for path in column.paths})
+        # A subtree is fetched with its parent
+        self.paths = [
+            path for path in paths
+            if not any(path.startswith(other.rstrip('/') + '/') for other in paths if other != path)
+        ]
+        self._fetched = list(self.paths)
+        self.cli = [
+            command for command in STATUS_CLI_COMMANDS
+            if any(command in column.cli for column in self.columns)
+        ]
+        self.db_size = any(column.db_size for column in self.columns)
+
+        self.portal = portal
+        self.include: List[str] = []
+        self.reported: Dict[str, Any] = {}
+        if portal:
+            self.include = [
+                f"{REPORTED_STATUS}.{path.replace('/', '.')}" for path in self.paths
+                if path.split('/')[0] in PORTAL_TREES
+            ]
+            self.paths = [path for path in self.paths if path.split('/')[0] not in PORTAL_TREES]
+
+    @property
+    def remote(self) -> bool:
+        """True if anything has to be fetched from the filers themselves."""
+        return bool(self.paths or self.cli or self.db_size)
+
+    @cached_property
+    def history(self) -> 'StatusPlan':
+        """
+        The typed columns that can be computed from what this plan fetches.
+
+        History keeps numbers, which the csv columns fold into text such as
+        'CurrentVolumeStorage', so its rows come from the typed columns whatever the
+        report format is.
+        """
+        return StatusPlan([
+            name for name in STATUS_TYPED_HEADERS if self._covers(STATUS_COLUMN_MAP[name])
+        ], typed=True)
+
+    def _covers(self, column: StatusColumn) -> bool:
+        """Check if everything a column needs is fetched by this plan."""
+        return (
+            all(
+                any(path == fetched or path.startswith(fetched.rstrip('/') + '/')
+                    for fetched in self._fetched)
+                for path in column.paths
+            )
+            and set(column.cli) <= set(self.cli)
+            and (self.db_size or not column.db_size)
         )
-        firmware = get_safe_attr(info, 'status', 'device', 'runningFirmware')
 
-        # MetaLog settings - try multiple paths
-        metalog_size = get_safe_attr(info, 'config', 'logging', 'metalog', 'maxFileSizeMB')
-        if metalog_size == 'Not Applicable':
-            metalog_size = get_safe_attr(info, 'config', 'logging', 'log2File', 'maxFileSizeMB')
+    def combine(self, key: str, info: Any) -> Any:
+        """Combine what a filer returned with what the portal reported about it."""
+        if not self.portal:
+            return info
+        return _CombinedInfo(info, self.reported.get(key))
 
-        metalog_files = get_safe_attr(info, 'config', 'logging', 'metalog', 'maxfiles')
-        if metalog_files == 'Not Applicable':
-            metalog_files = get_safe_attr(info, 'config', 'logging', 'log2File', 'maxfiles')
+    def row(
+        self,
+        tenant: str,
+        filer_name: str,
+        info: Any,
+        cli: Dict[str, str],
+        db_size: str,
+        typed: Optional[bool] = None
+    ) -> List[Any]:
+        """
+        Build a status report row from data gathered from a filer.
 
-        # CLI commands
-        audit_status = safe_cli_command(filer, 'show /config/logging/files/mode')
-        device_location = safe_cli_command(filer, 'show /config/device/location')
-        audit_path = safe_cli_command(filer, 'show /config/logging/files/path')
-        metalogs = safe_cli_command(filer, 'dbg level')
+        Args:
+            tenant: Tenant name
+            filer_name: Filer name
+            info: Result of get_multi on the plan's paths
+            cli: Output of each of the plan's CLI commands
+            db_size: CloudSync database size
+            typed: Override the typed setting of the plan
 
-        # Extract debug level
-        if isinstance(metalogs, str) and len(metalogs) >= 28:
-            metalogs_setting = metalogs[-28:-18]
-        else:
-            metalogs_setting = metalogs if metalogs != 'Not Applicable' else 'Not Applicable'
+        Returns:
+            Row values in column order
+        """
+        data = _StatusData(tenant, filer_name, info, cli, db_size)
+        typed = self.typed if typed is None else typed
+        return [column.value(data, typed) for column in self.columns]
 
-        ad_mapping = safe_cli_command(filer, 'show /config/fileservices/cifs/idMapping/map')
 
-        # License
-        try:
-            license_info = filer.licenses.get()
-            if license_info is None:
-                raise ValueError("License returned None")
-        except Exception:
-            try:
-                license_info = filer.api.get('/config/device/activeLicenseType')
-                if license_info and hasattr(license_info, 'current'):
-                    license_info = license_info.current
-                elif license_info is None:
-                    license_info = 'Not Applicable'
-            except Exception:
-                license_info = 'Not Applicable'
-
-        # Device info
-        serial = get_safe_attr(info, 'status', 'device', 'SerialNumber')
-        mac = get_safe_attr(info, 'status', 'device', 'MacAddress')
-        ip = get_safe_attr(info, 'status', 'network', 'ports', default=[{}])
-        if isinstance(ip, list) and ip:
-            ip = get_safe_attr(ip[0], 'ip', 'address', default='N/A')
-            dns1 = get_safe_attr(info.status.network.ports[0], 'ip', 'DNSServer1', default='N/A')
-            dns2 = get_safe_attr(info.status.network.ports[0], 'ip', 'DNSServer2', default='N/A')
-        else:
-            ip = dns1 = dns2 = 'N/A'
-
-        eviction = get_safe_attr(
-            info, 'config', 'cloudsync', 'cloudExtender', 'storageThresholdPercentTrigger'
+def report_columns(
+    columns: Optional[Sequence[str]],
+    typed: bool,
+    portal_only: bool = False
+) -> List[str]:
+    """
+    Resolve the columns of a status report.
+
+    Args:
+        columns: Requested column names, or None for the full report
+        typed: True for typed report formats
+        portal_only: Default to the columns of the full report the portal holds
+
+    Returns:
+        Column names, starting with the key columns identifying the filer
+    """
+    if not columns:
+        headers = STATUS_TYPED_HEADERS if typed else STATUS_HEADERS
+        return [name for name in headers if not portal_only or from_portal(STATUS_COLUMN_MAP[name])]
+    return STATUS_KEY_COLUMNS + [name for name in columns if name not in STATUS_KEY_COLUMNS]
+
+
+def _record_history(
+    history: Optional[StatusHistory],
+    plan: StatusPlan,
+    tenant: str,
+    filer_name: str,
+    *fields: Any
+) -> None:
+    """Add the numeric status values of a filer to the history, if one is kept."""
+    if history is not None:
+        row = plan.history.row(tenant, filer_name, *fields)
+        history.record(tenant, filer_name, dict(zip(plan.history.names, row)))
+
+
+def _keep_samples(perf: Optional[PerfSamples], filer: Any, info: Any) -> None:
+    """Keep the perfMonitor samples of a filer for the fleet statistics, if collected."""
+    if perf is not None:
+        samples = get_safe_attr(info, 'proc', 'perfMonitor', 'samples', default=None)
+        perf.add(filer_key(filer), samples)
+
+
+def _log_fleet_perf(perf: PerfSamples, top: int = 10) -> None:
+    """Log the performance statistics of the whole fleet and its busiest filers."""
+    if not perf.series:
+        return
+    per_filer, fleet = perf.stats()
+    for metric, label in PERF_LABELS.items():
+        stats = fleet[metric]
+        if stats['mean'] is None:
+            continue
+        logging.info(
+            "Fleet %s: p50 %s%%, p95 %s%%, p99 %s%%, mean %s%%, %s%% of samples above %g%%",
+            label, stats['p50'], stats['p95'], stats['p99'], stats['mean'], stats['above'],
+            perf.threshold
+        )
+        busy = sorted(
+            ((filer[metric]['p95'], key) for key, filer in per_filer.items()
+             if (filer[metric]['p95'] or 0) > perf.threshold),
+            reverse=True
+        )
+        if busy:
+            logging.info(
+                "%d filers with %s p95 above %g%%: %s", len(busy), label, perf.threshold,
+                ', '.join(f'{key} ({p95}%)' for p95, key in busy[:top])
+            )
+
+
+def _filer_status(
+    filer: Any,
+    plan: StatusPlan,
+    db_cache: Optional[ProbeCache] = None,
+    history: Optional[StatusHistory] = None,
+    perf: Optional[PerfSamples] = None
+) -> List[Any]:
+    """
+    Gather a status report row for one filer, fetching only what the plan's
+    columns need, with the DB size if db_cache is given. Records the numeric
+    values in history and keeps the performance samples in perf, if given.
+    """
+    logging.info("Gathering status for %s...", filer.name)
+    info = filer.api.get_multi('/', plan.paths) if plan.paths else None
+    info = plan.combine(filer_key(filer), info)
+
+    tenant = get_portal_name(filer)
+    logging.info("Tenant: %s", tenant)
+
+    cli = {command: safe_cli_command(filer, command) for command in plan.cli}
+    db_size = _cached_db_size(db_cache, filer, info)
+
+    _record_history(history, plan, tenant, filer.name, info, cli, db_size)
+    _keep_samples(perf, filer, info)
+    return plan.row(tenant, filer.name, info, cli, db_size)
+
+
+def _collect_status(
+    filer: Any,
+    rows: OrderedRows,
+    plan: StatusPlan,
+    db_cache: Optional[ProbeCache],
+    history: Optional[StatusHistory] = None,
+    perf: Optional[PerfSamples] = None
+) -> None:
+    """
+    Gather the status row of one filer and hand it to the ordered writer.
+
+    Failures are completed by the on_failure callback of run_on_filers.
+    """
+    row = _filer_status(filer, plan, db_cache, history, perf)
+    rows.complete(filer_key(filer), [row])
+
+
+def _write_reported_status(
+    report: RowSink,
+    plan: StatusPlan,
+    devices: List[Any],
+    history: Optional[StatusHistory] = None
+) -> None:
+    """Write the status rows of filers from what the portal reported, calling no filer."""
+    for device in devices:
+        tenant = get_portal_name(device)
+        info = plan.combine(filer_key(device), None)
+        _record_history(history, plan, tenant, device.name, info, {}, DB_SIZE_SKIPPED)
+        report.write(plan.row(tenant, device.name, info, {}, DB_SIZE_SKIPPED))
+
+
+def write_filer_status(
+    session: Any,
+    report: RowSink,
+    all_tenants: bool,
+    tenant: Optional[str] = None,
+    filters: Optional[FilerFilter] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    db_size: bool = False,
+    db_size_ttl: float = DEFAULT_DB_SIZE_TTL,
+    history: Optional[StatusHistory] = None,
+    portal_only: bool = False
+) -> None:
+    """
+    Write status information for all filers to a report.
+
+    Filers are processed concurrently as the portal lists them, page by page,
+    and rows are written in filer order as they become available. The
+    CloudSync database size needs telnet on each filer, so it is only
+    collected when db_size is set, and reused for db_size_ttl seconds. With
+    a history, the numeric values of every filer are also recorded there.
+    The perfMonitor samples of all filers are analyzed together at the end
+    and the fleet statistics are logged.
+
+    With portal_only, the columns the portal holds are read from its copy of
+    each filer's reported config and status, in one paged device query per
+    tenant. Filers are only called for the remaining columns, if any.
+    """
+    logging.info("Gathering status for all filers...")
+    plan = StatusPlan(report.headers, report.typed, portal_only)
+    if portal_only:
+        devices = get_reported_devices(session, all_tenants, tenant, filters, plan.include)
+        if not devices:
+            logging.warning("No filers found")
+            return
+        plan.reported = {
+            filer_key(device): getattr(device, REPORTED_STATUS, None) for device in devices
+        }
+        if not plan.remote:
+            _write_reported_status(report, plan, devices, history)
+            return
+        filers: Iterable[Any] = [remote.remote_command(session, device) for device in devices]
+    else:
+        listed = iter_filers(session, all_tenants, tenant, filters=filters)
+        first = next(listed, None)
+        if first is None:
+            logging.warning("No filers found")
+            return
+        filers = itertools.chain([first], listed)
+
+    logging.debug("Fetching %s and CLI %s", plan.paths, plan.cli)
+    db_cache = None
+    if db_size and plan.db_size:
+        db_cache = ProbeCache(DB_SIZE_PROBE, session.host(), db_size_ttl)
+    rows = OrderedRows(report)
+    perf = PerfSamples()
+    try:
+        run_on_filers(
+            session, rows.follow(filers, filer_key), _collect_status, rows, plan, db_cache,
+            history, perf,
+            concurrency=concurrency, on_failure=lambda filer: rows.complete(filer_key(filer))
         )
-        uptime = get_safe_attr(info, 'proc', 'time', 'uptime')
+    finally:
+        rows.close()
+    _log_fleet_perf(perf)
+
+
+async def _safe_cli_command_async(filer: AsyncFiler, command: str) -> str:
+    """Execute a CLI command asynchronously, returning 'Not Applicable' on failure."""
+    try:
+        result = await filer.run_command(command)
+        return str(result) if result is not None else 'Not Applicable'
+    except Exception as e:
+        logging.debug("CLI command failed: %s, error: %s", command, e)
+        return 'Not Applicable'
+
+
+async def _get_db_metrics_async(filer: AsyncFiler, info: Any) -> Dict[str, Any]:
+    """Measure the CloudSync database over telnet asynchronously."""
+    await filer.enable_telnet(_telnet_code(info))
+    try:
+        return _parse_db_metrics(await filer.run_shell(DB_SIZE_COMMAND))
+    finally:
+        await filer.disable_telnet()
+
 
-        # Performance metrics
+async def _cached_db_size_async(cache: Optional[ProbeCache], filer: AsyncFiler, info: Any) -> str:
+    """Get the database size from the probe cache, measuring it when missing or stale."""
+    if cache is None:
+        return DB_SIZE_SKIPPED
+    key = filer_key(filer)
+    metrics = cache.get(key)
+    if metrics is None:
         try:
-            curr_cpu = info.proc.perfMonitor.current.cpu
-            curr_mem = info.proc.perfMonitor.current.memUsage
-        except (AttributeError, TypeError):
-            curr_cpu = curr_mem = 'N/A'
+            metrics = await _get_db_metrics_async(filer, info)
+        except Exception as e:
+            logging.debug("get_db_size failed on %s: %s", filer.name, e)
+            return 'N/A'
+        cache.put(key, metrics)
+    return _db_size_gb(metrics)
+
+
+async def _filer_status_async(
+    filer: AsyncFiler,
+    plan: StatusPlan,
+    db_cache: Optional[ProbeCache] = None,
+    history: Optional[StatusHistory] = None,
+    perf: Optional[PerfSamples] = None
+) -> List[Any]:
+    """Gather a status report row for one filer asynchronously."""
+    logging.info("Gathering status for %s...", filer.name)
 
-        # Storage
+    info = None
+    if plan.paths:
         try:
-            total = info.proc.storage.summary.totalVolumeSpace
-            used = info.proc.storage.summary.usedVolumeSpace
-            free = info.proc.storage.summary.freeVolumeSpace
-            volume = f"Total: {total} Used: {used} Free: {free}"
-        except AttributeError:
-            volume = 'N/A'
+            info = await filer.api.get_multi('/', plan.paths)
+        except Exception as e:
+            logging.warning("Failed to get info for %s: %s", filer.name, e)
+            raise
+    info = plan.combine(filer_key(filer), info)
 
-        # AD status
-        ad_status = get_ad_status(
-            get_safe_attr(info, 'status', 'fileservices', 'cifs', 'joinStatus', default=-1)
-        )
+    db_size, *outputs = await asyncio.gather(
+        _cached_db_size_async(db_cache, filer, info),
+        *(_safe_cli_command_async(filer, command) for command in plan.cli)
+    )
+    cli = dict(zip(plan.cli, outputs))
+
+    _record_history(history, plan, filer.tenant, filer.name, info, cli, db_size)
+    _keep_samples(perf, filer, info)
+    return plan.row(filer.tenant, filer.name, info, cli, db_size)
 
-        # Alerts and time
-        alerts = get_safe_attr(info, 'config', 'logging', 'alert')
-        time_config = get_safe_attr(info, 'config', 'time', default=None)
-        if time_config:
-            time_str = f"Mode: {getattr(time_config, 'NTPMode', 'N/A')} " \
-                       f"Zone: {getattr(time_config, 'TimeZone', 'N/A')} " \
-                       f"Servers: {getattr(time_config, 'NTPServer', 'N/A')}"
-        else:
-            time_str = 'N/A'
-
-        # Performance history
-        samples = get_safe_attr(info, 'proc', 'perfMonitor', 'samples', default=None)
-        max_cpu = get_max_metric(samples, 'cpu')
-        max_mem = get_max_metric(samples, 'memUsage')
 
-        # DB size
-        db_size = get_db_size(filer)
+async def write_filer_status_async(
+    admin: Any,
+    report: RowSink,
+    all_tenants: bool,
+    tenant: Optional[str] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: Optional[FilerFilter] = None,
+    db_size: bool = False,
+    db_size_ttl: float = DEFAULT_DB_SIZE_TTL,
+    history: Optional[StatusHistory] = None
+) -> None:
+    """Write status information for all filers to a report using the asyncio engine."""
+    logging.info("Gathering status for all filers...")
+    filers = await get_filers_async(admin, all_tenants, tenant, filters=filters)
 
-        # Write row
-        with open(filename, mode='a', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f, dialect='excel')
-            writer.writerow([
-                tenant, filer.name, sync_id, self_scan_interval, uploading,
-                scanning, self_verification, metalogs_setting, audit_status,
-                device_location, audit_path, metalog_size, metalog_files,
-                firmware, license_info, eviction, volume, serial, mac, ip,
-                dns1, dns2, ad_status, ad_mapping, alerts, time_str, uptime,
-                f"CPU: {curr_cpu}% Mem: {curr_mem}%", max_cpu, max_mem, db_size
-            ])
+    if not filers:
+        logging.warning("No filers found")
+        return
 
-    session.logout()
+    plan = StatusPlan(report.headers, report.typed)
+    logging.debug("Fetching %s and CLI %s", plan.paths, plan.cli)
+    db_cache = None
+    if db_size and plan.db_size:
+        db_cache = ProbeCache(DB_SIZE_PROBE, admin.host(), db_size_ttl)
+    perf = PerfSamples()
+    result = await gather_on_filers(
+        filers, _filer_status_async, plan, db_cache, history, perf,
+        concurrency=concurrency
+    )
+    for filer in filers:
+        key = filer_key(filer)
+        if key in result.succeeded:
+            report.write(result.succeeded[key])
+    _log_fleet_perf(perf)
 
 
 def run_status(
     session: Any,
     filename: str,
     tenant: Optional[str] = None,
-    all_tenants: bool = False
-) -> None:
+    all_tenants: bool = False,
+    filters: Optional[FilerFilter] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    db_size: bool = False,
+    db_size_ttl: float = DEFAULT_DB_SIZE_TTL,
+    upsert: bool = False,
+    fmt: Optional[str] = None,
+    history: bool = False,
+    columns: Optional[List[str]] = None,
+    portal_only: bool = False
+) -> bool:
     """
     Run status report task.
 
     Args:
         session: Authenticated GlobalAdmin session
-        filename: Output CSV filename
+        filename: Output filename
         tenant: Optional tenant name (leave blank for all tenants)
         all_tenants: If True, run on all tenants
+        filters: Optional selection of filers
+        concurrency: Maximum number of filers processed at once
+        db_size: Collect the CloudSync database size, which enables telnet on each filer
+        db_size_ttl: Seconds a measured database size is reused
+        upsert: Replace the rows of filers already in the report instead of appending
+        fmt: Output format (csv, jsonl or parquet), defaults to the file extension
+        history: Also record the numeric values in the local status history
+        columns: Report only these columns, fetching only the data they need
+        portal_only: Read what the portal holds about the filers instead of calling
+            them, and default to those columns
+
+    Returns:
+        True if the report was written
     """
     logging.info('Starting status task')
 
-    if os.path.exists(filename):
-        logging.info('Appending to existing file.')
-    else:
-        logging.debug('File does not exist. Creating it.')
-        write_header(filename)
+    store = StatusHistory(session.host()) if history else None
+    succeeded = True
+    try:
+        with open_report(filename, upsert, fmt, columns, portal_only) as report:
+            write_filer_status(
+                session, report, all_tenants, tenant, filters, concurrency, db_size, db_size_ttl,
+                store, portal_only
+            )
+    except Exception as e:
+        logging.warning("An error occurred: %s", e)
+        succeeded = False
+    finally:
+        if store is not None:
+            store.commit()
+
+    logging.info('Finished status task.')
+    return succeeded
+
+
+async def run_status_async(
+    admin: Any,
+    filename: str,
+    tenant: Optional[str] = None,
+    all_tenants: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: Optional[FilerFilter] = None,
+    db_size: bool = False,
+    db_size_ttl: float = DEFAULT_DB_SIZE_TTL,
+    upsert: bool = False,
+    fmt: Optional[str] = None,
+    history: bool = False,
+    columns: Optional[List[str]] = None
+) -> bool:
+    """
+    Run status report task using the asyncio engine.
+
+    Args:
+        admin: Authenticated AsyncGlobalAdmin session
+        filename: Output filename
+        tenant: Optional tenant name (leave blank for all tenants)
+        all_tenants: If True, run on all tenants
+        concurrency: Maximum number of filers processed at once
+        filters: Optional selection of filers
+        db_size: Collect the CloudSync database size, which enables telnet on each filer
+        db_size_ttl: Seconds a measured database size is reused
+        upsert: Replace the rows of filers already in the report instead of appending
+        fmt: Output format (csv, jsonl or parquet), defaults to the file extension
+        history: Also record the numeric values in the local status history
+        columns: Report only these columns, fetching only the data they need
+
+    Returns:
+        True if the report was written
+    """
+    logging.info('Starting status task')
 
+    store = StatusHistory(admin.host()) if history else None
+    succeeded = True
     try:
-        write_filer_status(session, filename, all_tenants, tenant)
+        with open_report(filename, upsert, fmt, columns) as report:
+            await write_filer_status_async(
+                admin, report, all_tenants, tenant, concurrency, filters, db_size, db_size_ttl,
+                store
+            )
     except Exception as e:
         logging.warning("An error occurred: %s", e)
+        succeeded = False
+    finally:
+        if store is not None:
+            store.commit()
 
     logging.info('Finished status task.')
+    return succeeded
+
+
+def _poll_status(filer: Any, plan: StatusPlan, rows: Dict[str, List[Any]]) -> None:
+    """Poll the plan's columns of one filer into rows, keyed by filer."""
+    info = filer.api.get_multi('/', plan.paths) if plan.paths else None
+    info = plan.combine(filer_key(filer), info)
+    cli = {command: safe_cli_command(filer, command) for command in plan.cli}
+    rows[filer_key(filer)] = plan.row(
+        get_portal_name(filer), filer.name, info, cli, DB_SIZE_SKIPPED
+    )
+
+
+def _status_changes(
+    plan: StatusPlan,
+    previous: Dict[str, List[Any]],
+    current: Dict[str, List[Any]],
+    reachable: Set[str]
+) -> List[List[Any]]:
+    """
+    Compare two polls.
+
+    Returns:
+        [tenant, filer name, column, previous, current] for each changed cell,
+        with a 'Reachable' change for filers that failed or recovered
+    """
+    changes = []
+    for key, row in current.items():
+        before = previous.get(key)
+        if before is None:
+            continue
+        if key not in reachable:
+            changes.append(row[:2] + ['Reachable', 'no', 'yes'])
+        changes.extend(
+            row[:2] + [name, old, new]
+            for name, old, new in zip(plan.names[2:], before[2:], row[2:])
+            if old != new
+        )
+    changes.extend(
+        previous[key][:2] + ['Reachable', 'yes', 'no']
+        for key in reachable if key not in current
+    )
+    return changes
+
+
+def change_log_path(report_filename: str) -> str:
+    """Get the default change log of a watch, next to the status report it is named after."""
+    return os.path.splitext(report_filename)[0] + '.changes.csv'
+
+
+def _check_change_log(filename: str) -> None:
+    """
+    Make sure a change log can be appended to.
+
+    Raises:
+        ValueError: If the file holds something other than a change log
+    """
+    if not os.path.exists(filename) or os.path.getsize(filename) == 0:
+        return
+    with open(filename, newline='', encoding=REPORT_ENCODING) as f:
+        header = next(csv.reader(f), None)
+    if header != CHANGE_HEADERS:
+        raise ValueError(f"{filename} is not a change log, refusing to append to it")
+
+
+def _emit_changes(filename: str, changes: List[List[Any]]) -> None:
+    """Print changes and append them to the csv change log."""
+    now = time.strftime('%Y-%m-%d %H:%M:%S')
+    for tenant, filer_name, column, old, new in changes:
+        print(f"{now}  {tenant}/{filer_name}  {column}: {old} -> {new}")
+
+    new_file = not os.path.exists(filename) or os.path.getsize(filename) == 0
+    with open(filename, 'a', newline='', encoding=REPORT_ENCODING if new_file else 'utf-8') as f:
+        writer = csv.writer(f, dialect='excel')
+        if new_file:
+            writer.writerow(CHANGE_HEADERS)
+        writer.writerows([now] + change for change in changes)
+
+
+def watch_status(
+    session: Any,
+    filename: str,
+    interval: float = DEFAULT_WATCH_INTERVAL,
+    tenant: Optional[str] = None,
+    all_tenants: bool = False,
+    filters: Optional[FilerFilter] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    columns: Optional[List[str]] = None,
+    polls: Optional[int] = None
+) -> None:
+    """
+    Poll filers repeatedly and report only the cells that changed.
+
+    The session, filer list and filer handles are kept between polls: each
+    fleet worker resolves its filers once and polls them directly. Each poll fetches
+    only what the watched columns need, by default the volatile subtrees in
+    VOLATILE_PATHS. The first poll is the baseline; after that every changed
+    cell is printed and appended to a csv change log.
+
+    Args:
+        session: Authenticated GlobalAdmin session
+        filename: Change log filename, see change_log_path; an existing file
+            must be a change log, so a status report is never appended to
+        interval: Seconds between the starts of two polls
+        tenant: Optional tenant name (leave blank for all tenants)
+        all_tenants: If True, run on all tenants
+        filters: Optional selection of filers
+        concurrency: Maximum number of filers processed at once
+        columns: Columns to watch, defaults to WATCH_COLUMNS
+        polls: Stop after this many polls, default is to run until interrupted
+    """
+    try:
+        _check_change_log(filename)
+        plan = StatusPlan(report_columns(columns or WATCH_COLUMNS, typed=True), typed=True)
+    except (OSError, ValueError) as e:
+        logging.error("%s", e)
+        return
+
+    filers = get_filers(session, all_tenants, tenant, filters=filters)
+    if not filers:
+        logging.warning("No filers found")
+        return
+    logging.info(
+        "Watching %d filers every %gs, fetching %s", len(filers), interval, ', '.join(plan.paths)
+    )
+
+    previous: Dict[str, List[Any]] = {}
+    reachable: Set[str] = set()
+    poll = 0
+    try:
+        with FilerPool(session, filers, concurrency) as pool:
+            while polls is None or poll < polls:
+                start = time.monotonic()
+                rows: Dict[str, List[Any]] = {}
+                pool.run(_poll_status, plan, rows)
+                if poll == 0:
+                    logging.info("Baseline collected from %d of %d filers", len(rows), len(filers))
+                else:
+                    changes = _status_changes(plan, previous, rows, reachable)
+                    if changes:
+                        _emit_changes(filename, changes)
+                # Filers that missed a poll are compared with their last known values
+                previous.update(rows)
+                reachable = set(rows)
+                poll += 1
+                if polls is None or poll < polls:
+                    time.sleep(max(0.0, interval - (time.monotonic() - start)))
+    except KeyboardInterrupt:
+        logging.info("Stopped watching.")
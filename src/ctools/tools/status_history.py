@@ -0,0 +1,65 @@
+"""Trend queries on the local status history, without connecting to the portal."""
+
+import logging
+import time
+from typing import Optional
+
+from ..core.history import DEFAULT_GROWTH_DAYS, DEFAULT_TOP, StatusHistory
+
+DEFAULT_METRIC = 'uploadingFiles'
+
+
+def _timestamp(seconds: float) -> str:
+    """Format an epoch timestamp for display."""
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(seconds))
+
+
+def run_status_history(
+    metric: str = DEFAULT_METRIC,
+    days: float = DEFAULT_GROWTH_DAYS,
+    top: int = DEFAULT_TOP,
+    filer: Optional[str] = None,
+    portal: str = '',
+    list_metrics: bool = False,
+    path: Optional[str] = None
+) -> None:
+    """
+    Print trends from the status history recorded by show_status --history.
+
+    Args:
+        metric: Metric name, a typed status report column such as 'uploadingFiles'
+        days: Length of the window
+        top: Number of filers listed by growth
+        filer: Print the samples of this filer instead of the growth ranking
+        portal: Only consider samples of this portal address
+        list_metrics: Print the recorded metric names instead
+        path: History database path, defaults to the user cache directory
+    """
+    history = StatusHistory(portal, path)
+
+    if list_metrics:
+        for name in history.metrics():
+            print(name)
+        return
+
+    if filer:
+        samples = history.series(filer, metric, days)
+        if not samples:
+            logging.warning("No %s samples for %s in the last %s days", metric, filer, days)
+            return
+        print(f"{'Taken':<17}  {'Tenant':<24}  {metric:>16}")
+        for taken_at, tenant, value in samples:
+            print(f"{_timestamp(taken_at):<17}  {tenant:<24}  {value:>16g}")
+        return
+
+    ranking = history.growth(metric, days, top)
+    if not ranking:
+        logging.warning("No %s samples in the last %s days", metric, days)
+        return
+    print(f"Top {len(ranking)} filers by {days:g}-day growth in {metric}")
+    print(f"{'Tenant':<24}  {'Filer':<32}  {'First':>12}  {'Last':>12}  {'Change':>12}  Since")
+    for row in ranking:
+        print(
+            f"{row.tenant:<24}  {row.filer:<32}  {row.first:>12g}  {row.last:>12g}  "
+            f"{row.change:>+12g}  {_timestamp(row.first_at)}"
+        )
@@ -3,15 +3,18 @@
 import logging
 from typing import Any, Optional
 
-from ..core.filer import get_filer, get_filers
+from ..core.filer import FilerFilter, get_filer, get_filers
+from ..core.fleet import DEFAULT_CONCURRENCY, run_on_filers
 
 
 def unsuspend_sync(
     session: Any,
     tenant: Optional[str] = None,
     device: Optional[str] = None,
-    all_tenants: bool = False
-) -> None:
+    all_tenants: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    filters: Optional[FilerFilter] = None
+) -> bool:
     """
     Resume cloud sync on filers.
 
@@ -20,23 +23,30 @@ def unsuspend_sync(
         tenant: Optional tenant name
         device: Optional device name (resumes single device if provided)
         all_tenants: If True and no device specified, run on all tenants
+        concurrency: Maximum number of filers processed at once
+        filters: Optional selection of filers when no device is specified
+
+    Returns:
+        True if the task succeeded on every selected filer
     """
     logging.info("Starting unsuspend sync task.")
 
     try:
         if device:
             filer = get_filer(session, device, tenant)
-            if filer:
-                _unsuspend_filer(filer)
+            filers = [filer] if filer else None
         else:
-            filers = get_filers(session, all_tenants, tenant)
-            if filers:
-                for filer in filers:
-                    _unsuspend_filer(filer)
+            filers = get_filers(session, all_tenants, tenant, filters=filters, current=True)
+
+        if filers is None:
+            return False
+        result = run_on_filers(session, filers, _unsuspend_filer, concurrency=concurrency)
 
-            logging.info("Finished unsuspend sync task.")
+        logging.info("Finished unsuspend sync task.")
+        return not result.failed
     except Exception as e:
         logging.warning("An error occurred: %s", e)
+        return False
 
 
 def _unsuspend_filer(filer: Any) -> None:
@@ -46,3 +56,4 @@ def _unsuspend_filer(filer: Any) -> None:
         logging.info("Resumed sync on %s", filer.name)
     except Exception as e:
         logging.warning("Error resuming sync on %s: %s", filer.name, e)
+        raise
@@ -11,7 +11,7 @@ def worm_settings(
     grace_period: Optional[str] = None,
     period_type: str = "Days",
     target_date: Optional[str] = None
-) -> None:
+) -> bool:
     """
     Configure WORM settings on a cloud folder.
 
@@ -22,6 +22,9 @@ def worm_settings(
         grace_period: Grace period value
         period_type: Period type (Days, Months, Years)
         target_date: Target date for retention
+
+    Returns:
+        True if the operation was applied
     """
     logging.info("Starting WORM settings task.")
     logging.info("Folder ID: %s", folder_id)
@@ -34,7 +37,7 @@ def worm_settings(
         if operation == "Set Grace Period":
             if not grace_period:
                 logging.error("Grace period value is required for this operation")
-                return
+                return False
             logging.info("Setting grace period: %s %s", grace_period, period_type)
             # session.cloudfs.set_grace_period(folder_id, int(grace_period), period_type)
             logging.info("Grace period set successfully")
@@ -42,7 +45,7 @@ def worm_settings(
         elif operation == "Set Retention Period":
             if not grace_period:
                 logging.error("Retention period value is required for this operation")
-                return
+                return False
             logging.info("Setting retention period: %s %s", grace_period, period_type)
             # session.cloudfs.set_retention_period(folder_id, int(grace_period), period_type)
             logging.info("Retention period set successfully")
@@ -59,9 +62,10 @@ def worm_settings(
 
         else:
             logging.error("Unknown operation: %s", operation)
-            return
+            return False
 
         logging.info("Finished WORM settings task.")
+        return True
     except Exception as e:
         logging.error("Error in WORM settings task: %s", e)
         raise